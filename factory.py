@@ -12,6 +12,10 @@
 # Buttons and menu actions run as interrupts
 # The grid origin is the bottom left corner and scene origin is the top left corner
 # Materials will group together with visual offsets when they are stacked
+# Materials have no scene items of their own, two clsMaterialLayer items paint them all from the Materials list
+# Machine bottoms and tops are cached in clsTileLayer pixmaps repainted by dirty tile, grid lines are painted live
+# Arrows, locks, walls and highlights are painted by one clsTileOverlay from per tile state bits
+# Tile center passes are counted in flat arrays for the traffic heatmap (factoryHeatmap)
 
 # -------- GUI Layout Structure: -------- #
 # app QApplication
@@ -27,83 +31,32 @@
 
 
 # -------- Imports -------- #
+# Heavy or rarely used modules (matplotlib, termcolor) are imported where first used to keep startup fast.
+# Run with --startup-report to print the launch to first frame breakdown, python -X importtime for module detail.
+import time
+LAUNCH_TIME = time.perf_counter()  # Origin of the startup report
 from PyQt5 import QtCore, QtWidgets, QtGui
+import copy
 import datetime
+import json
 import math
-import pickle
+from array import array
+from collections import deque
 from factoryLib import *  # Usage: mainApp.lib.machineLib[STARTER]
+from factoryConstants import *  # Usage: GRID_SIZE, STARTER
+from factoryModel import clsThroughputModel
+from factoryRecipes import clsRecipeGraph
+from factoryReplay import clsInputRecorder, clsInputReplayer, REPLAY_STEP_TICKS
+from factoryAtlas import clsAssetLoader
+from factoryTrace import clsTickTracer, clsStartupTimer, PAINT_BEGIN, PAINT_END, TRACE_FILE
+from factoryHistogram import clsPhaseHistograms, HISTOGRAM_PERCENTILES, FRAME
+from factorySave import writeSaveFile, readSaveFile, clsAutosaver, SAVE_FILE, CHECKPOINT_FILE
+from factoryHeatmap import clsTrafficCounter, HEATMAP_WINDOW, HEATMAP_SAMPLE_TICKS
 from win32api import GetSystemMetrics  # Only used to detect monitor setup
 import sys
 import traceback
-import time
-import statistics
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
-from termcolor import colored
 import logging
 
-# -------- Constants -------- #
-
-CYCLE_INTERVAL = 25  # Core loop time (ms) 25 = 1 roller/sec, 40 = 25fps, 17 = 60fps
-MAT_LAUNCH_INTERVAL = 40  # Iterations between material launches
-INCOME_ANALYSIS_FREQ = 10
-FRAME_RATE_ANALYSIS_LOG_SIZE = 600
-GRID_SIZE = 25
-MACHINE_SIZE = 24
-MAT_SIZE = 8
-TIME_PROFILE_ALARM_LIMIT = 37
-TIME_PROFILE_ZERO_FLOOR = 0.001
-ORIENTATIONS = ['U', 'L', 'D', 'R']
-ANGLE = {'U': 180, 'L': 90, 'D': 0, 'R': 270}
-VISUAL_OFFSET_1_TO_2 = [(0, 0), (2, 0)]  # Visual offsets for groups of size 1 to 2 materials
-VISUAL_OFFSET_3_TO_3 = [(-2, 0), (0, 2), (2, 0)]
-VISUAL_OFFSET_4_TO_4 = [(-2, 2), (2, 2), (-2, -2), (2, -2)]
-VISUAL_OFFSET_5_TO_9 = [(0, 0), (2, 0), (-2, 0),
-                        (0, -2), (2, -2), (-2, -2),
-                        (0, 2), (2, 2), (-2, 2)]
-RESET_QUEUED = True
-RESET_NOT_QUEUED = False
-IN = 'In'
-OUT = 'Out'
-LEFT = 'Left'
-RIGHT = 'Right'
-ARM = 'Arm'
-RESET = 'Reset'
-WALLED = True
-NOT_WALLED = False
-LOCKED = True
-NOT_LOCKED = False
-LOCK = 'Lock'  # drawShape argument flag
-WALL = 'Wall'
-HIGHLIGHT = 'Highlight'
-Z_MACHINE_BOTTOM = 0  # Z Height Stack Order
-Z_MATERIAL = 1
-Z_MACHINE_TOP = 2
-Z_PICKED_UP = 3
-Z_ROBOT_ARM = 4
-Z_ARROW = 5
-Z_HIGHLIGHT = 6
-STARTER = 'Starter'
-CRAFTER = 'Crafter'
-SELLER = 'Seller'
-ROLLER = 'Roller'
-DRAWER = 'Drawer'
-CUTTER = 'Cutter'
-FURNACE = 'Furnace'
-PRESS = 'Press'
-SPLITTER_LEFT = 'Splitter Left'
-SPLITTER_RIGHT = 'Splitter Right'
-SPLITTER_TEE = 'Splitter Tee'
-SPLITTER_3WAY = 'Splitter 3-Way'
-FILTER_LEFT = 'Filter Left'
-FILTER_RIGHT = 'Filter Right'
-FILTER_TEE = 'Filter Tee'
-ROBOTIC_ARM = 'Robotic Arm'
-FILTERED_ARM = 'Filtered Arm'
-TELEPORTER_INPUT = 'Teleporter Input'
-TELEPORTER_OUTPUT = 'Teleporter Output'
-
-
 # Logger
 _LOGGER = logging.getLogger(__name__)
 # logging.basicConfig(level=logging.DEBUG)  # Print debug and higher
@@ -470,9 +423,330 @@ class QPushButtonA(QtWidgets.QPushButton):
                                 border: 1px solid steelblue}')
 
 
+class clsGraphicsView(QtWidgets.QGraphicsView):  # Marks scene paint time for the tick tracer
+    def __init__(self, scene, main):
+        super(clsGraphicsView, self).__init__(scene)
+        self.main = main
+
+    def drawBackground(self, painter, rect):  # First step of every view repaint
+        if self.main.tracer.enabled:
+            self.main.tracer.mark(PAINT_BEGIN, self.main.iteration)
+        super(clsGraphicsView, self).drawBackground(painter, rect)
+
+    def wheelEvent(self, event):  # Continuous zoom around the cursor
+        notches = event.angleDelta().y() / 120
+        self.main.setZoom(self.main.scaleFactor * ZOOM_WHEEL_STEP ** notches, event.pos())
+        event.accept()
+
+    def scrollContentsBy(self, dx, dy):
+        super(clsGraphicsView, self).scrollContentsBy(dx, dy)
+        self.main.updateVisibleBounds()
+
+    def resizeEvent(self, event):
+        super(clsGraphicsView, self).resizeEvent(event)
+        self.main.updateVisibleBounds()
+
+    def drawForeground(self, painter, rect):  # Last step of every view repaint
+        super(clsGraphicsView, self).drawForeground(painter, rect)
+        if self.main.tracer.enabled:
+            self.main.tracer.mark(PAINT_END, self.main.iteration)
+        if self.main.setupFinished and not self.main.startupTimer.finished:
+            self.main.finishStartupTimer()
+
+
+class clsProfilerOverlay(QtWidgets.QLabel):  # Live per phase tick cost drawn over the top left of the view
+    def __init__(self, main):
+        super(clsProfilerOverlay, self).__init__(main.view.viewport())
+        self.main = main
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+        self.setStyleSheet('background-color: rgba(0, 0, 0, 170); color: white; border: none; padding: 4px')
+        font = QtGui.QFont('Monospace')
+        font.setStyleHint(QtGui.QFont.TypeWriter)
+        font.setPointSize(9)
+        self.setFont(font)
+        self.move(6, 6)
+        self.hide()
+        self.ownsTracer = False  # Tracer was started by the overlay, not by Start Time Log
+        self.lastCount = 0  # Tracer marks already read
+        self.lastTime = None
+        self.samples = deque(maxlen=PROFILER_OVERLAY_WINDOW)  # (seconds, ticks, {span name: ms})
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def toggle(self):
+        if self.isVisible():
+            self.timer.stop()
+            self.hide()
+            if self.ownsTracer:
+                self.main.tracer.stop()
+                self.ownsTracer = False
+        else:
+            self.samples.clear()
+            self.lastTime = None
+            self.refresh()
+            self.show()
+            self.timer.start(PROFILER_OVERLAY_INTERVAL)
+
+    def refresh(self):
+        tracer = self.main.tracer
+        if not tracer.enabled:  # Overlay reads the same marks as the time log, tracing runs while it is shown
+            tracer.start()
+            self.ownsTracer = True
+        if self.lastCount > tracer.count:  # Tracer was restarted by Start Time Log
+            self.lastCount = 0
+        now = time.perf_counter()
+        spans = tracer.getSpans(self.lastCount)
+        self.lastCount = tracer.count
+        if self.lastTime is not None:
+            totals = {}
+            ticks = 0
+            for name, run, start, end in spans:
+                totals[name] = totals.get(name, 0) + (end - start) / 1e6
+                if name == 'Tick':
+                    ticks += 1
+            self.samples.append((now - self.lastTime, ticks, totals))
+        self.lastTime = now
+        self.setText(self.getText())
+        self.adjustSize()
+
+    def getText(self):
+        seconds = sum(sample[0] for sample in self.samples)
+        ticks = sum(sample[1] for sample in self.samples)
+        lines = ['%-11s %6.1f' % ('Ticks / s', ticks / seconds if seconds else 0)]
+        for row, names in PROFILER_OVERLAY_PHASES:
+            ms = sum(sample[2].get(name, 0) for sample in self.samples for name in names)
+            lines.append('%-11s %6.3f ms' % (row, ms / ticks if ticks else 0))
+        arms = sum(1 for tool in self.main.Machines if tool.type in [ROBOTIC_ARM, FILTERED_ARM])
+        lines.append('%-11s %6i' % ('Machines', len(self.main.Machines)))
+        lines.append('%-11s %6i' % ('Arms', arms))
+        lines.append('%-11s %6i' % ('Materials', len(self.main.Materials)))
+        return '\n'.join(lines)
+
+
+class clsMaterialLayer(QtWidgets.QGraphicsItem):  # Paints every material in one paint call (MATERIAL_BATCH_PAINT)
+    def __init__(self, main, pickedUp):
+        super(clsMaterialLayer, self).__init__()
+        self.main = main
+        self.pickedUp = pickedUp  # Layer of materials held by robotic arms, drawn above the machine tops
+        self.setZValue(Z_PICKED_UP if pickedUp else Z_MATERIAL)
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption)  # exposedRect is the repainted area
+        self.rect = QtCore.QRectF(0, 0, main.sceneWidth, main.sceneHeight)
+
+    def boundingRect(self):
+        return self.rect
+
+    def paint(self, painter, option, widget=None):
+        if self.main.lowDetail:  # Zoomed out, tile density instead of sprites
+            if not self.pickedUp:
+                self.paintDensity(painter, option.exposedRect)
+            return
+        # Positions are read from the materials, no scene item is moved during the tick
+        # Each material keeps one pixmap fragment and only its center is updated here, fragments are grouped by
+        # pixmap so each material image is one drawPixmapFragments call
+        batches = {}  # id(pixmap): (pixmap, fragments)
+        yTop = self.main.sceneHeight + 1 - int(MAT_SIZE / 2)  # Same top left as convertToSceneCoords(.., MAT_SIZE)
+        xLeft = -int(MAT_SIZE / 2)
+        exposed = option.exposedRect.adjusted(-MAT_SIZE, -MAT_SIZE, MAT_SIZE, MAT_SIZE)  # Materials off it are skipped
+        xMin, xMax = exposed.left(), exposed.right()
+        yMin, yMax = yTop - exposed.bottom(), yTop - exposed.top()  # In material coordinates
+        for material in self.main.Materials:
+            if material.pickedUp is not self.pickedUp:
+                continue
+            if not (xMin <= material.x <= xMax and yMin <= material.y <= yMax):
+                continue
+            fragment = material.fragment
+            fragment.x = material.x + material.xVisOffset + xLeft + fragment.width / 2
+            fragment.y = yTop - material.y - material.yVisOffset + fragment.height / 2
+            batch = batches.get(id(material.image))
+            if batch is None:
+                batch = batches[id(material.image)] = (material.image, [])
+            batch[1].append(fragment)
+        for pixmap, fragments in batches.values():
+            painter.drawPixmapFragments(fragments, pixmap)
+
+    def paintDensity(self, painter, exposed):
+        # One dot per tile with materials, colored by how many, so painting is bounded by the exposed tile count
+        # Counts come from main.tileDensity, filled by the core loop, only the tiles in the exposed area are read
+        density = self.main.tileDensity
+        rows = self.main.densityRows
+        colors = [(minimum, QtGui.QColor(*rgb)) for minimum, rgb in LOD_DENSITY_COLORS]
+        yTop = self.main.sceneHeight - GRID_SIZE + 6  # Dot top left is 6px inside the tile
+        columnMin = max(0, int(exposed.left() / GRID_SIZE))
+        columnMax = min(len(density) // rows - 1, int(exposed.right() / GRID_SIZE))
+        rowMin = max(0, int((self.main.sceneHeight - exposed.bottom()) / GRID_SIZE))
+        rowMax = min(rows - 1, int((self.main.sceneHeight - exposed.top()) / GRID_SIZE))
+        for column in range(columnMin, columnMax + 1):
+            for row in range(rowMin, rowMax + 1):
+                count = density[column * rows + row]
+                if not count:
+                    continue
+                for minimum, color in colors:
+                    if count >= minimum:
+                        painter.fillRect(QtCore.QRectF(column * GRID_SIZE + 6, yTop - row * GRID_SIZE, 13, 13), color)
+                        break
+
+
+class clsTileLayer(QtWidgets.QGraphicsItem):  # Static scene content cached in a pixmap, repainted by dirty tile
+    def __init__(self, main, zValue, paintTiles, paintOver=None):
+        super(clsTileLayer, self).__init__()
+        self.main = main
+        self.paintTiles = paintTiles  # paintTiles(painter, tiles) paints the content of the tile centers given
+        self.paintOver = paintOver  # paintOver(painter) paints live over the cache, for lines that must stay 1px
+        self.setZValue(zValue)
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption)  # Only the exposed area is copied
+        self.rect = QtCore.QRectF(0, 0, main.sceneWidth + 1, main.sceneHeight + 1)  # Grid lines end on the edge
+        self.cache = QtGui.QPixmap(main.sceneWidth + 1, main.sceneHeight + 1)
+        self.cache.fill(QtCore.Qt.transparent)
+        self.dirtyTiles = set()  # Tile centers (x, y) to repaint into the cache at the next paint
+        self.allDirty = False  # Whole cache repainted at the next paint
+
+    def boundingRect(self):
+        return self.rect
+
+    def getDirtyRect(self, x, y):  # Tile plus 1px, machines, locks and walls may touch the grid line outside it
+        return QtCore.QRect(x - 14, self.main.sceneHeight - y - 13, GRID_SIZE + 2, GRID_SIZE + 2)
+
+    def markDirty(self, x, y):
+        self.dirtyTiles.add((x, y))
+        self.update(QtCore.QRectF(self.getDirtyRect(x, y)))
+
+    def markAllDirty(self):
+        self.allDirty = True
+        self.update()
+
+    def repaintDirtyTiles(self):
+        # Dirty tiles are cleared and their neighbors repainted too, clipped to the dirty area
+        if self.allDirty:
+            region = QtGui.QRegion(self.rect.toRect())
+            tiles = {(x, y) for x in range(13, self.main.sceneWidth, GRID_SIZE)
+                     for y in range(13, self.main.sceneHeight, GRID_SIZE)}
+        else:
+            region = QtGui.QRegion()
+            tiles = set()
+            for x, y in self.dirtyTiles:
+                region += self.getDirtyRect(x, y)
+                for dx in [-GRID_SIZE, 0, GRID_SIZE]:
+                    for dy in [-GRID_SIZE, 0, GRID_SIZE]:
+                        tiles.add((x + dx, y + dy))
+        self.dirtyTiles.clear()
+        self.allDirty = False
+        painter = QtGui.QPainter(self.cache)
+        painter.setClipRegion(region)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+        painter.fillRect(region.boundingRect(), QtCore.Qt.transparent)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
+        self.paintTiles(painter, tiles)
+        painter.end()
+
+    def paint(self, painter, option, widget=None):
+        if self.dirtyTiles or self.allDirty:
+            self.repaintDirtyTiles()
+        painter.drawPixmap(option.exposedRect, self.cache, option.exposedRect)
+        if self.paintOver is not None:
+            self.paintOver(painter)
+
+
+class clsTileOverlay(clsTileLayer):  # Orientation arrows, lock shading, walls and tile highlights
+    def __init__(self, main):
+        super(clsTileOverlay, self).__init__(main, Z_HIGHLIGHT, self.paintCachedTiles)
+        self.rows = int(main.sceneHeight / GRID_SIZE)
+        self.state = bytearray(int(main.sceneWidth / GRID_SIZE) * self.rows)  # TILE_FLAGS bits by tile index
+        self.highlightCount = 0  # Tiles with the highlight bit, the state is only scanned when there are any
+        self.selection = None  # (xMin, yMin, xMax, yMax) tile centers of a highlighted block, floor plan modes
+        self.arrowsVisible = False  # Rotate mode
+        # Arrows have their own cache, kept up to date by dirty tile while hidden, so showing them is one copy
+        self.arrowLayer = clsTileLayer(main, Z_HIGHLIGHT, self.paintArrowTiles)  # Painted by the overlay only
+        self.arrowLayer.markAllDirty()
+
+    def getIndex(self, x, y):  # Same order as main.Tiles
+        return int((x - 13) / GRID_SIZE) * self.rows + int((y - 13) / GRID_SIZE)
+
+    def setTileFlag(self, x, y, shapeType, value):
+        i = self.getIndex(x, y)
+        flag = TILE_FLAGS[shapeType]
+        if bool(self.state[i] & flag) == value:
+            return
+        self.state[i] ^= flag
+        if shapeType == HIGHLIGHT:  # Painted on top of the cache every paint
+            self.highlightCount += 1 if value else -1
+            self.update(QtCore.QRectF(self.getDirtyRect(x, y)).adjusted(-1, -1, 1, 1))  # 3px pen
+        else:
+            self.markDirty(x, y)
+
+    def clearHighlights(self):
+        if self.highlightCount:
+            for i, flags in enumerate(self.state):
+                self.state[i] = flags & ~TILE_FLAGS[HIGHLIGHT]
+            self.highlightCount = 0
+            self.update()
+        self.setSelection(None)
+
+    def setSelection(self, selection):
+        if selection != self.selection:
+            self.selection = selection
+            self.update()
+
+    def setArrowsVisible(self, visible):
+        if visible != self.arrowsVisible:
+            self.arrowsVisible = visible
+            self.update()
+
+    def paintArrowTiles(self, painter, tiles):
+        painter.setPen(QtGui.QPen(QtCore.Qt.red, 2))
+        for tool in self.main.Machines:
+            if (tool.x, tool.y) in tiles:
+                self.paintArrow(painter, tool)
+
+    def paintCachedTiles(self, painter, tiles):  # Lock shading and walls
+        wallPixmap = self.main.imageLib.lib['Wall']['image']
+        painter.setBrush(QtGui.QColor(200, 200, 200))
+        painter.setPen(QtGui.QPen(QtCore.Qt.black, 1))
+        for x, y in tiles:
+            if 0 < x < self.main.sceneWidth and 0 < y < self.main.sceneHeight:  # Neighbors may be off the scene
+                flags = self.state[self.getIndex(x, y)]
+                if flags & TILE_FLAGS[LOCK]:
+                    xShape, yShape = self.main.convertToSceneCoords(x, y, MACHINE_SIZE, MACHINE_SIZE)
+                    painter.drawRect(QtCore.QRectF(xShape, yShape, MACHINE_SIZE, MACHINE_SIZE))
+                if flags & TILE_FLAGS[WALL]:
+                    painter.drawPixmap(*self.main.convertToSceneCoords(x, y, wallPixmap.width(), wallPixmap.height()),
+                                       wallPixmap)
+
+    def paintArrow(self, painter, tool):
+        painter.save()
+        painter.translate(*self.main.convertToSceneCoords(tool.x, tool.y, 0, 0))
+        painter.rotate(ANGLE[tool.orientation])
+        painter.drawLine(QtCore.QLineF(0, 8, 0, -8))  # Straight Line
+        painter.drawLine(QtCore.QLineF(0, 8, -6, 2))  # Diagonal to Left
+        painter.drawLine(QtCore.QLineF(0, 8, 6, 2))  # Diagonal to Right
+        painter.restore()
+
+    def paint(self, painter, option, widget=None):
+        if self.arrowsVisible:  # Arrows are below the locks and walls
+            self.arrowLayer.paint(painter, option, widget)
+        super(clsTileOverlay, self).paint(painter, option, widget)
+        if not self.highlightCount and self.selection is None:
+            return
+        highlights = []
+        if self.highlightCount:
+            for i, flags in enumerate(self.state):
+                if flags & TILE_FLAGS[HIGHLIGHT]:
+                    highlights.append((13 + int(i / self.rows) * GRID_SIZE, 13 + i % self.rows * GRID_SIZE))
+        if self.selection is not None:
+            xMin, yMin, xMax, yMax = self.selection
+            highlights += [(x, y) for x in range(xMin, min(xMax, self.main.sceneWidth) + 1, GRID_SIZE)
+                           for y in range(yMin, min(yMax, self.main.sceneHeight) + 1, GRID_SIZE)]
+        painter.setBrush(QtCore.Qt.NoBrush)
+        painter.setPen(QtGui.QPen(QtCore.Qt.green, 3))
+        for x, y in highlights:
+            xShape, yShape = self.main.convertToSceneCoords(x, y, GRID_SIZE, GRID_SIZE)
+            rect = QtCore.QRectF(xShape, yShape, GRID_SIZE, GRID_SIZE)
+            if option.exposedRect.intersects(rect.adjusted(-2, -2, 2, 2)):
+                painter.drawRect(rect)
+
+
 class clsMachine:
     def __init__(self, main, machine, x, y, orientation, selectedBlueprint, starterQuantity=1, filterLeft=None,
-                 filterRight=None, teleportID=None, filterArm=None):
+                 filterRight=None, teleportID=None, filterArm=None, splitSetting=None):
         # Machine variables
         self.main = main
         self.type = machine  # Machine type
@@ -501,6 +775,8 @@ class clsMachine:
         self.motionInProgress = False  # Robotic Arm - Motion in progress flag
         self.motionFrame = 1  # Robotic Arm - Current motion frame number
         self.returnMotion = False  # Robotic Arm - Motion direction flag
+        self.kinematicsIndex = 0  # Robotic Arm - Row of main.armKinematics for the current frame
+        self.linksStale = False  # Robotic Arm - Link items not moved while off screen, see updateVisibleBounds
         self.heldMaterial = None  # Robotic Arm - Held material object
         self.xPickUpZone = None  # Robotic Arm - Material pick up zone x
         self.yPickUpZone = None  # Robotic Arm - Material pick up zone y
@@ -522,9 +798,11 @@ class clsMachine:
         self.shapeArm2 = None  # Shape Object - Robotic Arm Link 2
         self.xShape = None  # Machine Center x and y in scene coords
         self.yShape = None  # Machine Center x and y in scene coords
-        self.arrow = None
+        self.drawnTile = None  # Tile (x, y) the cached tile layers paint the machine on
 
         self.machineTypeSpecificSetup()
+        if splitSetting is not None:
+            self.splitSetting = list(splitSetting)  # Saved split setting overrides type default
 
         self.drawShape()
 
@@ -613,6 +891,7 @@ class clsMachine:
                 material.drawShape()
                 return
         self.main.updateMessage('Material destroyed by teleporter')
+        self.main.traffic.countDestroyed(material.x, material.y)
         material.delMaterial()  # Del mat if no matching teleporter
 
     # -------- Robotic Arm Methods -------- #
@@ -645,15 +924,14 @@ class clsMachine:
             self.motionInProgress = True
             self.motionFrame = 1
             self.heldMaterial.pickedUp = True
-            self.heldMaterial.shape.setZValue(Z_PICKED_UP)
+            self.heldMaterial.drawShape()  # Redraw above the machine tops
 
     def dropOffMaterial(self):
         self.heldMaterial.x = self.xDropOffZone
         self.heldMaterial.y = self.yDropOffZone - 1  # Drop material 1px below tile center so it moves to center next
         self.heldMaterial.orientation = 'U'  # Set orientation to up so it moves onto tile center next
-        self.heldMaterial.shape.setZValue(Z_MATERIAL)
-        self.heldMaterial.drawShape()
         self.heldMaterial.pickedUp = False
+        self.heldMaterial.drawShape()
         self.heldMaterial = None
         self.returnMotion = True  # Trigger backwards motion animation
 
@@ -665,6 +943,25 @@ class clsMachine:
         elif 36 * GRID_SIZE <= self.x <= 53 * GRID_SIZE:  # Row 36 thru 52 valid
             return 3
 
+    def getRecord(self):  # Constructor arguments to rebuild this machine, used by saves and headless tools
+        return [self.type, self.x, self.y, self.orientation, self.selectedBlueprint, self.starterQuantity,
+                self.filterLeft, self.filterRight, self.teleporterID, self.filterArm,
+                None if self.splitSetting is None else list(self.splitSetting)]
+
+    def getSimulationState(self, materialIndex):  # MACHINE_STATE_FIELDS values + held material index, checkpoints
+        state = [copy.copy(getattr(self, field)) for field in MACHINE_STATE_FIELDS]  # Inventories are live dicts
+        state.append(None if self.heldMaterial is None else materialIndex[id(self.heldMaterial)])
+        return state
+
+    def setSimulationState(self, state, materials):
+        for field, value in zip(MACHINE_STATE_FIELDS, state):
+            setattr(self, field, value)
+        heldMaterial = state[len(MACHINE_STATE_FIELDS)]
+        self.heldMaterial = None if heldMaterial is None else materials[heldMaterial]
+        if self.type in [ROBOTIC_ARM, FILTERED_ARM]:  # Links are posed for the restored motion frame
+            self.setUpdatedArmPositions()
+            self.setLinkPositions()
+
     def setSelectedBlueprint(self, material):  # Only for Starter and Crafter have blueprint select option
         self.selectedBlueprint = material
         self.consideredBlueprints.clear()
@@ -698,7 +995,6 @@ class clsMachine:
         self.setPickupDropOffZones()  # Update pickup/dropoff zone parameters
         self.setUpdatedArmPositions()  # Update arm pos parameters
         self.drawShape()
-        self.drawArrow()  # Redraw the arrow on top
 
     def sellMachine(self):
         self.main.updateBalance(self.main.balance + self.value)
@@ -706,33 +1002,32 @@ class clsMachine:
         self.delMachine()
 
     def delMachine(self):
-        self.delArrow()
         self.delShape()
         self.main.Machines.remove(self)  # Don't del object, remove from list and let garb collect
 
     def drawShape(self):
-        pixmap = self.main.machineLib.lib[self.type]['imageBottom']
-        if self.shapeBottom is None:
-            self.shapeBottom = self.addShapeToScene(pixmap, Z_MACHINE_BOTTOM, rotate=True)
-        self.setShapePosAndPixmap(self.shapeBottom, self.x, self.y, pixmap)
-        self.shapeBottom.setRotation(ANGLE[self.orientation])
-
-        pixmap = self.main.machineLib.lib[self.type]['imageTop']
-        if self.shapeTop is None:
-            self.shapeTop = self.addShapeToScene(pixmap, Z_MACHINE_TOP, rotate=True)
-        self.setShapePosAndPixmap(self.shapeTop, self.x, self.y, pixmap)
-        self.shapeTop.setRotation(ANGLE[self.orientation])
-
-        if self.type in [ROBOTIC_ARM, FILTERED_ARM]:  # Arms shouldn't rotate real-time, setPixmap to rotated version
-            pixmap = self.main.angledPixmapLink1[self.main.thetaAB[self.orientation][self.motionFrame]]
+        self.markTileDirty()  # Repaint old and new tile, the arrow and with STATIC_TILE_CACHE bottom and top
+        self.drawnTile = (self.x, self.y)
+        self.markTileDirty()
+        if not STATIC_TILE_CACHE:
+            pixmap = self.main.machineLib.lib[self.type]['imageBottom']
+            if self.shapeBottom is None:
+                self.shapeBottom = self.addShapeToScene(pixmap, Z_MACHINE_BOTTOM, rotate=True)
+            self.setShapePosAndPixmap(self.shapeBottom, self.x, self.y, pixmap)
+            self.shapeBottom.setRotation(ANGLE[self.orientation])
+
+            pixmap = self.main.machineLib.lib[self.type]['imageTop']
+            if self.shapeTop is None:
+                self.shapeTop = self.addShapeToScene(pixmap, Z_MACHINE_TOP, rotate=True)
+            self.setShapePosAndPixmap(self.shapeTop, self.x, self.y, pixmap)
+            self.shapeTop.setRotation(ANGLE[self.orientation])
+
+        if self.type in [ROBOTIC_ARM, FILTERED_ARM]:  # Links share one pixmap each, rotated by the item transform
             if self.shapeArm1 is None:
-                self.shapeArm1 = self.addShapeToScene(pixmap, Z_ROBOT_ARM, rotate=False)
-            self.setShapePosAndPixmap(self.shapeArm1, self.xAbsLinkCenterAB, self.yAbsLinkCenterAB, pixmap)
-
-            pixmap = self.main.angledPixmapLink2[self.main.thetaBC[self.orientation][self.motionFrame]]
+                self.shapeArm1 = self.addLinkShapeToScene(self.main.pixmapLink1)
             if self.shapeArm2 is None:
-                self.shapeArm2 = self.addShapeToScene(pixmap, Z_ROBOT_ARM, rotate=False)
-            self.setShapePosAndPixmap(self.shapeArm2, self.xAbsLinkCenterBC, self.yAbsLinkCenterBC, pixmap)
+                self.shapeArm2 = self.addLinkShapeToScene(self.main.pixmapLink2)
+            self.setLinkPositions()
 
     def addShapeToScene(self, pixmap, zValue, rotate):
         newShape = self.main.scene.addPixmap(pixmap)
@@ -741,25 +1036,58 @@ class clsMachine:
         newShape.setZValue(zValue)
         return newShape
 
+    def addLinkShapeToScene(self, pixmap):
+        newShape = self.main.scene.addPixmap(pixmap)
+        newShape.setTransformOriginPoint(pixmap.width() / 2, pixmap.height() / 2)  # Rotate around link center
+        newShape.setTransformationMode(QtCore.Qt.SmoothTransformation)
+        newShape.setZValue(Z_ROBOT_ARM)
+        newShape.setVisible(not self.main.lowDetail)  # Zoomed out arms show only their machine image
+        return newShape
+
+    def markTileDirty(self):
+        if self.drawnTile is not None:
+            for layer in self.main.tileLayers:
+                layer.markDirty(*self.drawnTile)
+
+    def paintImage(self, painter, pixmap):  # Paints like the rotated pixmap items of drawShape
+        xShape, yShape = self.main.convertToSceneCoords(self.x, self.y, pixmap.width(), pixmap.height())
+        painter.save()
+        painter.translate(xShape + MACHINE_SIZE / 2, yShape + MACHINE_SIZE / 2)
+        painter.rotate(ANGLE[self.orientation])
+        painter.drawPixmap(QtCore.QPointF(-MACHINE_SIZE / 2, -MACHINE_SIZE / 2), pixmap)
+        painter.restore()
+
     def setShapePosAndPixmap(self, shape, x, y, pixmap):
         xShape, yShape = self.main.convertToSceneCoords(x, y, pixmap.width(), pixmap.height())
         shape.setPos(xShape, yShape)
         shape.setPixmap(pixmap)
 
+    def setLinkPositions(self):
+        # PyQt rotates CW so negative makes it CCW to match kinematics convention
+        self.linksStale = False
+        k = self.main.armKinematics
+        pixmap = self.main.pixmapLink1
+        self.shapeArm1.setPos(*self.main.convertToSceneCoords(self.xAbsLinkCenterAB, self.yAbsLinkCenterAB,
+                                                              pixmap.width(), pixmap.height()))
+        self.shapeArm1.setRotation(-k[self.kinematicsIndex + 6])  # thetaAB
+        pixmap = self.main.pixmapLink2
+        self.shapeArm2.setPos(*self.main.convertToSceneCoords(self.xAbsLinkCenterBC, self.yAbsLinkCenterBC,
+                                                              pixmap.width(), pixmap.height()))
+        self.shapeArm2.setRotation(-k[self.kinematicsIndex + 7])  # thetaBC
+
     def processArmMovement(self):
         if self.motionInProgress is True:
-            # Display next gif frame
+            # Display next gif frame, link items off screen catch up when they come into view
             self.setUpdatedArmPositions()
-            self.setShapePosAndPixmap(self.shapeArm1, self.xAbsLinkCenterAB, self.yAbsLinkCenterAB,
-                                      self.main.angledPixmapLink1[
-                                          self.main.thetaAB[self.orientation][self.motionFrame]])
-            self.setShapePosAndPixmap(self.shapeArm2, self.xAbsLinkCenterBC, self.yAbsLinkCenterBC,
-                                      self.main.angledPixmapLink2[
-                                          self.main.thetaBC[self.orientation][self.motionFrame]])
+            xMin, yMin, xMax, yMax = self.main.visibleBounds
+            if xMin <= self.x <= xMax and yMin <= self.y <= yMax:
+                self.setLinkPositions()
+            else:
+                self.linksStale = True
             self.moveMaterialHeldByArm()
 
             # Set material down and start return animation
-            if self.motionFrame == 48:  # Robotic Arm should have 48 frames
+            if self.motionFrame == ARM_MOTION_FRAMES:  # Robotic Arm should have 48 frames
                 self.dropOffMaterial()
 
             # Mark end of animation
@@ -774,18 +1102,25 @@ class clsMachine:
                 self.motionFrame -= 1
 
     def setUpdatedArmPositions(self):
-        self.xAbsLinkCenterAB = self.x + self.main.xRelLinkCenterAB[self.orientation][self.motionFrame]
-        self.yAbsLinkCenterAB = self.y + self.main.yRelLinkCenterAB[self.orientation][self.motionFrame]
+        # Row of the current orientation and motion frame in the flat kinematics table, read by the methods below
+        self.kinematicsIndex = (ORIENTATION_CODE[self.orientation] * (ARM_MOTION_FRAMES + 1) + self.motionFrame) \
+            * ARM_KINEMATICS_STRIDE
+        k = self.main.armKinematics
+        i = self.kinematicsIndex
+        self.xAbsLinkCenterAB = self.x + k[i]
+        self.yAbsLinkCenterAB = self.y + k[i + 1]
 
-        self.xAbsLinkCenterBC = self.x + self.main.xRelLinkCenterBC[self.orientation][self.motionFrame]
-        self.yAbsLinkCenterBC = self.y + self.main.yRelLinkCenterBC[self.orientation][self.motionFrame]
+        self.xAbsLinkCenterBC = self.x + k[i + 2]
+        self.yAbsLinkCenterBC = self.y + k[i + 3]
 
     def moveMaterialHeldByArm(self):
         if self.heldMaterial is not None:
-            self.heldMaterial.move(self.x + self.main.xRelC[self.orientation][self.motionFrame],
-                                   self.y + self.main.yRelC[self.orientation][self.motionFrame])
+            k = self.main.armKinematics
+            self.heldMaterial.move(self.x + k[self.kinematicsIndex + 4], self.y + k[self.kinematicsIndex + 5])
 
     def delShape(self):
+        self.markTileDirty()
+        self.drawnTile = None
         if self.shapeTop is not None:
             self.main.scene.removeItem(self.shapeTop)
             self.shapeTop = None
@@ -799,29 +1134,6 @@ class clsMachine:
             self.main.scene.removeItem(self.shapeArm2)
             self.shapeArm2 = None
 
-    def drawArrow(self):
-        # Define arrow path in space
-        path = QtGui.QPainterPath()
-        path.moveTo(0, 8)  # Straight Line
-        path.lineTo(0, -8)
-        path.moveTo(0, 8)  # Diagonal to Left
-        path.lineTo(-6, 2)
-        path.moveTo(0, 8)  # Diagonal to Right
-        path.lineTo(6, 2)
-
-        # Add arrow to scene, set position, set rotation
-        self.delArrow()
-        self.xShape, self.yShape = self.main.convertToSceneCoords(self.x, self.y, 0, 0)
-        self.arrow = self.main.scene.addPath(path, QtGui.QPen(QtCore.Qt.red, 2))
-        self.arrow.setPos(self.xShape, self.yShape)
-        self.arrow.setZValue(Z_ARROW)
-        self.arrow.setRotation(ANGLE[self.orientation])
-
-    def delArrow(self):
-        if self.arrow is not None:
-            self.main.scene.removeItem(self.arrow)
-            self.arrow = None
-
 
 class clsMaterial:
     def __init__(self, main, materialType, x, y, orientation, quantity):
@@ -838,6 +1150,7 @@ class clsMaterial:
         self.xVisOffset = 0  # Visual x offset on rollers
         self.yVisOffset = 0  # Visual y offset on rollers
         self.image = None
+        self.fragment = None  # Pixmap fragment painted by the material layers
 
         # Material Shape Setup
         self.xShape = None
@@ -854,6 +1167,8 @@ class clsMaterial:
             self.image = self.main.materialLib.lib[self.type]['image_qty_2']
         elif self.quantity == 3:
             self.image = self.main.materialLib.lib[self.type]['image_qty_3']
+        if MATERIAL_BATCH_PAINT:  # Drawn by the material layers, the center is set at each paint
+            self.fragment = QtGui.QPainter.PixmapFragment.create(QtCore.QPointF(), QtCore.QRectF(self.image.rect()))
 
     def rollerMove(self):  # Move forward 1px by orientation
         i = ORIENTATIONS.index(self.orientation)  # [U, L, D, R]
@@ -861,16 +1176,18 @@ class clsMaterial:
         yMovement = [1, 0, -1, 0]
         self.x += xMovement[i]
         self.y += yMovement[i]
-        self.xShape, self.yShape = self.main.convertToSceneCoords(self.x + self.xVisOffset, self.y + self.yVisOffset,
-                                                                  MAT_SIZE, MAT_SIZE)
-        self.shape.setPos(self.xShape, self.yShape)
+        if self.shape is not None:  # Batched materials are painted from x and y by the material layers
+            self.xShape, self.yShape = self.main.convertToSceneCoords(self.x + self.xVisOffset,
+                                                                      self.y + self.yVisOffset, MAT_SIZE, MAT_SIZE)
+            self.shape.setPos(self.xShape, self.yShape)
 
     def move(self, xNew, yNew):  # Move material to given location
         self.x = xNew
         self.y = yNew
-        self.xShape, self.yShape = self.main.convertToSceneCoords(self.x + self.xVisOffset, self.y + self.yVisOffset,
-                                                                  MAT_SIZE, MAT_SIZE)
-        self.shape.setPos(self.xShape, self.yShape)
+        if self.shape is not None:
+            self.xShape, self.yShape = self.main.convertToSceneCoords(self.x + self.xVisOffset,
+                                                                      self.y + self.yVisOffset, MAT_SIZE, MAT_SIZE)
+            self.shape.setPos(self.xShape, self.yShape)
 
     def checkIfAtTileCenter(self):
         # This method may or may not be faster. Need to do a speed test to find out if it is.
@@ -891,6 +1208,14 @@ class clsMaterial:
     def setGroupVisualOffset(self, offsetList):
         self.xVisOffset, self.yVisOffset = offsetList[self.groupPos % 9]  # Mod 9 to restart positioning after 9
 
+    def getSimulationState(self):  # MATERIAL_STATE_FIELDS values, checkpoints
+        return [getattr(self, field) for field in MATERIAL_STATE_FIELDS]
+
+    def setSimulationState(self, state):
+        for field, value in zip(MATERIAL_STATE_FIELDS, state):
+            setattr(self, field, value)
+        self.drawShape()  # Picked up materials are drawn above the machine tops
+
     def delMaterial(self):
         if self.group is not None:
             self.group.remove(self)  # Remove material from group
@@ -899,16 +1224,20 @@ class clsMaterial:
 
     def drawShape(self):
         self.delShape()
+        if MATERIAL_BATCH_PAINT:
+            return  # Material layers repaint from the Materials list
         self.xShape, self.yShape = self.main.convertToSceneCoords(self.x + self.xVisOffset, self.y + self.yVisOffset,
                                                                   MAT_SIZE, MAT_SIZE)
         self.shape = self.main.scene.addPixmap(self.image)
-        self.shape.setZValue(Z_MATERIAL)
+        self.shape.setZValue(Z_PICKED_UP if self.pickedUp else Z_MATERIAL)
         self.shape.setPos(self.xShape, self.yShape)
 
     def delShape(self):
         if self.shape is not None:
             self.main.scene.removeItem(self.shape)
             self.shape = None
+        elif MATERIAL_BATCH_PAINT:
+            self.main.updateMaterialLayers()  # Also shows changes made while paused
 
 
 class clsTile:
@@ -919,9 +1248,6 @@ class clsTile:
         self.assyLine = self.getAssyLineNumber()
         self.locked = False
         self.walled = False
-        self.shape_highlight = None
-        self.shape_lock = None
-        self.shape_wall = None
         self.xShape = None
         self.yShape = None
         self.xShape = self.x
@@ -964,43 +1290,11 @@ class clsTile:
     def markAsNotHighlighted(self):
         self.delShape(HIGHLIGHT)
 
-    def drawShape(self, shapeType):
-        self.delShape(shapeType)
-        if shapeType == HIGHLIGHT:
-            self.xShape, self.yShape = self.main.convertToSceneCoords(self.x, self.y, GRID_SIZE, GRID_SIZE)
-            self.shape_highlight = QtWidgets.QGraphicsRectItem(
-                QtCore.QRectF(self.xShape, self.yShape, GRID_SIZE, GRID_SIZE))
-            self.shape_highlight.setZValue(Z_HIGHLIGHT)
-            self.shape_highlight.setPen(QtGui.QPen(QtCore.Qt.green, 3))
-            self.main.scene.addItem(self.shape_highlight)
-        elif shapeType == LOCK:
-            self.xShape, self.yShape = self.main.convertToSceneCoords(self.x, self.y, MACHINE_SIZE, MACHINE_SIZE)
-            self.shape_lock = QtWidgets.QGraphicsRectItem(
-                QtCore.QRectF(self.xShape, self.yShape, MACHINE_SIZE, MACHINE_SIZE))
-            self.shape_lock.setZValue(Z_HIGHLIGHT)
-            self.shape_lock.setBrush(QtGui.QColor(200, 200, 200))
-            self.shape_lock.setPen(QtGui.QPen(QtCore.Qt.black, 1))
-            self.main.scene.addItem(self.shape_lock)
-        elif shapeType == WALL:
-            pixmap = self.main.imageLib.lib['Wall']['image']
-            self.xShape, self.yShape = self.main.convertToSceneCoords(self.x, self.y, pixmap.width(), pixmap.height())
-            self.shape_wall = self.main.scene.addPixmap(pixmap)
-            self.shape_wall.setZValue(Z_HIGHLIGHT)
-            self.shape_wall.setPos(self.xShape, self.yShape)
+    def drawShape(self, shapeType):  # Painted by the tile overlay from its state bits
+        self.main.tileOverlay.setTileFlag(self.x, self.y, shapeType, True)
 
     def delShape(self, shapeType):
-        if shapeType == HIGHLIGHT:
-            if self.shape_highlight is not None:
-                self.main.scene.removeItem(self.shape_highlight)
-                self.shape_highlight = None
-        elif shapeType == LOCK:
-            if self.shape_lock is not None:
-                self.main.scene.removeItem(self.shape_lock)
-                self.shape_lock = None
-        elif shapeType == WALL:
-            if self.shape_wall is not None:
-                self.main.scene.removeItem(self.shape_wall)
-                self.shape_wall = None
+        self.main.tileOverlay.setTileFlag(self.x, self.y, shapeType, False)
 
 
 # noinspection PyArgumentList,PyArgumentList,PyUnresolvedReferences
@@ -1608,7 +1902,7 @@ class toolPropertiesMenu(baseMenuFrame):
             self.IDNumL.setText(str(self.main.selectedTool.teleporterID))
 
     def clearInventory(self):
-        self.main.selectedTool.clearInventory()
+        self.main.performAction('clearInventoryAt', self.main.selectedTool.x, self.main.selectedTool.y)
         self.refreshInventory()
 
     def refreshInventory(self):
@@ -1625,7 +1919,7 @@ class toolPropertiesMenu(baseMenuFrame):
             self.inventoryNameL[i].setText(key)
 
     def setStarterQuantity(self, quantity):
-        self.main.selectedTool.starterQuantity = quantity
+        self.main.performAction('setStarterQuantityAt', self.main.selectedTool.x, self.main.selectedTool.y, quantity)
 
         # Enable Button Based On Research Status
         if self.main.starterMaxSpawnQuantity >= 1:
@@ -1656,27 +1950,17 @@ class toolPropertiesMenu(baseMenuFrame):
             self.main.toolPropertiesFrame.changeQty3B.setStyleCode('Blue-Square')
 
     def setSplitSetting(self, direction, amount):
-        if self.main.selectedTool.splitSetting[direction] + amount >= 1:  # Prevent setting from going below 1
-            self.main.selectedTool.splitSetting[direction] += amount
-            if self.main.selectedTool.type in [SPLITTER_3WAY, SPLITTER_LEFT, SPLITTER_TEE]:
-                self.leftL.setText('%s' % self.main.selectedTool.splitSetting[0])
-            if self.main.selectedTool.type in [SPLITTER_3WAY, SPLITTER_LEFT, SPLITTER_RIGHT]:
-                self.straightL.setText('%s' % self.main.selectedTool.splitSetting[1])
-            if self.main.selectedTool.type in [SPLITTER_3WAY, SPLITTER_RIGHT, SPLITTER_TEE]:
-                self.rightL.setText('%s' % self.main.selectedTool.splitSetting[2])
-        else:
-            self.main.updateMessage('Setting must be greater than zero')
+        self.main.performAction('setSplitSettingAt', self.main.selectedTool.x, self.main.selectedTool.y, direction,
+                                amount)
+        if self.main.selectedTool.type in [SPLITTER_3WAY, SPLITTER_LEFT, SPLITTER_TEE]:
+            self.leftL.setText('%s' % self.main.selectedTool.splitSetting[0])
+        if self.main.selectedTool.type in [SPLITTER_3WAY, SPLITTER_LEFT, SPLITTER_RIGHT]:
+            self.straightL.setText('%s' % self.main.selectedTool.splitSetting[1])
+        if self.main.selectedTool.type in [SPLITTER_3WAY, SPLITTER_RIGHT, SPLITTER_TEE]:
+            self.rightL.setText('%s' % self.main.selectedTool.splitSetting[2])
 
     def setTeleporterID(self, adjustment):
-        if self.main.selectedTool.teleporterID is None:
-            self.main.selectedTool.teleporterID = 1
-        elif self.main.selectedTool.teleporterID + adjustment >= 1:
-            self.main.selectedTool.teleporterID += adjustment
-        else:
-            self.main.updateMessage('Setting must be greater than zero')
-
-        self.main.activateValidTeleporters()
-
+        self.main.performAction('setTeleporterIDAt', self.main.selectedTool.x, self.main.selectedTool.y, adjustment)
         self.openMenuAndUpdateInfo()
         self.main.raiseFrame(self)
 
@@ -1737,7 +2021,7 @@ class blueprintSelectMenu(scrollingBaseMenuFrame):
                 self.wids[material]['base']['label'].setStyleCode('White-Square')
 
     def setSelectedBlueprint(self, material):
-        self.main.selectedTool.setSelectedBlueprint(material)
+        self.main.performAction('setBlueprintAt', self.main.selectedTool.x, self.main.selectedTool.y, material)
         self.main.closeMode()
 
 
@@ -1789,12 +2073,7 @@ class filterSelectMenu(scrollingBaseMenuFrame):
 
     def setFilter(self, material, side):
         self.main.closeMode()
-        if side == LEFT:
-            self.main.selectedTool.filterLeft = material
-        elif side == RIGHT:
-            self.main.selectedTool.filterRight = material
-        elif side == ARM:
-            self.main.selectedTool.filterArm = material
+        self.main.performAction('setFilterAt', self.main.selectedTool.x, self.main.selectedTool.y, side, material)
 
 
 # noinspection PyArgumentList,PyArgumentList
@@ -1843,7 +2122,7 @@ class buildMenu(baseMenuFrame):
             self.wids[machine]['lockLabel'].setSizePolicy(QtWidgets.QSizePolicy.Expanding,
                                                           QtWidgets.QSizePolicy.Expanding)
             self.wids[machine]['lockLabel'].clicked.connect(
-                lambda state, machine=machine: self.main.unlockMachine(machine))
+                lambda state, machine=machine: self.main.performAction('unlockMachine', machine))
             self.itemGrid.addWidget(self.wids[machine]['lockImg'], 0, 0)
             self.itemGrid.addWidget(self.wids[machine]['lockLabel'], 0, 1)
 
@@ -1900,24 +2179,29 @@ class blueprintsMenu(scrollingBaseMenuFrame):
                     '', self.main.materialLib.lib[material]['image'].scaled(32, 32), 'Blue-None')
                 self.wids[material]['base']['price'] = QLabelA(
                     '$%s' % self.main.shortNum(self.main.materialLib.lib[material]['value']), 'Blue-None', None, 11)
+                self.wids[material]['base']['margin'] = QLabelA(
+                    'Margin $%s, %i Raw' % (self.main.shortNum(self.main.recipeGraph.margin[material]),
+                                            sum(self.main.recipeGraph.rawMaterials[material].values())),
+                    'Blue-None', None, 9)
 
                 cellFrame = QtWidgets.QFrame()
                 cellFrame.setStyleSheet('background-color: steelblue;\
                                          border: 1px solid black;\
                                          border-radius: 4')
-                cellFrame.setFixedSize(180, 100)
+                cellFrame.setFixedSize(180, 120)
                 cellGrid = QtWidgets.QGridLayout()
                 cellGrid.setContentsMargins(2, 0, 2, 2)
                 cellGrid.addWidget(self.wids[material]['base']['label'], 0, 0, 1, 2)
                 cellGrid.addWidget(self.wids[material]['base']['img'], 1, 1, 1, 1)
                 cellGrid.addWidget(self.wids[material]['base']['price'], 1, 0, 1, 1)
+                cellGrid.addWidget(self.wids[material]['base']['margin'], 2, 0, 1, 2)
                 cellFrame.setLayout(cellGrid)
 
                 cellFrame.setContentsMargins(10, 2, 10, 10)
 
                 self.itemGrid.addWidget(cellFrame, 1, 1, 1, 1, QtCore.Qt.AlignCenter)
                 self.itemGrid.setColumnMinimumWidth(1, 200)  # Only changes left frame column width
-                self.itemGrid.setRowMinimumHeight(1, 120)
+                self.itemGrid.setRowMinimumHeight(1, 140)
 
                 # Add Lock Widgets Over Components
                 self.wids[material]['base']['lock'] = QPushButtonA(
@@ -1926,7 +2210,7 @@ class blueprintsMenu(scrollingBaseMenuFrame):
                 self.wids[material]['base']['lock'].setFixedSize(550, 100)
                 self.itemGrid.addWidget(self.wids[material]['base']['lock'], 1, 2, 1, 3, QtCore.Qt.AlignCenter)
                 self.wids[material]['base']['lock'].clicked.connect(
-                    lambda state, material=material: self.main.unlockBlueprint(material))
+                    lambda state, material=material: self.main.performAction('unlockBlueprint', material))
 
                 # Create cover to place in front of lock button when item is unlocked
                 self.wids[material]['base']['cover'] = QLabelA('', 'LightGray-Round')
@@ -2007,7 +2291,8 @@ class researchMenu(scrollingBaseMenuFrame):
             self.wids[option]['lock'] = QPushButtonA(
                 'Unlock for $%s' %
                 self.main.shortNum(self.main.researchLib.lib[option]['cost']), 'MediumGray-Round', 200)
-            self.wids[option]['lock'].clicked.connect(lambda state, option=option: self.main.unlockResearch(option))
+            self.wids[option]['lock'].clicked.connect(
+                lambda state, option=option: self.main.performAction('unlockResearch', option))
 
             cellFrame = QtWidgets.QFrame()
             cellFrame.setStyleSheet('QFrame{background-color: white;\
@@ -2057,11 +2342,11 @@ class assyLineMenu(baseMenuFrame):
         self.grid.setContentsMargins(20, 20, 20, 20)
 
         self.line2BLocked = QPushButtonA('Unlock Assembly Line 2 - $10M', 'MediumGray-Round', 300)
-        self.line2BLocked.clicked.connect(lambda state: self.main.buyAssyLine('Line2', 10000000))
+        self.line2BLocked.clicked.connect(lambda state: self.main.performAction('buyAssyLine', 'Line2', 10000000))
         self.grid.addWidget(self.line2BLocked, 0, 0)
 
         self.line3BLocked = QPushButtonA('Unlock Assembly Line 3 - $500M', 'MediumGray-Round', 300)
-        self.line3BLocked.clicked.connect(lambda state: self.main.buyAssyLine('Line3', 500000000))
+        self.line3BLocked.clicked.connect(lambda state: self.main.performAction('buyAssyLine', 'Line3', 500000000))
         self.grid.addWidget(self.line3BLocked, 1, 0)
 
         self.contents.setLayout(self.grid)
@@ -2194,6 +2479,15 @@ class incomeAnalysisMenu(baseMenuFrame):
             self.grid.addWidget(self.wids[i]['Profit'], i + 1, 3)
             self.grid.addWidget(self.wids[i]['PPS'], i + 1, 4)
 
+        # Steady state prediction from the throughput model
+        self.wids['PredictedHeader'] = QLabelA('Predicted (Steady State)', 'White-Square-Table-Title')
+        self.wids['Predicted'] = QLabelA('', 'White-Square-Table')
+        self.wids['PredictedLimit'] = QLabelA('', 'White-Square-Table')
+        self.grid.addWidget(self.wids['PredictedHeader'], 11, 1, 1, 4)
+        self.grid.addWidget(self.wids['Predicted'], 12, 1, 1, 4)
+        self.grid.addWidget(self.wids['PredictedLimit'], 13, 1, 1, 4)
+        self.grid.setRowMinimumHeight(10, 20)
+
         self.contents.setLayout(self.grid)
 
         self.reset()
@@ -2205,6 +2499,17 @@ class incomeAnalysisMenu(baseMenuFrame):
             self.wids[i]['Profit'].setText('')
             self.wids[i]['PPS'].setText('')
 
+    def updatePrediction(self, prediction):
+        self.wids['Predicted'].setText('Profit: $%s / Second, Sales: %s Items / Second, Lost: %s Items / Second'
+                                       % (self.main.shortNum(prediction['incomeRate']),
+                                          round(prediction['itemRate'], 2), round(prediction['lostRate'], 2)))
+        tool = prediction['limitingMachine']
+        if tool is None:
+            self.wids['PredictedLimit'].setText('Limited by: Starter supply')
+        else:
+            self.wids['PredictedLimit'].setText('Limited by: %s at tile (%i, %i)' % (
+                tool.type, tool.x // GRID_SIZE + 1, tool.y // GRID_SIZE + 1))
+
 
 # noinspection PyArgumentList
 class frameRateMenu(baseMenuFrame):
@@ -2213,8 +2518,8 @@ class frameRateMenu(baseMenuFrame):
         super(frameRateMenu, self).__init__(parent, main)
 
         # Set Menu Parameters
-        self.setMaximumHeight(660)
-        self.setMinimumHeight(660)
+        self.setMaximumHeight(900)
+        self.setMinimumHeight(900)
         self.titleL.setText('Frame Rate Analysis\n(Last %s Frames ~ %i Seconds )'
                             % (FRAME_RATE_ANALYSIS_LOG_SIZE, int(CYCLE_INTERVAL * FRAME_RATE_ANALYSIS_LOG_SIZE / 1000)))
 
@@ -2255,36 +2560,92 @@ class frameRateMenu(baseMenuFrame):
         self.grid.addWidget(self.wids['Highest'], 1, 4)
         self.grid.addWidget(self.wids['AverageFPS'], 1, 5)
 
-        self.figure = plt.figure()
-        self.canvas = FigureCanvas(self.figure)
-        self.canvas.setContentsMargins(40, 40, 40, 40)
-        layout.addWidget(self.canvas)
+        # Percentiles of frame time and each core loop phase over the same window
+        self.grid.addWidget(QLabelA('Phase (ms)', 'White-Square-Table-Title', 150), 2, 0)
+        for j, percentile in enumerate(HISTOGRAM_PERCENTILES):
+            self.grid.addWidget(QLabelA('p%i' % percentile, 'White-Square-Table-Title', 150), 2, j + 1)
+        self.grid.addWidget(QLabelA('Max', 'White-Square-Table-Title', 150), 2, len(HISTOGRAM_PERCENTILES) + 1)
+        self.grid.addWidget(QLabelA('Mean', 'White-Square-Table-Title', 150), 2, len(HISTOGRAM_PERCENTILES) + 2)
+        self.phaseWids = {}
+        for i, name in enumerate(self.main.phaseHistograms.histograms):
+            self.grid.addWidget(QLabelA(name.replace('Post ', ''), 'White-Square-Table'), i + 3, 0)
+            self.phaseWids[name] = {}
+            for j, column in enumerate(['p%i' % percentile for percentile in HISTOGRAM_PERCENTILES] + ['max', 'mean']):
+                self.phaseWids[name][column] = QLabelA('-', 'White-Square-Table')
+                self.grid.addWidget(self.phaseWids[name][column], i + 3, j + 1)
+
+        # Autosave cost, the snapshot is taken on the GUI thread and the write runs on a worker thread
+        row = len(self.main.phaseHistograms.histograms) + 3
+        self.autosaveWids = {}
+        for j, column in enumerate(['Autosave', 'Snapshot (ms)', 'Write (ms)', 'Written', 'Skipped', 'Last File']):
+            self.grid.addWidget(QLabelA(column, 'White-Square-Table-Title', 150), row, j)
+            self.autosaveWids[column] = QLabelA('-', 'White-Square-Table')
+            self.grid.addWidget(self.autosaveWids[column], row + 1, j)
+
+        # The plot is built on first open, most sessions never open this menu
+        self.figure = None
+        self.canvas = None
+        self.ax = None
+        self.points = None
+        self.xAxisData = list(range(-FRAME_RATE_ANALYSIS_LOG_SIZE, 0))  # [-600, -599... -1]
+        self.background = None
+        self.plotLayout = layout
         layout.addLayout(self.grid)
         self.contents.setLayout(layout)
 
+        # Live refresh while the menu is open
+        self.refreshTimer = QtCore.QTimer(self)
+        self.refreshTimer.timeout.connect(self.refresh)
+
         self.reset()
 
     def openMenuAndUpdateInfo(self):
         self.main.openMenu(self)
         self.main.frameRateAnalyze()
+        self.refreshTimer.start(FRAME_RATE_PLOT_INTERVAL)
 
-    def plot(self):
-        yAxisData = self.main.frameRateResultSet  # Latest data point at end of list
-        xAxisDataBase = [i for i in range(-600, 0, 1)]  # [-600, -599... -1]
-        xAxisData = xAxisDataBase[-len(yAxisData):]  # Slice end portion to match length of yAxisData
+    def refresh(self):
+        if self.main.selectedMenu is not self:  # Menu was closed
+            self.refreshTimer.stop()
+            return
+        self.main.frameRateAnalyze()
 
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        ax.plot(xAxisData, yAxisData, 'o', markersize=3)  # Data points
+    def buildPlot(self):
+        # Axes and limit lines are drawn once, refreshes only redraw the data points over a saved background
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        self.figure = Figure()
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.setContentsMargins(40, 40, 40, 40)
+        self.ax = self.figure.add_subplot(111)
         numFrames = FRAME_RATE_ANALYSIS_LOG_SIZE
-        ax.plot([-numFrames, 0], [int(CYCLE_INTERVAL * 0.9), int(CYCLE_INTERVAL * 0.9)],
-                color='r', linestyle='-', linewidth=1)  # Lower limit line
-        ax.plot([-numFrames, 0], [int(CYCLE_INTERVAL * 1.5), int(CYCLE_INTERVAL * 1.5)],
-                color='r', linestyle='-', linewidth=1)  # Upper limit line
-        ax.set_xlabel('Frame Number')
-        ax.set_ylabel('Time (ms)')
-        ax.set_ylim([0, 140])
-        self.canvas.draw()
+        self.ax.plot([-numFrames, 0], [int(CYCLE_INTERVAL * 0.9), int(CYCLE_INTERVAL * 0.9)],
+                     color='r', linestyle='-', linewidth=1)  # Lower limit line
+        self.ax.plot([-numFrames, 0], [int(CYCLE_INTERVAL * 1.5), int(CYCLE_INTERVAL * 1.5)],
+                     color='r', linestyle='-', linewidth=1)  # Upper limit line
+        self.ax.set_xlabel('Frame Number')
+        self.ax.set_ylabel('Time (ms)')
+        self.ax.set_xlim([-numFrames, 0])
+        self.ax.set_ylim([0, 140])
+        self.points, = self.ax.plot([], [], 'o', markersize=3, animated=True)  # Data points, blitted
+        self.canvas.mpl_connect('draw_event', self.saveBackground)  # Full redraws, e.g. first show and resize
+        self.plotLayout.insertWidget(0, self.canvas)
+
+    def saveBackground(self, event):
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.points)
+
+    def plot(self):
+        if self.canvas is None:
+            self.buildPlot()
+        yAxisData = list(self.main.frameRateResultSet)  # Latest data point at end
+        self.points.set_data(self.xAxisData[len(self.xAxisData) - len(yAxisData):], yAxisData)
+        if self.background is None:
+            self.canvas.draw()  # Saves the background through the draw event
+        else:
+            self.canvas.restore_region(self.background)
+            self.ax.draw_artist(self.points)
+            self.canvas.blit(self.ax.bbox)
 
     def reset(self):
         for i in range(0, 9):
@@ -2292,6 +2653,28 @@ class frameRateMenu(baseMenuFrame):
             self.wids['High Limit'].setText('-')
             self.wids['High'].setText('-')
             self.wids['Highest'].setText('-')
+        for name in self.phaseWids:
+            for column in self.phaseWids[name]:
+                self.phaseWids[name][column].setText('-')
+
+    def updatePercentiles(self, summary):
+        for name, values in summary.items():
+            for column in self.phaseWids[name]:
+                self.phaseWids[name][column].setText('%.3f' % values[column])
+
+    def updateAutosave(self, autosaver):
+        if not AUTOSAVE_INTERVAL:
+            state = 'Off'
+        elif autosaver.error is not None:
+            state = 'Failed'
+        else:
+            state = 'Writing' if autosaver.isWriting() else 'Every %i s' % int(AUTOSAVE_INTERVAL / 1000)
+        self.autosaveWids['Autosave'].setText(state)
+        self.autosaveWids['Snapshot (ms)'].setText('%.3f' % autosaver.snapshotMs)
+        self.autosaveWids['Write (ms)'].setText('%.3f' % autosaver.writeMs)
+        self.autosaveWids['Written'].setText(str(autosaver.count))
+        self.autosaveWids['Skipped'].setText(str(autosaver.skipped))
+        self.autosaveWids['Last File'].setText(autosaver.lastFileName or '-')
 
 
 # noinspection PyArgumentList,PyArgumentList,PyArgumentList
@@ -2510,9 +2893,15 @@ class achievementPopUpMenu(QtWidgets.QFrame):
 
 # noinspection PyArgumentList,PyUnresolvedReferences,PyUnresolvedReferences
 class clsMainApp(QtWidgets.QMainWindow):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, startupTimer=None):
         super(clsMainApp, self).__init__(parent)
         print('\nRunning...')
+        if startupTimer is None:  # The launcher passes its timer when assets were loaded behind the splash screen
+            startupTimer = clsStartupTimer(LAUNCH_TIME)
+            startupTimer.mark('Imports & QApplication')
+        self.startupTimer = startupTimer  # Launch to first frame
+        self.startupReport = False  # Print the startup timer report at the first frame
+        self.setupFinished = False  # First frame after finishSetup is the end of startup
 
         self.Tiles = []  # List of all Tiles
         self.Machines = []  # List of all Machines
@@ -2535,6 +2924,10 @@ class clsMainApp(QtWidgets.QMainWindow):
         self.researchLib = researchLib()
         self.achievementLib = achievementLib()
         self.imageLib = imageLib()
+        self.recipeGraph = clsRecipeGraph(self.machineLib.lib, self.materialLib.lib)  # Validates recipe data
+        self.startupTimer.mark('Libraries')
+        self.throughputModel = clsThroughputModel(self.recipeGraph)
+        self.throughputPrediction = None  # Latest steady state prediction of the layout
         self.xClick = None
         self.yClick = None
         self.xClickTileCenter = None
@@ -2544,21 +2937,18 @@ class clsMainApp(QtWidgets.QMainWindow):
         self.selFloorPlan = None
         self.floorPlanTopLeft = None
         self.floorPlanBottomRight = None
-        self.thetaAB = None
-        self.thetaBC = None
-        self.xRelB = None
-        self.yRelB = None
-        self.xRelC = None
-        self.yRelC = None
-        self.xRelLinkCenterAB = None
-        self.yRelLinkCenterAB = None
-        self.xRelLinkCenterBC = None
-        self.yRelLinkCenterBC = None
-        self.angledPixmapLink1 = None
-        self.angledPixmapLink2 = None
+        self.armKinematics = None  # Flat robotic arm motion table, see precomputeRoboticArmKinematics
+        self.pixmapLink1 = None
+        self.pixmapLink2 = None
+        self.visibleBounds = (-math.inf, -math.inf, math.inf, math.inf)  # View area in grid coords (x, y min, max)
+        self.lowDetail = False  # View scale below LOD_DETAIL_SCALE, see updateDetailLevel
         self.timer = None
-        self.timeLogEnabled = False
-        self.timeLog = []  # List of timestamps and information for time profiling
+        self.tracer = clsTickTracer()  # Time profiling of logTimestamp markers and scene paints
+        self.phaseHistograms = clsPhaseHistograms(FRAME_RATE_ANALYSIS_LOG_SIZE)  # Frame and phase time percentiles
+        self.inputRecorder = clsInputRecorder()  # Logs player actions, see performAction
+        self.inputReplayer = None  # Replays a recorded log when set
+        self.autosaver = clsAutosaver()  # Writes autosaves on a worker thread
+        self.autosaveTimer = None
         self.updateNewFloorPlanVisualsFlag = False
         self.updatePlaceFloorPlanVisualsFlag = False
         self.floorPlans = {}
@@ -2582,22 +2972,21 @@ class clsMainApp(QtWidgets.QMainWindow):
         self.machineToBeMoved = None
         self.moneyRate = 0  # Money analysis variables
         self.itemRate = 0
+        self.measuredMoneyRate = 0  # Last income analysis result, compared with the throughput prediction
+        self.measuredItemRate = 0
         self.lastMRAnalysisTime = datetime.datetime.now()
         self.salesCollector = {}
         self.salesAnalysis = {}
+        self.totalSalesIncome = 0  # Running totals for headless tools, value x quantity like the income analysis
+        self.totalSalesItems = 0
         self.clickedTool = None
         self.clickedTile = None
         self.selectedTool = None
         self.selectedMenu = None
-        self.frameRateResultSet = []  # Frame rate analysis variables
+        self.frameRateResultSet = deque(maxlen=FRAME_RATE_ANALYSIS_LOG_SIZE)  # Frame times (ms) ring buffer
         self.lastFrameRateAnalysisTime = datetime.datetime.now()
 
-        self.machineBlueprintList = {}  # Pre-computed dictionary of considered blueprints for each machine type
-        for machineType in [DRAWER, CUTTER, FURNACE, PRESS]:
-            self.machineBlueprintList[machineType] = []
-            for material in self.materialLib.lib:
-                if self.materialLib.lib[material]['class'] == self.machineLib.lib[machineType]['blueprintType']:
-                    self.machineBlueprintList[machineType].append(material)
+        self.machineBlueprintList = self.recipeGraph.machineBlueprints  # Considered blueprints for each machine type
 
         # Menu Geometry Setup
         self.sceneWidth = 1250  # Scene Width
@@ -2614,7 +3003,7 @@ class clsMainApp(QtWidgets.QMainWindow):
         saveAction = QtWidgets.QAction("&Save", self)
         saveAction.setShortcut("Ctrl+S")
         saveAction.setStatusTip('Save Game - Ctrl+S')
-        saveAction.triggered.connect(self.saveConfig)
+        saveAction.triggered.connect(lambda: self.saveConfig())
 
         zoomInAction = QtWidgets.QAction("Zoom In", self)
         zoomInAction.setShortcut("Ctrl++")
@@ -2634,12 +3023,27 @@ class clsMainApp(QtWidgets.QMainWindow):
         loadAction = QtWidgets.QAction("&Load", self)
         loadAction.setShortcut("Ctrl+L")
         loadAction.setStatusTip('Load Game - Ctrl+L')
-        loadAction.triggered.connect(self.loadConfig)
+        loadAction.triggered.connect(lambda: self.loadConfigFromMenu())
+
+        saveCheckpointAction = QtWidgets.QAction("Save Checkpoint", self)
+        saveCheckpointAction.setShortcut("Ctrl+Shift+S")
+        saveCheckpointAction.setStatusTip('Save the game with materials in flight and machine state - Ctrl+Shift+S')
+        saveCheckpointAction.triggered.connect(lambda: self.saveCheckpoint())
+
+        loadCheckpointAction = QtWidgets.QAction("Load Checkpoint", self)
+        loadCheckpointAction.setShortcut("Ctrl+Shift+L")
+        loadCheckpointAction.setStatusTip('Continue from the saved checkpoint - Ctrl+Shift+L')
+        loadCheckpointAction.triggered.connect(lambda: self.loadConfigFromMenu(CHECKPOINT_FILE))
+
+        applyOptimizerAction = QtWidgets.QAction("Apply Optimizer Result", self)
+        applyOptimizerAction.setShortcut("")
+        applyOptimizerAction.setStatusTip('Apply settings found by factoryOptimizer.py')
+        applyOptimizerAction.triggered.connect(lambda: self.loadOptimizerResult())
 
         resetAction = QtWidgets.QAction("&Reset", self)
         resetAction.setShortcut("Ctrl+R")
         resetAction.setStatusTip('Reset Game - Ctrl+R')
-        resetAction.triggered.connect(self.reset)
+        resetAction.triggered.connect(lambda: self.performAction('reset'))
 
         cancelAction = QtWidgets.QAction("Cancel", self)
         cancelAction.setShortcut("ESCAPE")
@@ -2653,9 +3057,44 @@ class clsMainApp(QtWidgets.QMainWindow):
 
         stopTimeLogAction = QtWidgets.QAction("Stop Time Log", self)
         stopTimeLogAction.setShortcut("")
-        stopTimeLogAction.setStatusTip('Stop Time Log')
+        stopTimeLogAction.setStatusTip('Stop Time Log, print the table and save the trace to %s' % TRACE_FILE)
         stopTimeLogAction.triggered.connect(self.stopTimeLog)
 
+        startRecordingAction = QtWidgets.QAction("Start Input Recording", self)
+        startRecordingAction.setShortcut("")
+        startRecordingAction.setStatusTip('Restart from the current layout and record all player actions')
+        startRecordingAction.triggered.connect(self.startInputRecording)
+
+        stopRecordingAction = QtWidgets.QAction("Stop Input Recording", self)
+        stopRecordingAction.setShortcut("")
+        stopRecordingAction.setStatusTip('Stop recording and write the input log')
+        stopRecordingAction.triggered.connect(lambda: self.stopInputRecording())
+
+        replayAction = QtWidgets.QAction("Replay Input Recording", self)
+        replayAction.setShortcut("")
+        replayAction.setStatusTip('Replay the input log from its starting state, paused')
+        replayAction.triggered.connect(lambda: self.startInputReplay())
+
+        pauseAction = QtWidgets.QAction("Pause / Resume", self)
+        pauseAction.setShortcut("F9")
+        pauseAction.setStatusTip('Pause / Resume - F9')
+        pauseAction.triggered.connect(self.togglePause)
+
+        stepAction = QtWidgets.QAction("Step %i Ticks" % REPLAY_STEP_TICKS, self)
+        stepAction.setShortcut("F10")
+        stepAction.setStatusTip('Step %i Ticks while paused - F10' % REPLAY_STEP_TICKS)
+        stepAction.triggered.connect(lambda: self.stepTicks())
+
+        profilerOverlayAction = QtWidgets.QAction("Profiler Overlay", self)
+        profilerOverlayAction.setShortcut("F8")
+        profilerOverlayAction.setStatusTip('Show / Hide per phase tick cost over the factory - F8')
+        profilerOverlayAction.triggered.connect(lambda: self.profilerOverlay.toggle())
+
+        heatmapAction = QtWidgets.QAction("Traffic Heatmap", self)
+        heatmapAction.setShortcut("F7")
+        heatmapAction.setStatusTip('Show / Hide materials per second on each tile and destroyed materials - F7')
+        heatmapAction.triggered.connect(self.toggleHeatmap)
+
         exitAction = QtWidgets.QAction('&Exit', self)
         exitAction.setShortcut('Ctrl+W')
         exitAction.setStatusTip('Exit - Ctrl+W')
@@ -2666,16 +3105,34 @@ class clsMainApp(QtWidgets.QMainWindow):
         mainMenu.addAction(zoomOutAction)
         mainMenu.addAction(zoomResetAction)
         mainMenu.addAction(loadAction)
+        mainMenu.addAction(saveCheckpointAction)
+        mainMenu.addAction(loadCheckpointAction)
+        mainMenu.addAction(applyOptimizerAction)
         mainMenu.addAction(resetAction)
         mainMenu.addAction(cancelAction)
         mainMenu.addAction(startTimeLogAction)
         mainMenu.addAction(stopTimeLogAction)
+        mainMenu.addAction(startRecordingAction)
+        mainMenu.addAction(stopRecordingAction)
+        mainMenu.addAction(replayAction)
+        mainMenu.addAction(pauseAction)
+        mainMenu.addAction(stepAction)
+        mainMenu.addAction(profilerOverlayAction)
+        mainMenu.addAction(heatmapAction)
         mainMenu.addAction(exitAction)
 
         # Main Window Setup
         self.setStyleSheet('QMainWindow{background-color: white}')
         self.setWindowTitle('Factory')
         self.scene = QtWidgets.QGraphicsScene(self)
+        self.materialLayers = []  # Items painting all materials when MATERIAL_BATCH_PAINT is on
+        self.densityRows = int(self.sceneHeight / GRID_SIZE)
+        # Material quantity by tile index (column * rows + row), filled each tick while zoomed out, see paintDensity
+        self.tileDensity = array('L', [0]) * (int(self.sceneWidth / GRID_SIZE) * self.densityRows)
+        if MATERIAL_BATCH_PAINT:
+            for pickedUp in [False, True]:
+                self.materialLayers.append(clsMaterialLayer(self, pickedUp))
+                self.scene.addItem(self.materialLayers[-1])
 
         self.statusBar = QtWidgets.QStatusBar()
         self.setStatusBar(self.statusBar)
@@ -2697,15 +3154,34 @@ class clsMainApp(QtWidgets.QMainWindow):
         # Widget Setup
         self.wids = {}
         self.db = {}
-        self.dbfile = None
 
         self.coreLoop = clsCoreLoop(self)  # Instantiate the coreLoop
 
+        # Tile Overlay (Arrows, locks, walls and highlights)
+        self.tileOverlay = clsTileOverlay(self)
+        self.scene.addItem(self.tileOverlay)
+        self.tileLayers = [self.tileOverlay, self.tileOverlay.arrowLayer]  # Marked by clsMachine.markTileDirty
+
+        # Traffic Heatmap (Hidden until toggled)
+        self.traffic = clsTrafficCounter(int(self.sceneWidth / GRID_SIZE), int(self.sceneHeight / GRID_SIZE),
+                                         GRID_SIZE)  # Per tile material passes, see factoryHeatmap
+        self.heatmapLayer = clsTileLayer(self, Z_HEATMAP, self.paintHeatmapTiles)
+        self.heatmapLayer.hide()
+        self.scene.addItem(self.heatmapLayer)
+
         # Draw Grid Lines
-        for i in range(0, 400 + 1, 25):  # Create horizontal grid lines
-            self.scene.addItem(QtWidgets.QGraphicsLineItem(0, i, 1250, i))
-        for i in range(0, 1250 + 1, 25):  # Create vertical grid lines
-            self.scene.addItem(QtWidgets.QGraphicsLineItem(i, 0, i, 400))
+        if STATIC_TILE_CACHE:  # Grid lines and machines, see paintFloorTiles
+            self.floorLayer = clsTileLayer(self, Z_MACHINE_BOTTOM, self.paintFloorTiles, self.paintGridLines)
+            self.machineTopLayer = clsTileLayer(self, Z_MACHINE_TOP, self.paintMachineTopTiles)
+            for layer in [self.floorLayer, self.machineTopLayer]:
+                self.scene.addItem(layer)
+                self.tileLayers.append(layer)
+            self.floorLayer.markAllDirty()
+        else:
+            for i in range(0, 400 + 1, 25):  # Create horizontal grid lines
+                self.scene.addItem(QtWidgets.QGraphicsLineItem(0, i, 1250, i))
+            for i in range(0, 1250 + 1, 25):  # Create vertical grid lines
+                self.scene.addItem(QtWidgets.QGraphicsLineItem(i, 0, i, 400))
 
         # Header Dock Widget
         self.headerDockWidget = QtWidgets.QFrame()
@@ -2829,8 +3305,9 @@ class clsMainApp(QtWidgets.QMainWindow):
         self.containerGrid.setRowStretch(0, 1)
 
         # Initiate View Menu Frames
-        self.view = QtWidgets.QGraphicsView(self.scene)
+        self.view = clsGraphicsView(self.scene, self)
         self.view.setFixedSize(1300, 440)
+        self.profilerOverlay = clsProfilerOverlay(self)
         self.viewFrame = QtWidgets.QFrame()
         self.viewFrame.setContentsMargins(10, 10, 10, 10)
         self.viewFrame.setStyleSheet('background-color: white;\
@@ -2843,7 +3320,7 @@ class clsMainApp(QtWidgets.QMainWindow):
         self.viewFrame.setLayout(self.viewFrameVBox)
 
         # Zoom Settings
-        self.scaleFactor = 1
+        self.scaleFactor = 1  # View scale, see setZoom
         self.view.scale(self.scaleFactor, self.scaleFactor)
 
         # For mousing position tracking for highlight tile visuals
@@ -2911,6 +3388,7 @@ class clsMainApp(QtWidgets.QMainWindow):
         self.container.setLayout(self.containerGrid)
         self.raiseFrame(self.viewFrame)
         self.setCentralWidget(self.mainWidget)
+        self.startupTimer.mark('Main Window & Menus')
         self.show()
         self.closeMode()
 
@@ -2975,13 +3453,49 @@ class clsMainApp(QtWidgets.QMainWindow):
 
     def viewFrameZoom(self, direction):
         if direction == IN:
-            self.view.setTransform(QtGui.QTransform())  # Reset
-            self.view.scale(2, 2)  # 2.0x
+            self.setZoom(self.scaleFactor * ZOOM_STEP)
         if direction == OUT:
-            self.view.setTransform(QtGui.QTransform())  # Reset
-            self.view.scale(0.5, 0.5)  # 0.5x
+            self.setZoom(self.scaleFactor / ZOOM_STEP)
         if direction == RESET:
-            self.view.setTransform(QtGui.QTransform())  # Reset
+            self.setZoom(1)
+
+    def setZoom(self, scale, viewPoint=None):
+        # Any scale from ZOOM_MIN to ZOOM_MAX, the scene point under viewPoint (viewport coords) stays in place
+        scale = min(ZOOM_MAX, max(ZOOM_MIN, scale))
+        anchor = self.view.mapToScene(viewPoint) if viewPoint is not None else None
+        self.view.setTransform(QtGui.QTransform.fromScale(scale, scale))
+        if anchor is not None:
+            center = self.view.mapToScene(self.view.viewport().rect().center())
+            self.view.centerOn(center + anchor - self.view.mapToScene(viewPoint))
+        self.scaleFactor = scale
+        self.updateDetailLevel()
+        self.updateVisibleBounds()
+
+    def updateDetailLevel(self):
+        lowDetail = self.scaleFactor < LOD_DETAIL_SCALE
+        if lowDetail != self.lowDetail:
+            self.lowDetail = lowDetail
+            for tool in self.Machines:
+                for shape in [tool.shapeArm1, tool.shapeArm2]:
+                    if shape is not None:
+                        shape.setVisible(not lowDetail)
+            if lowDetail:
+                self.countTileDensity()  # Counts are only kept up to date while zoomed out
+            self.updateMaterialLayers()
+
+    def updateVisibleBounds(self):
+        # Scene area shown by the view plus ARM_CULL_MARGIN in grid coords, only Qt side work is culled by it
+        # Zoomed out nothing is visible for the robotic arm links, they are hidden and stop animating
+        rect = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        if self.lowDetail:
+            self.visibleBounds = (math.inf, math.inf, -math.inf, -math.inf)
+        else:
+            self.visibleBounds = (rect.left() - ARM_CULL_MARGIN, self.sceneHeight - rect.bottom() - ARM_CULL_MARGIN,
+                                  rect.right() + ARM_CULL_MARGIN, self.sceneHeight - rect.top() + ARM_CULL_MARGIN)
+        xMin, yMin, xMax, yMax = self.visibleBounds
+        for tool in self.Machines:
+            if tool.linksStale and xMin <= tool.x <= xMax and yMin <= tool.y <= yMax:
+                tool.setLinkPositions()
 
     def buildMachineAttempt(self, event, machine):
         self.clicked(event)
@@ -2990,28 +3504,31 @@ class clsMainApp(QtWidgets.QMainWindow):
                     and not self.clickedTile.locked \
                     and not self.clickedTile.walled \
                     and self.clickedTool is None:
-                self.buildMachineIfAbleToBuildAny(
-                    machine, self.clickedTile.x, self.clickedTile.y, 'D', None, 1, None, None, 1)
+                self.performAction('buildMachineIfAbleToBuildAny',
+                                   machine, self.clickedTile.x, self.clickedTile.y, 'D', None, 1, None, None, 1)
             else:
                 self.updateMessage('Invalid Location')
 
     def buildMachineIfAbleToBuildAny(self, machine, x, y, orientation, selectedBlueprint, starterQuantity, filterLeft,
-                                     filterRight, teleportID):
+                                     filterRight, teleportID, filterArm=None, splitSetting=None):
         # Checks balance & max machine limits
+        assyLine = self.getTile(x, y).assyLine  # Same line as the clicked tile, also for floor plans
         if machine == STARTER and self.maxStarters is not None \
-                and self.getNumberMachinesInClickedAssyLine(STARTER) >= self.maxStarters:
+                and self.getNumberMachinesInAssyLine(STARTER, assyLine) >= self.maxStarters:
             # noinspection PyStringFormat
             self.updateMessage('Maximum amount of Starters (%i) already placed in this line' % self.maxStarters)
         elif machine == TELEPORTER_INPUT and self.maxStarters is not None \
-                and self.getNumberMachinesInClickedAssyLine(TELEPORTER_INPUT) >= self.maxTeleporters:
+                and self.getNumberMachinesInAssyLine(TELEPORTER_INPUT, assyLine) >= self.maxTeleporters:
             # noinspection PyStringFormat
             self.updateMessage('Maximum amount of Teleporters (%i) already placed in this line' % self.maxTeleporters)
         else:
             self.Machines.append(clsMachine(self, machine, x, y, orientation,
-                                            selectedBlueprint, starterQuantity, filterLeft, filterRight, teleportID))
+                                            selectedBlueprint, starterQuantity, filterLeft, filterRight, teleportID,
+                                            filterArm, splitSetting))
             self.updateBalance(self.balance - self.machineLib.lib[machine]['buildCost'])
             self.updateMessage(
                 'Purchased %s for $%s' % (machine, self.shortNum(self.machineLib.lib[machine]['buildCost'])))
+            self.updateThroughputPrediction()
 
     def buildMode(self, machine):
         self.closeMode()
@@ -3040,7 +3557,8 @@ class clsMainApp(QtWidgets.QMainWindow):
     def moveMachineTo(self, event):
         self.clicked(event)
         if not self.clickedTile.locked and not self.clickedTile.walled and self.clickedTool is None:
-            self.machineToBeMoved.moveMachine(self.xClickTileCenter, self.yClickTileCenter)
+            self.performAction('moveMachineAt', self.machineToBeMoved.x, self.machineToBeMoved.y,
+                               self.xClickTileCenter, self.yClickTileCenter)
             self.machineToBeMoved = None
             self.delAllHighlights()
             self.moveMode()
@@ -3057,7 +3575,7 @@ class clsMainApp(QtWidgets.QMainWindow):
     def rotateMachineAttempt(self, event):
         self.clicked(event)
         if self.clickedTool:
-            self.clickedTool.rotateMachine()
+            self.performAction('rotateMachineAt', self.clickedTool.x, self.clickedTool.y)
 
     def sellMode(self):
         self.deselectAllButtons()
@@ -3068,7 +3586,7 @@ class clsMainApp(QtWidgets.QMainWindow):
     def sellMachineAttempt(self, event):
         self.clicked(event)
         if self.clickedTool:
-            self.clickedTool.sellMachine()
+            self.performAction('sellMachineAt', self.clickedTool.x, self.clickedTool.y)
 
     def buyTilesMode(self):
         self.deselectAllButtons()
@@ -3080,7 +3598,7 @@ class clsMainApp(QtWidgets.QMainWindow):
         self.clicked(event)
         if self.clickedTile.locked is True and self.clickedTile.walled is False:
             if self.balance >= self.getTilePrice():
-                self.clickedTile.buyTile()
+                self.performAction('buyTileAt', self.clickedTile.x, self.clickedTile.y)
             else:
                 self.updateMessage('Not enough money')
         else:
@@ -3099,10 +3617,6 @@ class clsMainApp(QtWidgets.QMainWindow):
         self.selFloorPlan = planNum
         self.floorPlan_button.setStyleCode('Blue-White-Square-Menu-Bottom-Side')
         self.statusBar.showMessage('Select top left corner to start creating floor plan')
-        for tile in self.Tiles:  # Pre-draw tile highlights & setVisibility
-            tile.drawShape(HIGHLIGHT)
-            tile.shape_highlight.setZValue(Z_HIGHLIGHT)
-            tile.shape_highlight.setVisible(False)
         self.scene.mouseReleaseEvent = lambda event: self.newFloorPlanSelBotRightMode(event)
 
     def newFloorPlanSelBotRightMode(self, event):
@@ -3138,11 +3652,10 @@ class clsMainApp(QtWidgets.QMainWindow):
         yBottomLeftCorner = self.floorPlanBottomRight.y
         self.floorPlans[self.selFloorPlan]['machines'].clear()
         for i, tool in enumerate(selectedTools):
-            xRelative = tool.x - xBottomLeftCorner
-            yRelative = tool.y - yBottomLeftCorner
-            self.floorPlans[self.selFloorPlan]['machines'][i] = [tool.type, xRelative, yRelative, tool.orientation,
-                                                                 tool.selectedBlueprint, tool.starterQuantity,
-                                                                 tool.filterLeft, tool.filterRight, tool.teleporterID]
+            record = tool.getRecord()
+            record[1] = tool.x - xBottomLeftCorner  # Relative x, y
+            record[2] = tool.y - yBottomLeftCorner
+            self.floorPlans[self.selFloorPlan]['machines'][i] = record
         self.floorPlanMenuFrame.reset()
         self.updateMessage('Floor Plan Saved!')
         self.closeMode()
@@ -3157,21 +3670,14 @@ class clsMainApp(QtWidgets.QMainWindow):
         if (x, y) != (self.xCursorTileCenter, self.yCursorTileCenter):
             self.xCursorTileCenter, self.yCursorTileCenter = x, y
 
-            for tile in self.Tiles:
-                if self.floorPlanTopLeft.x <= tile.x <= self.xCursorTileCenter \
-                        and self.yCursorTileCenter <= tile.y <= self.floorPlanTopLeft.y:
-                    tile.shape_highlight.setVisible(True)
-                else:
-                    tile.shape_highlight.setVisible(False)
+            self.floorPlanTopLeft.delShape(HIGHLIGHT)  # Part of the selection when it is not empty
+            self.tileOverlay.setSelection((self.floorPlanTopLeft.x, self.yCursorTileCenter,
+                                           self.xCursorTileCenter, self.floorPlanTopLeft.y))
 
     def placeFloorPlanSelTopLeftMode(self, planNum):
         self.closeMode()
         self.floorPlan_button.setStyleCode('Blue-Square-Menu-Bottom-Side')
         self.selFloorPlan = planNum
-        for tile in self.Tiles:  # Pre-draw tile highlights & setVisibility
-            tile.drawShape(HIGHLIGHT)
-            tile.shape_highlight.setZValue(Z_HIGHLIGHT)
-            tile.shape_highlight.setVisible(False)
         self.view.setMouseTracking(True)  # Start mouse tracking
         self.updatePlaceFloorPlanVisualsFlag = True  # Flag starts visuals
         self.statusBar.showMessage('Mode: Select valid location to place floor plan')
@@ -3182,10 +3688,11 @@ class clsMainApp(QtWidgets.QMainWindow):
         self.floorPlanBottomRight = self.clickedTile
         if self.checkValidFloorPlanSpacing(self.clickedTile) is True:
             for key, value in self.floorPlans[self.selFloorPlan]['machines'].items():
-                self.buildMachineIfAbleToBuildAny(value[0],
-                                                  value[1] + self.clickedTile.x,  # Conv self.floorPlan rel x, y to abs
-                                                  value[2] + self.clickedTile.y,
-                                                  *value[3:])
+                self.performAction('buildMachineIfAbleToBuildAny',
+                                   value[0],
+                                   value[1] + self.clickedTile.x,  # Conv self.floorPlan rel x, y to abs
+                                   value[2] + self.clickedTile.y,
+                                   *value[3:])
             self.updateMessage('Floor Plan Placed!')
         else:
             self.updateMessage('Invalid Area Selected')
@@ -3221,12 +3728,9 @@ class clsMainApp(QtWidgets.QMainWindow):
         if (x, y) != (self.xCursorTileCenter, self.yCursorTileCenter):
             self.xCursorTileCenter, self.yCursorTileCenter = x, y
 
-            for tile in self.Tiles:
-                if self.xCursorTileCenter <= tile.x <= (self.xCursorTileCenter + (i - 1) * 25) \
-                        and self.yCursorTileCenter <= tile.y <= (self.yCursorTileCenter + (j - 1) * 25):
-                    tile.shape_highlight.setVisible(True)
-                else:
-                    tile.shape_highlight.setVisible(False)
+            self.tileOverlay.setSelection((self.xCursorTileCenter, self.yCursorTileCenter,
+                                           self.xCursorTileCenter + (i - 1) * 25,
+                                           self.yCursorTileCenter + (j - 1) * 25))
 
     def deselectAllButtons(self):
         self.build_button.setStyleCode('White-Square-Menu-Left-Side')
@@ -3238,7 +3742,7 @@ class clsMainApp(QtWidgets.QMainWindow):
         self.cancel_button.setStyleCode('White-Square-Menu-Right-Side')
         self.delAllArrows()
 
-    def finishSetup(self):
+    def finishSetup(self, startTimer=True):  # Headless tools drive coreLoop.run themselves
         self.initializeValues()
         self.generateTileList()
         self.resetUnlockedParameterLists()
@@ -3246,58 +3750,138 @@ class clsMainApp(QtWidgets.QMainWindow):
         self.markAllTilesWalledOrNot()
         self.resetAllMenus()
         self.precomputeRoboticArmKinematics()
-        self.startCoreLoopTimer()
+        self.updateThroughputPrediction()
+        self.startupTimer.mark('Finish Setup')
+        self.setupFinished = True
+        if startTimer:
+            self.startCoreLoopTimer()
+
+    def finishStartupTimer(self):  # Called by the first view paint
+        self.startupTimer.finish('First Frame')
+        self.statusBar.showMessage('Interactive after %.2f s' % self.startupTimer.getElapsed())
+        if self.startupReport:
+            print(self.startupTimer.getReport())
 
     def startCoreLoopTimer(self):
         self.timer = QtCore.QTimer()
         self.timer.timeout.connect(self.coreLoop.run)
         self.timer.start(CYCLE_INTERVAL)
-
-    def saveConfig(self):
-        self.db.clear()
-        self.db['machines'] = {}
+        if AUTOSAVE_INTERVAL:  # Timer events run between core loop runs, autosaves start on a tick boundary
+            self.autosaveTimer = QtCore.QTimer()
+            self.autosaveTimer.timeout.connect(self.autosave)
+            self.autosaveTimer.start(AUTOSAVE_INTERVAL)
+
+    def getSaveData(self):  # Everything a save file holds, also the starting state of input recordings
+        db = {}
+        db['machines'] = {}
         for i, tool in enumerate(self.Machines):
-            self.db['machines'][i] = [tool.type, tool.x, tool.y, tool.orientation,
-                                      tool.selectedBlueprint, tool.starterQuantity,
-                                      tool.filterLeft, tool.filterRight, tool.teleporterID, tool.filterArm]
-        self.db['balance'] = self.balance
-        self.db['unlockedMachines'] = self.unlockedMachines
-        self.db['unlockedBlueprints'] = self.unlockedBlueprints
-        self.db['unlockedResearch'] = self.unlockedResearch
-        self.db['unlockedAssyLines'] = self.unlockedAssyLines
-        self.db['unlockedAchievements'] = self.unlockedAchievements
-        self.db['unlockedTiles'] = self.unlockedTiles
-        self.db['starterMaxSpawnQuantity'] = self.starterMaxSpawnQuantity
-        self.db['maxStarters'] = self.maxStarters
-        self.db['maxTeleporters'] = self.maxTeleporters
-        self.db['opCostModifier'] = self.opCostModifier
-        self.db['opTimeModifierStarterCrafter'] = self.opTimeModifierStarterCrafter
-        self.db['opTimeModifierTier2Machines'] = self.opTimeModifierTier2Machines
-        self.db['floorPlans'] = self.floorPlans
-
-        self.dbfile = open('saveFile', 'wb')  # w = overwrite, a = append
-        pickle.dump(self.db, self.dbfile)
-        self.dbfile.close()
+            db['machines'][i] = tool.getRecord()
+        db['balance'] = self.balance
+        db['unlockedMachines'] = self.unlockedMachines
+        db['unlockedBlueprints'] = self.unlockedBlueprints
+        db['unlockedResearch'] = self.unlockedResearch
+        db['unlockedAssyLines'] = self.unlockedAssyLines
+        db['unlockedAchievements'] = self.unlockedAchievements
+        db['unlockedTiles'] = self.unlockedTiles
+        db['starterMaxSpawnQuantity'] = self.starterMaxSpawnQuantity
+        db['maxStarters'] = self.maxStarters
+        db['maxTeleporters'] = self.maxTeleporters
+        db['opCostModifier'] = self.opCostModifier
+        db['opTimeModifierStarterCrafter'] = self.opTimeModifierStarterCrafter
+        db['opTimeModifierTier2Machines'] = self.opTimeModifierTier2Machines
+        db['floorPlans'] = self.floorPlans
+        return db
+
+    def getSaveSnapshot(self):  # Save data sharing no list with the game, safe to write on another thread
+        db = self.getSaveData()
+        machines = db.pop('machines')  # Records are built fresh by getRecord
+        db = copy.deepcopy(db)
+        db['machines'] = machines
+        return db
+
+    def getCheckpoint(self):
+        # Save data plus the run time state, materials in flight, inventories, queues, splitter turns and arm motion
+        # Restored by loadSaveData, the game continues exactly as if it had never stopped
+        db = self.getSaveSnapshot()
+        materialIndex = {id(material): i for i, material in enumerate(self.Materials)}
+        groups = []  # Material indexes of each material group, in group order
+        groupIDs = set()
+        for material in self.Materials:
+            if material.group is not None and id(material.group) not in groupIDs:
+                groupIDs.add(id(material.group))
+                groups.append([materialIndex[id(member)] for member in material.group])
+        db['simulation'] = {'iteration': self.iteration,
+                            'totalSalesIncome': self.totalSalesIncome,
+                            'totalSalesItems': self.totalSalesItems,
+                            'salesCollector': dict(self.salesCollector),
+                            'machines': [tool.getSimulationState(materialIndex) for tool in self.Machines],
+                            'materials': [material.getSimulationState() for material in self.Materials],
+                            'groups': groups}
+        return db
+
+    def loadSimulationState(self, simulation):  # Machines are rebuilt by loadSaveData in the order they were saved
+        for state in simulation['materials']:
+            material = clsMaterial(self, *state[:5])  # type, x, y, orientation, quantity
+            material.setSimulationState(state)
+            self.Materials.append(material)
+        for members in simulation['groups']:
+            group = [self.Materials[i] for i in members]
+            for material in group:
+                material.group = group
+        for tool, state in zip(self.Machines, simulation['machines']):
+            tool.setSimulationState(state, self.Materials)
+        self.iteration = simulation['iteration']
+        self.totalSalesIncome = simulation['totalSalesIncome']
+        self.totalSalesItems = simulation['totalSalesItems']
+        self.salesCollector.update(simulation['salesCollector'])
+
+    def saveCheckpoint(self, fileName=CHECKPOINT_FILE):
+        writeSaveFile(fileName, self.getCheckpoint())
+        self.updateMessage('Checkpoint Saved!')
+        self.statusBar.showMessage('Checkpoint Saved!')
+
+    def autosave(self):  # Only the snapshot is taken here, the worker serializes and writes it
+        self.autosaver.save(self.getSaveSnapshot)
+
+    def saveConfig(self, fileName=SAVE_FILE):
+        self.db = self.getSaveData()
+        writeSaveFile(fileName, self.db)  # Binary save format, see factorySave
         self.updateMessage('Game Saved!')
         self.statusBar.showMessage('Game Saved!')
 
-    def loadConfig(self):
-        self.reset()
+    def loadConfig(self, fileName=SAVE_FILE):
+        db = readSaveFile(fileName)  # Raises before anything changes if the file is not a valid save
 
-        self.db.clear()
-        self.db['machines'] = {}
-        self.dbfile = open('saveFile', 'rb')
-        self.db = pickle.load(self.dbfile)
-        self.dbfile.close()
+        if self.inputRecorder.recording:  # The log can't follow a jump to another game
+            self.stopInputRecording()
+        self.loadSaveData(db)
+        self.updateMessage('Game Loaded!')
+        self.statusBar.showMessage('Game Loaded!')
+
+        _LOGGER.debug(self.db.keys())
+        _LOGGER.debug(self.db)
+
+    def loadConfigFromMenu(self, fileName=SAVE_FILE):  # A missing or invalid save keeps the current game
+        try:
+            self.loadConfig(fileName)
+        except (OSError, ValueError) as error:
+            self.updateMessage('Load failed: %s' % error)
+            self.statusBar.showMessage('Load failed: %s' % error)
+
+    def loadSaveData(self, db):
+        self.reset()
+        self.db = db
 
         for key, value in self.db['machines'].items():
+            value[4:] = [self.recipeGraph.getCanonicalName(v) if i in [0, 2, 3, 5] else v  # Material name fields
+                         for i, v in enumerate(value[4:])]
             self.Machines.append(clsMachine(self, *value))
         self.updateBalance(self.db['balance'])
         self.unlockedMachines = self.db['unlockedMachines']
-        self.unlockedBlueprints = self.db['unlockedBlueprints']
+        self.unlockedBlueprints = [self.recipeGraph.getCanonicalName(k) for k in self.db['unlockedBlueprints']]
         self.unlockedResearch = self.db['unlockedResearch']
         self.unlockedAssyLines = self.db['unlockedAssyLines']
-        self.unlockedAchievements = self.db['unlockedAchievements']
+        self.unlockedAchievements = [self.recipeGraph.getCanonicalName(k) for k in self.db['unlockedAchievements']]
         self.unlockedTiles = self.db['unlockedTiles']
         self.starterMaxSpawnQuantity = self.db['starterMaxSpawnQuantity']
         self.maxStarters = self.db['maxStarters']
@@ -3306,17 +3890,15 @@ class clsMainApp(QtWidgets.QMainWindow):
         self.opTimeModifierStarterCrafter = self.db['opTimeModifierStarterCrafter']
         self.opTimeModifierTier2Machines = self.db['opTimeModifierTier2Machines']
         self.floorPlans = self.db['floorPlans']
+        if 'simulation' in self.db:  # Checkpoint, see getCheckpoint
+            self.loadSimulationState(self.db['simulation'])
 
         self.markTilesLockedOrUnlocked()  # Load changes due to self.unlockedTiles
         self.markAllTilesWalledOrNot()  # Load changes due to self.unlockedAssyLines
         self.resetAllMenus()  # Load changes due to changed parameters
+        self.updateThroughputPrediction()
         self.metric_label.setText(
             '%i / %i Achievements Unlocked' % (len(self.unlockedAchievements), self.getAmountOfAchievements()))
-        self.updateMessage('Game Loaded!')
-        self.statusBar.showMessage('Game Loaded!')
-
-        _LOGGER.debug(self.db.keys())
-        _LOGGER.debug(self.db)
 
         # Debugging - Remove all selected & considered blueprints from Starters & Crafters
         # for machine in self.Machines:
@@ -3328,6 +3910,43 @@ class clsMainApp(QtWidgets.QMainWindow):
         # self.unlockedBlueprints.append('Speaker')
         # self.maxStarters = 35
 
+    def loadOptimizerResult(self, fileName='optimizerResult.json'):
+        # Optimizer results store every machine of the optimized layout, see factoryOptimizer.py
+        try:
+            with open(fileName) as resultFile:
+                result = json.load(resultFile)
+        except OSError:
+            self.updateMessage('No optimizer result found')
+            return
+        self.performAction('applyOptimizerResult', result)  # The result is logged, replays don't need the file
+
+    def applyOptimizerResult(self, result):
+        if result['floorPlan'] is not None:  # Floor plan settings are stored and used when the plan is placed
+            plan = self.floorPlans[result['floorPlan']]['machines']
+            for key, entry in zip(sorted(plan), result['machines']):
+                record = [entry[field] for field in MACHINE_RECORD_FIELDS]
+                record[1], record[2] = plan[key][1], plan[key][2]  # Keep relative x, y
+                plan[key] = record
+            self.updateMessage('Optimizer result applied to Floor Plan %i' % (result['floorPlan'] + 1))
+            return
+
+        changed = 0
+        for entry in result['machines']:  # Matched by tile and type, machines moved since the run are skipped
+            tool = self.getMachine(entry['x'], entry['y'])
+            if tool is None or tool.type != entry['type']:
+                continue
+            if tool.type in [STARTER, CRAFTER] and entry['selectedBlueprint'] != tool.selectedBlueprint \
+                    and entry['selectedBlueprint'] in self.unlockedBlueprints:
+                tool.setSelectedBlueprint(entry['selectedBlueprint'])
+                changed += 1
+            for field in ['filterLeft', 'filterRight', 'filterArm', 'splitSetting']:
+                if entry[field] != getattr(tool, field):
+                    setattr(tool, field, entry[field])
+                    changed += 1
+        self.updateThroughputPrediction()
+        self.updateMessage('Optimizer result applied, %i settings changed (+$%s / Second expected)'
+                           % (changed, self.shortNum(result['gain'])))
+
     def reset(self):
         self.deleteAllMachinesAndMaterials()
         self.salesCollector.clear()  # Delete everything in achievements sales collector
@@ -3337,6 +3956,7 @@ class clsMainApp(QtWidgets.QMainWindow):
         self.removeAchievementNotification()  # Remove any open notification
         self.initializeValues()  # Set variables to initial values
         self.resetAllMenus()
+        self.updateThroughputPrediction()
         self.closeMode()
         self.queueReset = False
         self.metric_label.setText(
@@ -3378,6 +3998,10 @@ class clsMainApp(QtWidgets.QMainWindow):
         while len(self.Materials) > 0:  # Deleting items in list modifies index
             self.Materials[0].delMaterial()
 
+        self.traffic.clear()  # Traffic of the old layout
+        if self.heatmapLayer.isVisible():
+            self.heatmapLayer.markAllDirty()
+
     def initializeValues(self):
         self.balance = 15000  # Proper initial balance for new game is 15,000
         # self.balance = 500000000000  # Balance for debugging
@@ -3439,10 +4063,10 @@ class clsMainApp(QtWidgets.QMainWindow):
             [self.Tiles[i].markAsWalled() for i in range(544, 800)]
         [self.Tiles[i].markAsWalled() for i in list(range(256, 272)) + list(range(528, 544))]  # Border walls
 
-    def getNumberMachinesInClickedAssyLine(self, machineType):
+    def getNumberMachinesInAssyLine(self, machineType, assyLine):
         machineCount = 0
         for tool in self.Machines:
-            if tool.type == machineType and tool.assyLine == self.clickedTile.assyLine:
+            if tool.type == machineType and tool.assyLine == assyLine:
                 machineCount += 1
         return machineCount
 
@@ -3584,6 +4208,8 @@ class clsMainApp(QtWidgets.QMainWindow):
                         '$' + str(self.shortNum(self.materialLib.lib[key]['value'] * value / INCOME_ANALYSIS_FREQ)))
                 totalIncome += self.materialLib.lib[key]['value'] * value / INCOME_ANALYSIS_FREQ
                 totalSales += value / INCOME_ANALYSIS_FREQ
+        self.measuredMoneyRate = totalIncome  # Kept apart from moneyRate, which feeds the Profit and Scale achievements
+        self.measuredItemRate = totalSales
         self.moneyRate_label.setText('Profit: $%s / Second' % self.shortNum(totalIncome))
         self.itemRate_label.setText('Sales: %s Items / Second' % str(round(totalSales, 2)))
 
@@ -3603,13 +4229,16 @@ class clsMainApp(QtWidgets.QMainWindow):
                 if item > highest:
                     highest = item
 
-            averageFPS = int(1000 / statistics.mean(self.frameRateResultSet))
+            meanFrameTime = self.phaseHistograms.histograms[FRAME].getMean()  # Running total, no pass over the log
+            averageFPS = int(1000 / meanFrameTime) if meanFrameTime else 0
             self.frameRateMenuFrame.wids['Frames'].setText(str(frames))
             self.frameRateMenuFrame.wids['Setpoint'].setText(str(setpoint))
             self.frameRateMenuFrame.wids['High Limit'].setText(str(target))
             self.frameRateMenuFrame.wids['High'].setText(str(high) + '%')
             self.frameRateMenuFrame.wids['Highest'].setText(str(highest))
             self.frameRateMenuFrame.wids['AverageFPS'].setText(str(averageFPS))
+            self.frameRateMenuFrame.updatePercentiles(self.phaseHistograms.getSummary())
+            self.frameRateMenuFrame.updateAutosave(self.autosaver)
             self.frameRateMenuFrame.plot()
 
     def unlockMachine(self, machine):
@@ -3652,20 +4281,134 @@ class clsMainApp(QtWidgets.QMainWindow):
                 self.starterMaxSpawnQuantity = self.starterMaxSpawnQuantity + self.researchLib.lib[option]['amount']
             elif self.researchLib.lib[option]['type'] == 'floorPlanFeature':
                 self.floorPlanMenuFrame.reset()
+            self.updateThroughputPrediction()
         else:
             self.updateMessage('Not enough money')
 
+    # -------- Player Actions -------- #
+    # Every player action that changes the game goes through performAction so it can be recorded and replayed.
+    # Actions are main app methods taking plain values, machines and tiles are found by their x, y tile center.
+
+    def performAction(self, action, *args):
+        self.inputRecorder.record(self.iteration, action, args)
+        return getattr(self, action)(*args)
+
+    def moveMachineAt(self, x, y, xNew, yNew):
+        self.getMachine(x, y).moveMachine(xNew, yNew)
+        self.updateThroughputPrediction()
+
+    def rotateMachineAt(self, x, y):
+        self.getMachine(x, y).rotateMachine()
+        self.updateThroughputPrediction()
+
+    def sellMachineAt(self, x, y):
+        self.getMachine(x, y).sellMachine()
+        self.updateThroughputPrediction()
+
+    def buyTileAt(self, x, y):
+        self.getTile(x, y).buyTile()
+
+    def clearInventoryAt(self, x, y):
+        self.getMachine(x, y).clearInventory()
+
+    def setBlueprintAt(self, x, y, material):
+        self.getMachine(x, y).setSelectedBlueprint(material)
+        self.updateThroughputPrediction()
+
+    def setFilterAt(self, x, y, side, material):
+        tool = self.getMachine(x, y)
+        if side == LEFT:
+            tool.filterLeft = material
+        elif side == RIGHT:
+            tool.filterRight = material
+        elif side == ARM:
+            tool.filterArm = material
+        self.updateThroughputPrediction()
+
+    def setSplitSettingAt(self, x, y, direction, amount):
+        tool = self.getMachine(x, y)
+        if tool.splitSetting[direction] + amount >= 1:  # Prevent setting from going below 1
+            tool.splitSetting[direction] += amount
+            self.updateThroughputPrediction()
+        else:
+            self.updateMessage('Setting must be greater than zero')
+
+    def setTeleporterIDAt(self, x, y, adjustment):
+        tool = self.getMachine(x, y)
+        if tool.teleporterID is None:
+            tool.teleporterID = 1
+        elif tool.teleporterID + adjustment >= 1:
+            tool.teleporterID += adjustment
+        else:
+            self.updateMessage('Setting must be greater than zero')
+        self.activateValidTeleporters()
+        self.updateThroughputPrediction()
+
+    def setStarterQuantityAt(self, x, y, quantity):
+        self.getMachine(x, y).starterQuantity = quantity
+        self.updateThroughputPrediction()
+
+    # -------- Input Recording & Replay -------- #
+
+    def startInputRecording(self):
+        # Restart from a snapshot of the current game so the recording and every replay start from the same state
+        saveData = copy.deepcopy(self.getSaveData())  # Reset clears the live lists the save data refers to
+        self.inputReplayer = None
+        self.loadSaveData(saveData)
+        self.inputRecorder.start(self.iteration, self.getSaveData())
+        self.updateMessage('Input recording started')
+
+    def stopInputRecording(self, fileName='inputLog'):
+        if not self.inputRecorder.recording:
+            self.updateMessage('Not recording')
+            return
+        actionCount = self.inputRecorder.stop(self.iteration, fileName)
+        self.updateMessage('Input recording saved, %i actions' % actionCount)
+
+    def startInputReplay(self, fileName='inputLog'):
+        try:
+            self.inputReplayer = clsInputReplayer(self, fileName)
+        except OSError:
+            self.updateMessage('No input recording found')
+            return
+        self.inputReplayer.start()
+        if self.timer is not None and self.timer.isActive():
+            self.timer.stop()  # Start paused, step with F10 or resume with F9
+        self.updateMessage('Replay ready at tick %i, paused' % self.iteration)
+
+    def togglePause(self):
+        if self.timer is None:
+            return
+        if self.timer.isActive():
+            self.timer.stop()
+            self.statusBar.showMessage('Paused at tick %i' % self.iteration)
+        else:
+            self.timer.start(CYCLE_INTERVAL)
+            self.statusBar.showMessage('Running')
+
+    def stepTicks(self, ticks=REPLAY_STEP_TICKS):
+        if self.timer is not None and self.timer.isActive():
+            self.updateMessage('Pause (F9) before stepping')
+            return
+        for i in range(ticks):
+            self.coreLoop.run()
+        self.statusBar.showMessage('Paused at tick %i' % self.iteration)
+
+    def updateThroughputPrediction(self):  # Run after every layout or research change
+        self.throughputPrediction = self.throughputModel.analyze(
+            self.Machines, self.opCostModifier, self.opTimeModifierStarterCrafter, self.opTimeModifierTier2Machines)
+        self.incomeAnalysisMenuFrame.updatePrediction(self.throughputPrediction)
+        _LOGGER.debug('Predicted profit %.1f / s, simulated %.1f / s'
+                      % (self.throughputPrediction['incomeRate'], self.measuredMoneyRate))
+
     def drawAllArrows(self):
-        for tool in self.Machines:
-            tool.drawArrow()
+        self.tileOverlay.setArrowsVisible(True)
 
     def delAllArrows(self):
-        for tool in self.Machines:
-            tool.delArrow()
+        self.tileOverlay.setArrowsVisible(False)
 
     def delAllHighlights(self):
-        for tile in self.Tiles:
-            tile.delShape(HIGHLIGHT)
+        self.tileOverlay.clearHighlights()
 
     def getTile(self, x, y):
         for tile in self.Tiles:
@@ -3681,6 +4424,70 @@ class clsMainApp(QtWidgets.QMainWindow):
 
     # -------- Generic Methods -------- #
 
+    def paintGridLines(self, painter):  # Live, a scaled cache would drop lines when zoomed out
+        painter.setPen(QtGui.QPen(QtCore.Qt.black, 1))
+        for i in range(0, self.sceneHeight + 1, GRID_SIZE):
+            painter.drawLine(QtCore.QLineF(0, i, self.sceneWidth, i))
+        for i in range(0, self.sceneWidth + 1, GRID_SIZE):
+            painter.drawLine(QtCore.QLineF(i, 0, i, self.sceneHeight))
+
+    def paintFloorTiles(self, painter, tiles):  # Machine bottoms, painter is clipped to the tiles
+        for tool in self.Machines:
+            if tool.drawnTile in tiles:
+                tool.paintImage(painter, self.machineLib.lib[tool.type]['imageBottom'])
+
+    def paintMachineTopTiles(self, painter, tiles):
+        for tool in self.Machines:
+            if tool.drawnTile in tiles:
+                tool.paintImage(painter, self.machineLib.lib[tool.type]['imageTop'])
+
+    def paintHeatmapTiles(self, painter, tiles):  # Whole heatmap, repainted after each traffic sample
+        counts = self.traffic.getWindowCounts()
+        seconds = self.traffic.getWindowSamples()  # One sample per second
+        peak = max((passes for i, passes, destroyed in counts), default=0)
+        font = QtGui.QFont()
+        font.setPointSize(6)
+        painter.setFont(font)
+        for i, passes, destroyed in counts:
+            rect = QtCore.QRectF(int(i / self.traffic.rows) * GRID_SIZE,
+                                 self.sceneHeight - (i % self.traffic.rows + 1) * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+            if passes:
+                ratio = passes / peak
+                # Yellow to red and more opaque with traffic relative to the busiest tile
+                painter.fillRect(rect, QtGui.QColor.fromHsvF((1 - ratio) / 6, 1, 1, 0.25 + 0.45 * ratio))
+                painter.setPen(QtCore.Qt.black)
+                painter.drawText(rect, QtCore.Qt.AlignCenter, '%.1f' % (passes / seconds))
+            if destroyed:
+                painter.setPen(QtGui.QPen(QtCore.Qt.red, 2))
+                painter.drawEllipse(rect.adjusted(2, 2, -2, -2))
+
+    def sampleTraffic(self):
+        self.traffic.sample()
+        if self.heatmapLayer.isVisible():
+            self.heatmapLayer.markAllDirty()
+
+    def toggleHeatmap(self):
+        if self.heatmapLayer.isVisible():
+            self.heatmapLayer.hide()
+        else:
+            self.heatmapLayer.markAllDirty()
+            self.heatmapLayer.show()
+            self.updateMessage('Materials / second over the last %i s, red rings where materials were destroyed'
+                               % HEATMAP_WINDOW)
+
+    def updateMaterialLayers(self):
+        for layer in self.materialLayers:
+            layer.update()
+
+    def countTileDensity(self):  # Material quantity on each tile, read by clsMaterialLayer.paintDensity
+        density = self.tileDensity
+        rows = self.densityRows
+        density[:] = array('L', [0]) * len(density)
+        for piece in self.Materials:
+            i = int(piece.x / GRID_SIZE) * rows + int(piece.y / GRID_SIZE)
+            if 0 <= i < len(density):
+                density[i] += piece.quantity
+
     def convertToSceneCoords(self, xApp, yApp, imgW, imgH):
         xScene = xApp - int(imgW / 2)  # Account for top left image origin, not center
         yScene = yApp + int(imgH / 2) - 1  # Lower by 1px for better visual
@@ -3721,7 +4528,7 @@ class clsMainApp(QtWidgets.QMainWindow):
         # Create secondary sets of positions for tool orientations, U, L, R by taking the positive or negative x and y
         # components from the D orientation & set as appropriate and adding 0, 90, 180, or 270 deg to the link angles.
         # The result is a set of relative positions for AB & BC and absolute angles for thetaAB & thetaBC for each tool
-        # orientation and each frame number.
+        # orientation and each frame number, packed into the flat table self.armKinematics.
 
         # Definitions:
         # xRelB, yRelB = Relative position of B
@@ -3736,88 +4543,88 @@ class clsMainApp(QtWidgets.QMainWindow):
         # Two Linkage Arm = A [=== AB ===] B [=== BC ===] C
 
         # Variables
-        self.thetaAB = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Angle of link AB
-        self.thetaBC = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Angle of link BC
-        self.xRelB = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative x position of point B (Relative to tool center)
-        self.yRelB = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative y position of point B
-        self.xRelC = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative x position of point C
-        self.yRelC = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative y position of point C
+        thetaAB = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Angle of link AB
+        thetaBC = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Angle of link BC
+        xRelB = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative x position of point B (Relative to tool center)
+        yRelB = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative y position of point B
+        xRelC = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative x position of point C
+        yRelC = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative y position of point C
 
         # Create table of link end points. Assumes tool faces downward by convention
         # Define motion profile by formula for linkage angles at each frame then solve for remaining geometry
         for i in range(1, 13):
-            self.thetaAB['D'][i] = 90 + (5 * i)  # Input: Start at 90 deg and inc 60 deg over 12 steps
-            self.thetaBC['D'][i] = 90 - (5 * i)  # Input: Start at 90 deg and dec 60 deg over 12 steps
-            self.xRelB['D'][i] = self.xArc(12, self.thetaAB['D'][i])
-            self.yRelB['D'][i] = self.yArc(12, self.thetaAB['D'][i])
-            self.xRelC['D'][i] = self.xRelB['D'][i] + self.xArc(12, self.thetaBC['D'][i])
-            self.yRelC['D'][i] = self.yRelB['D'][i] + self.yArc(12, self.thetaBC['D'][i])
+            thetaAB['D'][i] = 90 + (5 * i)  # Input: Start at 90 deg and inc 60 deg over 12 steps
+            thetaBC['D'][i] = 90 - (5 * i)  # Input: Start at 90 deg and dec 60 deg over 12 steps
+            xRelB['D'][i] = self.xArc(12, thetaAB['D'][i])
+            yRelB['D'][i] = self.yArc(12, thetaAB['D'][i])
+            xRelC['D'][i] = xRelB['D'][i] + self.xArc(12, thetaBC['D'][i])
+            yRelC['D'][i] = yRelB['D'][i] + self.yArc(12, thetaBC['D'][i])
 
         for i in range(13, 37):
-            self.thetaAB['D'][i] = 150 + (180 / 24) * (i - 12)  # Input: Start at 150 deg and dec 180 deg over 24 steps
-            self.thetaBC['D'][i] = 30 + (180 / 24) * (i - 12)  # Input: Start at 30 deg and inc 180 deg over 24 steps
-            self.xRelB['D'][i] = self.xArc(12, self.thetaAB['D'][i])
-            self.yRelB['D'][i] = self.yArc(12, self.thetaAB['D'][i])
-            self.xRelC['D'][i] = self.xRelB['D'][i] + self.xArc(12, self.thetaBC['D'][i])
-            self.yRelC['D'][i] = self.yRelB['D'][i] + self.yArc(12, self.thetaBC['D'][i])
+            thetaAB['D'][i] = 150 + (180 / 24) * (i - 12)  # Input: Start at 150 deg and dec 180 deg over 24 steps
+            thetaBC['D'][i] = 30 + (180 / 24) * (i - 12)  # Input: Start at 30 deg and inc 180 deg over 24 steps
+            xRelB['D'][i] = self.xArc(12, thetaAB['D'][i])
+            yRelB['D'][i] = self.yArc(12, thetaAB['D'][i])
+            xRelC['D'][i] = xRelB['D'][i] + self.xArc(12, thetaBC['D'][i])
+            yRelC['D'][i] = yRelB['D'][i] + self.yArc(12, thetaBC['D'][i])
 
         for i in range(37, 49):
-            self.thetaAB['D'][i] = -30 - (60 / 12) * (i - 36)  # Input: Start at -30 deg and dec 60 deg over 12 steps
-            self.thetaBC['D'][i] = -150 + (60 / 12) * (i - 36)  # Input: Start at -150 deg and inc 60 deg over 12 steps
-            self.xRelB['D'][i] = self.xArc(12, self.thetaAB['D'][i])
-            self.yRelB['D'][i] = self.yArc(12, self.thetaAB['D'][i])
-            self.xRelC['D'][i] = self.xRelB['D'][i] + self.xArc(12, self.thetaBC['D'][i])
-            self.yRelC['D'][i] = self.yRelB['D'][i] + self.yArc(12, self.thetaBC['D'][i])
+            thetaAB['D'][i] = -30 - (60 / 12) * (i - 36)  # Input: Start at -30 deg and dec 60 deg over 12 steps
+            thetaBC['D'][i] = -150 + (60 / 12) * (i - 36)  # Input: Start at -150 deg and inc 60 deg over 12 steps
+            xRelB['D'][i] = self.xArc(12, thetaAB['D'][i])
+            yRelB['D'][i] = self.yArc(12, thetaAB['D'][i])
+            xRelC['D'][i] = xRelB['D'][i] + self.xArc(12, thetaBC['D'][i])
+            yRelC['D'][i] = yRelB['D'][i] + self.yArc(12, thetaBC['D'][i])
 
         # Create tables for remaining tool orientations by multiplying by 1, -1, and/or swapping x and y components
         for i in range(1, 49):
-            self.xRelB['U'][i], self.yRelB['U'][i], self.thetaAB['U'][i] = \
-                (-self.xRelB['D'][i], -self.yRelB['D'][i], int(self.thetaAB['D'][i] + 180) % 360)
-            self.xRelB['L'][i], self.yRelB['L'][i], self.thetaAB['L'][i] = \
-                (+self.yRelB['D'][i], -self.xRelB['D'][i], int(self.thetaAB['D'][i] + 270) % 360)
-            self.xRelB['D'][i], self.yRelB['D'][i], self.thetaAB['D'][i] = \
-                (+self.xRelB['D'][i], +self.yRelB['D'][i], int(self.thetaAB['D'][i] + 0) % 360)
-            self.xRelB['R'][i], self.yRelB['R'][i], self.thetaAB['R'][i] = \
-                (-self.yRelB['D'][i], +self.xRelB['D'][i], int(self.thetaAB['D'][i] + 90) % 360)
-
-            self.xRelC['U'][i], self.yRelC['U'][i], self.thetaBC['U'][i] = \
-                (-self.xRelC['D'][i], -self.yRelC['D'][i], int(self.thetaBC['D'][i] + 180) % 360)
-            self.xRelC['L'][i], self.yRelC['L'][i], self.thetaBC['L'][i] = \
-                (+self.yRelC['D'][i], -self.xRelC['D'][i], int(self.thetaBC['D'][i] + 270) % 360)
-            self.xRelC['D'][i], self.yRelC['D'][i], self.thetaBC['D'][i] = \
-                (+self.xRelC['D'][i], +self.yRelC['D'][i], int(self.thetaBC['D'][i] + 0) % 360)
-            self.xRelC['R'][i], self.yRelC['R'][i], self.thetaBC['R'][i] = \
-                (-self.yRelC['D'][i], +self.xRelC['D'][i], int(self.thetaBC['D'][i] + 90) % 360)
+            xRelB['U'][i], yRelB['U'][i], thetaAB['U'][i] = \
+                (-xRelB['D'][i], -yRelB['D'][i], int(thetaAB['D'][i] + 180) % 360)
+            xRelB['L'][i], yRelB['L'][i], thetaAB['L'][i] = \
+                (+yRelB['D'][i], -xRelB['D'][i], int(thetaAB['D'][i] + 270) % 360)
+            xRelB['D'][i], yRelB['D'][i], thetaAB['D'][i] = \
+                (+xRelB['D'][i], +yRelB['D'][i], int(thetaAB['D'][i] + 0) % 360)
+            xRelB['R'][i], yRelB['R'][i], thetaAB['R'][i] = \
+                (-yRelB['D'][i], +xRelB['D'][i], int(thetaAB['D'][i] + 90) % 360)
+
+            xRelC['U'][i], yRelC['U'][i], thetaBC['U'][i] = \
+                (-xRelC['D'][i], -yRelC['D'][i], int(thetaBC['D'][i] + 180) % 360)
+            xRelC['L'][i], yRelC['L'][i], thetaBC['L'][i] = \
+                (+yRelC['D'][i], -xRelC['D'][i], int(thetaBC['D'][i] + 270) % 360)
+            xRelC['D'][i], yRelC['D'][i], thetaBC['D'][i] = \
+                (+xRelC['D'][i], +yRelC['D'][i], int(thetaBC['D'][i] + 0) % 360)
+            xRelC['R'][i], yRelC['R'][i], thetaBC['R'][i] = \
+                (-yRelC['D'][i], +xRelC['D'][i], int(thetaBC['D'][i] + 90) % 360)
 
         # Variables for link centers and angles
-        self.xRelLinkCenterAB = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative x position of center of link AB
-        self.yRelLinkCenterAB = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative y position of center of link AB
-        self.xRelLinkCenterBC = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative x position of center of link BC
-        self.yRelLinkCenterBC = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative y position of center of link BC
+        xRelLinkCenterAB = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative x position of center of link AB
+        yRelLinkCenterAB = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative y position of center of link AB
+        xRelLinkCenterBC = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative x position of center of link BC
+        yRelLinkCenterBC = {'U': {}, 'L': {}, 'D': {}, 'R': {}}  # Relative y position of center of link BC
 
         # Create table of relative link center positions based on relative end point positions
         for tDir in ['U', 'L', 'D', 'R']:
             for i in range(1, 49):
-                self.xRelLinkCenterAB[tDir][i] = int(self.xRelB[tDir][i] / 2)
-                self.yRelLinkCenterAB[tDir][i] = int(self.yRelB[tDir][i] / 2)
-                self.xRelLinkCenterBC[tDir][i] = int(self.xRelB[tDir][i]
-                                                     + (self.xRelC[tDir][i] - self.xRelB[tDir][i]) / 2)
-                self.yRelLinkCenterBC[tDir][i] = int(self.yRelB[tDir][i]
-                                                     + (self.yRelC[tDir][i] - self.yRelB[tDir][i]) / 2)
-
-        # Create set of Pixmaps at all angles.
-        # PyQt defaults to CW so negative makes it CCW to match kinematics convention
-        self.angledPixmapLink1 = {}
-        for i in range(0, 361):
-            self.angledPixmapLink1[i] = QtGui.QPixmap('images/Robotic Arm Link 1.gif')
-            transform = QtGui.QTransform().rotate(-i)
-            self.angledPixmapLink1[i] = self.angledPixmapLink1[i].transformed(transform, QtCore.Qt.SmoothTransformation)
-
-        self.angledPixmapLink2 = {}
-        for i in range(0, 361):
-            self.angledPixmapLink2[i] = QtGui.QPixmap('images/Robotic Arm Link 2.gif')
-            transform = QtGui.QTransform().rotate(-i)
-            self.angledPixmapLink2[i] = self.angledPixmapLink2[i].transformed(transform, QtCore.Qt.SmoothTransformation)
+                xRelLinkCenterAB[tDir][i] = int(xRelB[tDir][i] / 2)
+                yRelLinkCenterAB[tDir][i] = int(yRelB[tDir][i] / 2)
+                xRelLinkCenterBC[tDir][i] = int(xRelB[tDir][i] + (xRelC[tDir][i] - xRelB[tDir][i]) / 2)
+                yRelLinkCenterBC[tDir][i] = int(yRelB[tDir][i] + (yRelC[tDir][i] - yRelB[tDir][i]) / 2)
+
+        # Pack into one flat table, a row of ARM_KINEMATICS_FIELDS per orientation code and frame number, so an arm
+        # reads its whole motion frame from consecutive entries (see clsMachine.setUpdatedArmPositions)
+        self.armKinematics = array('i', bytes(4 * len(ORIENTATIONS) * (ARM_MOTION_FRAMES + 1) * ARM_KINEMATICS_STRIDE))
+        for tDir in ORIENTATIONS:
+            for i in range(1, 49):
+                row = (ORIENTATION_CODE[tDir] * (ARM_MOTION_FRAMES + 1) + i) * ARM_KINEMATICS_STRIDE
+                self.armKinematics[row:row + ARM_KINEMATICS_STRIDE] = array('i', [
+                    xRelLinkCenterAB[tDir][i], yRelLinkCenterAB[tDir][i],
+                    xRelLinkCenterBC[tDir][i], yRelLinkCenterBC[tDir][i],
+                    xRelC[tDir][i], yRelC[tDir][i],
+                    thetaAB[tDir][i], thetaBC[tDir][i]])
+
+        # Link images are rotated by their scene items (see clsMachine.setLinkPositions), not pre-rendered per angle
+        self.pixmapLink1 = self.machineLib.lib[ROBOTIC_ARM]['imageLink1']
+        self.pixmapLink2 = self.machineLib.lib[ROBOTIC_ARM]['imageLink2']
 
     @staticmethod
     def xArc(radius, angleDeg):
@@ -3875,27 +4682,34 @@ class clsMainApp(QtWidgets.QMainWindow):
                 return i
 
     def startTimeLog(self):
-        self.timeLogEnabled = True
+        self.tracer.start()
+        self.profilerOverlay.ownsTracer = False  # Keep tracing when the overlay is hidden
 
     def stopTimeLog(self):
-        self.timeLogEnabled = False
+        self.tracer.stop()
+        eventCount = self.tracer.exportChromeTrace(TRACE_FILE)
+        self.updateMessage('Saved %i trace events to %s' % (eventCount, TRACE_FILE))
         self.printTimeLog()
 
     def logTimestamp(self, stampName, runNumber):
-        if self.timeLogEnabled:
-            self.timeLog.append((stampName, runNumber, time.time()))
+        self.phaseHistograms.mark(stampName)
+        if self.tracer.enabled:
+            self.tracer.mark(stampName, runNumber)
 
     def printTimeLog(self):
+        from termcolor import colored
+        timeLog = self.tracer.getTimeLog()
+
         # Error Handling
-        if len(self.timeLog) == 0:
+        if len(timeLog) == 0:
             print('No timestamps logged')
             return
 
         # Get Timestamp Span
-        stampName, runNumber, timestamp = self.timeLog[0]
+        stampName, runNumber, timestamp = timeLog[0]
         startTime = timestamp
         startRun = runNumber
-        stampName, runNumber, timestamp = self.timeLog[-1]
+        stampName, runNumber, timestamp = timeLog[-1]
         endTime = timestamp
         endRun = runNumber
         runSpan = endRun - startRun
@@ -3904,7 +4718,7 @@ class clsMainApp(QtWidgets.QMainWindow):
         # Build timeLogDicts - Dict (For each run) of dicts containing elapsed times for each timestamp name
         timeLogDicts = {}
         lastTimestamp = None
-        for entry in self.timeLog:
+        for entry in timeLog:
             stampName, runNumber, timestamp = entry
             if lastTimestamp is None:
                 elapsedTime = 0  # ms
@@ -3942,7 +4756,7 @@ class clsMainApp(QtWidgets.QMainWindow):
         # Print Timestamps Table Header
         print('\nStart Timestamps Log:')
         print('Iterations: %i, Timestamps: %i, Spanning: %.1f seconds, UoM: ms'
-              % (runSpan, len(self.timeLog), timeSpan))
+              % (runSpan, len(timeLog), timeSpan))
         print(colored('{:>18}'.format('Iteration'), 'blue'), end='')
         for key in timeLogDicts[startRun].keys():
             print(colored('{:>28}'.format(key), 'blue'), end='')
@@ -3983,8 +4797,6 @@ class clsMainApp(QtWidgets.QMainWindow):
         # print(colored(['{:>28.3f}'.format(i) for i in timeLogDict.values()], 'red'))
         # print(colored(['{:>28.3f}'.format(i) for i in timeLogDict.values()], 'red', attrs=['underline', 'blink']))
 
-        # Clear Recordings
-        self.timeLog.clear()
         print('End Timestamps Log\n')
 
 
@@ -3996,16 +4808,18 @@ class clsCoreLoop:
         # Capture prior idle time associate it with prior run
         self.main.logTimestamp('Post Run Idle', self.main.iteration)
 
+        # Replayed player actions happen between ticks, the same as live ones
+        if self.main.inputReplayer is not None:
+            self.main.inputReplayer.applyDueActions()
+
         # Increment iteration (Increment at start of run to associate prior idle time at end of run with prior run)
         self.main.iteration += 1
 
         # Frame rate analysis logging
         iterationToIterationTime = int((datetime.datetime.now() - self.main.iterationStartTime).total_seconds() * 1000)
 
-        # Add frame time to frameRateResultSet list and remove older value
+        # Add frame time to frameRateResultSet, the oldest value drops out of the ring buffer
         self.main.frameRateResultSet.append(iterationToIterationTime)
-        if len(self.main.frameRateResultSet) > FRAME_RATE_ANALYSIS_LOG_SIZE:
-            del self.main.frameRateResultSet[0]
 
         # Iteration time
         self.main.iterationStartTime = datetime.datetime.now()
@@ -4052,12 +4866,11 @@ class clsCoreLoop:
                 # Queue any blueprints that can be made
                 for blueprint in tool.consideredBlueprints:
                     haveList = tool.contains
-                    needList = self.main.materialLib.lib[blueprint]['components']
+                    needList = self.main.recipeGraph.componentItems[blueprint]  # Compiled ((component, qty), ...)
 
                     # Check if tool contains blueprint components or no blueprint components required then queue item
-                    if self.main.materialLib.lib[blueprint]['components'] == {} or \
-                            all(haveList.get(k, 0) >= v for k, v in needList.items()):
-                        finalCost = self.main.materialLib.lib[blueprint]['cost'] * self.main.opCostModifier
+                    if all(haveList.get(k, 0) >= v for k, v in needList):
+                        finalCost = self.main.recipeGraph.cost[blueprint] * self.main.opCostModifier
                         if self.main.balance >= finalCost and tool.queueDelay == 0:
 
                             # Queue creation of materials
@@ -4066,11 +4879,10 @@ class clsCoreLoop:
                                 tool.queueDelay = tool.op_time - self.main.opTimeModifierStarterCrafter
                             else:
                                 tool.queueDelay = tool.op_time - self.main.opTimeModifierTier2Machines
-                            effectiveCost = self.main.materialLib.lib[blueprint]['cost'] * self.main.opCostModifier
-                            self.main.updateBalance(self.main.balance - effectiveCost)
+                            self.main.updateBalance(self.main.balance - finalCost)
 
                             # Remove blueprint components from container
-                            for k, v in self.main.materialLib.lib[blueprint]['components'].items():
+                            for k, v in needList:
                                 tool.contains[k] -= v
                             if self.main.selectedMenu == self.main.toolPropertiesFrame \
                                     and tool == self.main.selectedTool:  # Update tool inv menu if displayed
@@ -4093,9 +4905,11 @@ class clsCoreLoop:
         self.main.logTimestamp('Post Move Robotic Arms', self.main.iteration)
 
         # Set action for each piece of material
+        traffic = self.main.traffic  # Tile center passes and destroyed materials for the heatmap
         for piece in self.main.oMaterials:
 
             if piece.checkIfAtTileCenter():  # Check if on any tool centers
+                traffic.countPass(piece.x, piece.y)
 
                 for tool in self.main.oMachines:
                     if (piece.x, piece.y) == (tool.x, tool.y):  # Material matches a tool center
@@ -4145,6 +4959,8 @@ class clsCoreLoop:
 
                         elif tool.type in [SELLER]:
                             self.main.updateBalance(self.main.balance + piece.value)
+                            self.main.totalSalesIncome += piece.value * piece.quantity  # Same as salesCollector
+                            self.main.totalSalesItems += piece.quantity
                             self.main.updateEvent('Sold %s for $%s!' % (piece.type, self.main.shortNum(piece.value)))
                             for i in range(piece.quantity):  # Account for stacks of material entering machine
                                 # Default to 0 then add 1
@@ -4164,8 +4980,14 @@ class clsCoreLoop:
                         else:
                             piece.onFloor = False
                 if piece.onFloor:
+                    traffic.countDestroyed(piece.x, piece.y)
                     piece.delMaterial()  # Material is not on machine and is removed
 
+        if self.main.lowDetail:  # Zoomed out materials are painted as tile density
+            self.main.countTileDensity()
+        self.main.updateMaterialLayers()  # Batched materials repaint once per tick
+        if self.main.iteration % HEATMAP_SAMPLE_TICKS == 0:
+            self.main.sampleTraffic()
         self.main.logTimestamp('Post Material Processing', self.main.iteration)
 
         # Check for low balance
@@ -4194,11 +5016,35 @@ def exceptHook(type_, value, traceback_):  # Req to return error traceback on Py
     QtCore.qFatal('')
 
 
+def loadAssetsWithSplash(app, startupTimer):
+    # Sprites are decoded on worker threads while the splash screen shows progress, menus are built after
+    splashPixmap = QtGui.QPixmap(400, 200)
+    splashPixmap.fill(QtGui.QColor('steelblue'))
+    splash = QtWidgets.QSplashScreen(splashPixmap)
+    splash.show()
+
+    def progress(loaded, total):
+        splash.showMessage('Factory\n\nLoading Sprites %i / %i' % (loaded, total),
+                           QtCore.Qt.AlignCenter, QtGui.QColor('white'))
+        app.processEvents()
+
+    progress(0, 0)
+    imagePaths = getImagePaths(machineLib().lib, materialLib().lib, imageLib().lib)
+    clsAssetLoader(imagePaths).run(progress)
+    startupTimer.mark('Sprites')
+    return splash
+
+
 # -------- Main App -------- #
 
 if __name__ == '__main__':  # Run if main program, but not if imported this from elsewhere
     sys.excepthook = exceptHook  # Req to return error traceback on PyQt 5.5 including sig / slots
     app = QtWidgets.QApplication(sys.argv)
-    mainApp = clsMainApp()
+    appStartupTimer = clsStartupTimer(LAUNCH_TIME)
+    appStartupTimer.mark('Imports & QApplication')
+    splashScreen = loadAssetsWithSplash(app, appStartupTimer)
+    mainApp = clsMainApp(startupTimer=appStartupTimer)
+    mainApp.startupReport = '--startup-report' in sys.argv
+    splashScreen.finish(mainApp)
     mainApp.finishSetup()
     sys.exit(app.exec_())
@@ -0,0 +1,152 @@
+# -------- Sprite Atlas Overview: -------- #
+# Packs every sprite in images/ into one file of pre-decoded pixels so startup doesn't open and decode each GIF.
+# File layout:
+#     Header - Magic, version and table of contents length
+#     Table of contents - JSON {image path: [pixel offset, width, height, source size, source mtime ns]}
+#     Pixels - Each sprite as premultiplied ARGB32 rows, 16 byte aligned
+# The atlas is memory mapped and sprites are wrapped as QImages over the mapped pixels without copying.
+# Sprites whose source image changed after the build (size or modified time differ) and images missing from the
+# atlas are decoded from their file instead, so a stale atlas only costs speed. Rebuild after editing images.
+#
+# At startup clsAssetLoader decodes the sprites on a thread pool while the GUI thread shows the splash screen and
+# converts finished QImages to QPixmaps in batches (pixmaps can only be made on the GUI thread).
+#
+# Usage (build step):
+#     python factoryAtlas.py
+
+# -------- Imports -------- #
+import ctypes
+import json
+import mmap
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PyQt5 import QtGui, sip
+
+# -------- Constants -------- #
+
+ATLAS_FILE = 'images/spriteAtlas.bin'
+ATLAS_MAGIC = b'FSAT'
+ATLAS_VERSION = 1
+ATLAS_HEADER = struct.Struct('<4sII')  # Magic, version, table of contents length
+ATLAS_ALIGN = 16
+ATLAS_IMAGE_TYPES = ('.gif', '.png')
+ATLAS_FORMAT = QtGui.QImage.Format_ARGB32_Premultiplied  # Fastest format to paint and to convert to a pixmap
+ASSET_BATCH_SIZE = 16  # Pixmaps converted between splash screen updates
+
+_ATLAS = None  # Opened on first use, None when there is no atlas file
+_ATLAS_OPENED = False
+_PIXMAP_CACHE = {}  # Image path: QPixmap, sprites used by many machines are converted once
+
+
+def getSourceStamp(path):
+    status = os.stat(path)
+    return [status.st_size, status.st_mtime_ns]
+
+
+# -------- Build -------- #
+
+def buildAtlas(imageDir='images', fileName=ATLAS_FILE):
+    toc = {}
+    blocks = []
+    offset = 0
+    for name in sorted(os.listdir(imageDir)):
+        if not name.lower().endswith(ATLAS_IMAGE_TYPES):
+            continue
+        path = '%s/%s' % (imageDir, name)  # Same spelling as the paths used by factoryLib
+        image = QtGui.QImage(path)
+        if image.isNull():
+            continue
+        image = image.convertToFormat(ATLAS_FORMAT)  # 32 bit rows are never padded, bytesPerLine = width * 4
+        pixels = image.constBits().asstring(image.byteCount())
+        toc[path] = [offset, image.width(), image.height()] + getSourceStamp(path)
+        padding = -len(pixels) % ATLAS_ALIGN
+        blocks.append(pixels + bytes(padding))
+        offset += len(pixels) + padding
+
+    tocBytes = json.dumps(toc).encode()
+    tocBytes += b' ' * (-(ATLAS_HEADER.size + len(tocBytes)) % ATLAS_ALIGN)  # Pixels start aligned
+    with open(fileName, 'wb') as atlasFile:
+        atlasFile.write(ATLAS_HEADER.pack(ATLAS_MAGIC, ATLAS_VERSION, len(tocBytes)))
+        atlasFile.write(tocBytes)
+        for block in blocks:
+            atlasFile.write(block)
+    return len(toc), ATLAS_HEADER.size + len(tocBytes) + offset
+
+
+# -------- Load -------- #
+
+class clsSpriteAtlas:
+    def __init__(self, fileName=ATLAS_FILE):
+        with open(fileName, 'rb') as atlasFile:
+            # Copy on write mapping, pages are shared with the file cache and ctypes can take their address
+            self.map = mmap.mmap(atlasFile.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, tocLength = ATLAS_HEADER.unpack_from(self.map, 0)
+        if magic != ATLAS_MAGIC or version != ATLAS_VERSION:
+            raise ValueError('%s is not a version %i sprite atlas' % (fileName, ATLAS_VERSION))
+        self.toc = json.loads(self.map[ATLAS_HEADER.size:ATLAS_HEADER.size + tocLength].decode())
+        self.pixelStart = ATLAS_HEADER.size + tocLength
+        self.address = ctypes.addressof(ctypes.c_char.from_buffer(self.map))
+
+    def getImage(self, path):  # QImage over the mapped pixels, None if the sprite is missing or stale
+        entry = self.toc.get(path)
+        if entry is None:
+            return None
+        offset, width, height, size, mtime = entry
+        try:
+            if getSourceStamp(path) != [size, mtime]:
+                return None
+        except OSError:
+            pass  # Source image not shipped, the atlas copy is all there is
+        pointer = sip.voidptr(self.address + self.pixelStart + offset)
+        return QtGui.QImage(pointer, width, height, width * 4, ATLAS_FORMAT)  # Valid while the atlas is open
+
+
+def getAtlas():
+    global _ATLAS, _ATLAS_OPENED
+    if not _ATLAS_OPENED:
+        _ATLAS_OPENED = True
+        try:
+            _ATLAS = clsSpriteAtlas()
+        except (OSError, ValueError, struct.error):
+            _ATLAS = None  # No atlas built, decode the images
+    return _ATLAS
+
+
+def loadImage(path):  # Safe off the GUI thread
+    atlas = getAtlas()
+    image = atlas.getImage(path) if atlas is not None else None
+    return image if image is not None else QtGui.QImage(path)
+
+
+def loadPixmap(path):  # GUI thread only
+    pixmap = _PIXMAP_CACHE.get(path)
+    if pixmap is None:
+        pixmap = _PIXMAP_CACHE[path] = QtGui.QPixmap.fromImage(loadImage(path))
+    return pixmap
+
+
+class clsAssetLoader:
+    def __init__(self, paths, workers=None):
+        self.paths = sorted(set(paths))
+        self.workers = workers  # Threads decoding images (default: ThreadPoolExecutor default)
+
+    def run(self, progress=None):  # progress(loaded, total) is called on this thread after each batch
+        getAtlas()  # Opened here so the workers only read it
+        with ThreadPoolExecutor(self.workers) as pool:
+            futures = {pool.submit(loadImage, path): path for path in self.paths if path not in _PIXMAP_CACHE}
+            for loaded, future in enumerate(as_completed(futures), 1):
+                _PIXMAP_CACHE[futures[future]] = QtGui.QPixmap.fromImage(future.result())
+                if progress is not None and (loaded % ASSET_BATCH_SIZE == 0 or loaded == len(futures)):
+                    progress(loaded, len(futures))
+        return len(futures)
+
+
+# -------- Main -------- #
+
+if __name__ == '__main__':
+    import sys
+    from PyQt5 import QtWidgets
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])  # Images need a Qt application
+    spriteCount, atlasSize = buildAtlas()
+    print('Packed %i sprites into %s (%.1f KB)' % (spriteCount, ATLAS_FILE, atlasSize / 1024))
@@ -0,0 +1,99 @@
+# -------- Batch Scenario Runner Overview: -------- #
+# Loads one or more save files and simulates each headless for a fixed number of ticks, one save per process.
+# The report has one row per save with the game balance figures and the engine speed, so regressions in either show
+# up in one command:
+#     Profit / second (sales value x quantity, the same figure as the Profit label of the income analysis)
+#     Net profit / second (balance change including all costs, Sellers credit one material value per stack)
+#     Items sold / second
+#     Materials in flight at the end of the run
+#     Machines by type
+#     Milliseconds of core loop work per tick
+#
+# Usage:
+#     python factoryBatch.py saveFile saveFileB saveFileC --ticks 4000 --csv batchReport.csv --json batchReport.json
+
+# -------- Imports -------- #
+import argparse
+import csv
+import json
+import multiprocessing
+from factoryHeadless import *  # Sets the offscreen platform before Qt starts
+
+# -------- Constants -------- #
+
+BATCH_REPORT_FIELDS = ['saveFile', 'ticks', 'incomeRate', 'netRate', 'itemRate', 'materials', 'msPerTick']
+
+_WORKER_MAIN = None  # Headless main app of each pool process
+
+
+def initWorker():
+    global _WORKER_MAIN
+    _WORKER_MAIN = createHeadlessApp()
+
+
+def runScenario(args):
+    saveFileName, ticks, warmupTicks = args
+    try:
+        loadSaveFile(_WORKER_MAIN, saveFileName)
+    except (OSError, KeyError, ValueError) as error:
+        # Missing, truncated or incompatible saves are reported, not raised, readSaveFile raises ValueError for them
+        return {'saveFile': saveFileName, 'error': repr(error)}
+    result = measure(_WORKER_MAIN, ticks, warmupTicks)
+    result['saveFile'] = saveFileName
+    return result
+
+
+def runBatch(saveFileNames, ticks=4000, warmupTicks=0, workers=None):
+    # Spawned, not forked, so every worker builds its own QApplication
+    with multiprocessing.get_context('spawn').Pool(workers, initWorker) as pool:
+        return pool.map(runScenario, [(saveFileName, ticks, warmupTicks) for saveFileName in saveFileNames])
+
+
+# -------- Reports -------- #
+
+def writeCsv(results, fileName):
+    machineTypes = sorted(set(k for result in results for k in result.get('machines', {})))
+    with open(fileName, 'w', newline='') as reportFile:
+        writer = csv.writer(reportFile)
+        writer.writerow(BATCH_REPORT_FIELDS + machineTypes + ['error'])
+        for result in results:
+            writer.writerow([result.get(field, '') for field in BATCH_REPORT_FIELDS]
+                            + [result.get('machines', {}).get(k, 0) for k in machineTypes]
+                            + [result.get('error', '')])
+
+
+def writeJson(results, fileName):
+    with open(fileName, 'w') as reportFile:
+        json.dump(results, reportFile, indent=2)
+
+
+def printSummary(results):
+    print('%-30s %12s %12s %10s %10s %10s' % ('Save File', 'Profit / s', 'Net / s', 'Items / s', 'In Flight',
+                                              'ms / Tick'))
+    for result in results:
+        if 'error' in result:
+            print('%-30s %s' % (result['saveFile'], result['error']))
+        else:
+            print('%-30s %12.1f %12.1f %10.2f %10i %10.3f' % (result['saveFile'], result['incomeRate'],
+                                                              result['netRate'], result['itemRate'],
+                                                              result['materials'], result['msPerTick']))
+
+
+# -------- Main -------- #
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulate save files headless and report profit and engine speed')
+    parser.add_argument('saveFiles', nargs='+', help='Save files to simulate')
+    parser.add_argument('--ticks', type=int, default=4000, help='Ticks measured per save')
+    parser.add_argument('--warmup', type=int, default=0, help='Ticks run before measuring each save')
+    parser.add_argument('--workers', type=int, default=None, help='Processes in the pool (default: CPU count)')
+    parser.add_argument('--csv', default=None, help='CSV report file')
+    parser.add_argument('--json', default=None, help='JSON report file')
+    arguments = parser.parse_args()
+
+    batchResults = runBatch(arguments.saveFiles, arguments.ticks, arguments.warmup, arguments.workers)
+    printSummary(batchResults)
+    if arguments.csv:
+        writeCsv(batchResults, arguments.csv)
+    if arguments.json:
+        writeJson(batchResults, arguments.json)
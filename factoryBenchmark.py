@@ -0,0 +1,261 @@
+# -------- Benchmark Suite Overview: -------- #
+# Measures engine speed on synthetic factories built programmatically, so results repeat from run to run.
+# Each scenario stresses one part of the core loop and is built at three sizes:
+#     Roller Snake - One long serpentine roller line fed along its length (material movement, tile center checks)
+#     Splitter Tree - Binary tree of Splitter Tees ending in Sellers (splitting and material creation)
+#     Arm Chain - Rollers with a Robotic Arm between every pair (arm pick up, motion and drop off)
+#     Teleporter Mesh - Starter lanes teleported to crossed output lanes (teleporter lookups)
+#     Crafter Line - Copper Wire and Gold fed Circuit Crafters (launch queue and inventories)
+# The core loop phases already marked by logTimestamp are timed for every tick and reported as average ms per tick,
+# with p50 / p95 / p99 / max over all measured ticks from the phase histograms.
+# 'Post Run Idle' is the time between ticks, mostly the benchmark driver itself when run headless.
+# Results are saved as JSON and compared against a stored baseline, phases slower than the tolerance are flagged.
+#
+# Usage:
+#     python factoryBenchmark.py
+#     python factoryBenchmark.py --sizes small medium --baseline benchmarkBaseline.json
+#     python factoryBenchmark.py --update-baseline
+
+# -------- Imports -------- #
+import argparse
+import json
+import sys
+import time
+from factoryHeadless import *  # Sets the offscreen platform before Qt starts
+from factoryHistogram import clsPhaseHistograms, HISTOGRAM_PERCENTILES, FRAME
+
+# -------- Constants -------- #
+
+BENCHMARK_RESULT_FILE = 'benchmarkResult.json'
+BENCHMARK_BASELINE_FILE = 'benchmarkBaseline.json'
+BENCHMARK_TOLERANCE = 0.10  # Slowdown vs baseline flagged as a regression
+BENCHMARK_NOISE_FLOOR = 0.005  # ms / tick, smaller slowdowns are timer noise and never flagged
+BENCHMARK_PHASES = ['Post Start Admin Actions', 'Post Launch Materials', 'Post Move Materials',
+                    'Post Move Robotic Arms', 'Post Material Processing', 'Post End Admin Actions', 'Post Run Idle']
+BENCHMARK_SIZES = {'small': 0, 'medium': 1, 'large': 2}  # Index into the size list of each scenario
+
+
+# -------- Layout Builders -------- #
+# Builders return clsMachine.getRecord style lists placed on a grid of tile columns and rows
+
+def tile(column, row):
+    return 13 + GRID_SIZE * column, 13 + GRID_SIZE * row
+
+
+def machineRecord(machineType, column, row, orientation, selectedBlueprint=None, teleporterID=None, quantity=1):
+    return [machineType, *tile(column, row), orientation, selectedBlueprint, quantity, None, None, teleporterID]
+
+
+def buildRollerSnake(length, width=40, feederSpacing=4):
+    # Serpentine path on even rows: right, up two rows, left, up two rows, ...
+    # Starters in the free odd rows feed down into the snake so it stays loaded along its whole length
+    path = []
+    row = 0
+    while len(path) < length + 2:
+        columns = range(width) if row % 4 == 0 else range(width - 1, -1, -1)
+        path += [(column, row) for column in columns]
+        path.append((path[-1][0], row + 1))  # Turn
+        row += 2
+    path = path[:length + 2]
+
+    records = []
+    for i, (column, row) in enumerate(path[:-1]):
+        nextColumn, nextRow = path[i + 1]
+        orientation = 'U' if nextRow > row else ('R' if nextColumn > column else 'L')
+        if i == 0:
+            records.append(machineRecord(STARTER, column, row, orientation, 'Copper'))
+        else:
+            records.append(machineRecord(ROLLER, column, row, orientation))
+        if row % 2 == 0 and 0 < column < width - 1 and column % feederSpacing == 0 and (column, row + 1) not in path:
+            records.append(machineRecord(STARTER, column, row + 1, 'D', 'Copper'))
+    records.append(machineRecord(SELLER, *path[-1], 'R'))
+    return records
+
+
+def buildSplitterTree(depth):
+    # Children of a splitter at level L sit 2 ** (depth - L - 1) rows above and below it, so subtrees never overlap
+    # A feed line with 2 ** (depth - 1) Starters launching stacks of 2 keeps every branch of the tree loaded
+    records = []
+
+    def branch(column, row, level):
+        if level == depth:
+            records.append(machineRecord(SELLER, column, row, 'R'))
+            return
+        records.append(machineRecord(SPLITTER_TEE, column, row, 'R'))
+        offset = 2 ** (depth - level - 1)
+        for sign, orientation in [(1, 'U'), (-1, 'D')]:
+            for j in range(1, offset):
+                records.append(machineRecord(ROLLER, column, row + sign * j, orientation))
+            records.append(machineRecord(ROLLER, column, row + sign * offset, 'R'))
+            branch(column + 1, row + sign * offset, level + 1)
+
+    rootRow = 2 ** depth
+    feeders = 2 ** (depth - 1)
+    for column in range(feeders):
+        records.append(machineRecord(ROLLER, column, rootRow, 'R'))
+        records.append(machineRecord(STARTER, column, rootRow + 1, 'D', 'Copper', quantity=2))
+    branch(feeders, rootRow, 0)
+    return records
+
+
+def buildArmChain(arms, armsPerRow=20):
+    records = []
+    for row in range(0, (arms + armsPerRow - 1) // armsPerRow):
+        armsInRow = min(armsPerRow, arms - row * armsPerRow)
+        records.append(machineRecord(STARTER, 0, row * 2, 'R', 'Iron'))
+        for i in range(armsInRow):
+            records.append(machineRecord(ROLLER, 1 + i * 2, row * 2, 'R'))
+            records.append(machineRecord(ROBOTIC_ARM, 2 + i * 2, row * 2, 'R'))
+        records.append(machineRecord(ROLLER, 1 + armsInRow * 2, row * 2, 'R'))
+        records.append(machineRecord(SELLER, 2 + armsInRow * 2, row * 2, 'R'))
+    return records
+
+
+def buildTeleporterMesh(lanes):
+    # Lane i is teleported to output row lanes - 1 - i, so every link crosses the mesh
+    records = []
+    for i in range(lanes):
+        records.append(machineRecord(STARTER, 0, i, 'R', 'Gold'))
+        records.append(machineRecord(TELEPORTER_INPUT, 1, i, 'R', teleporterID=i + 1))
+        records.append(machineRecord(TELEPORTER_OUTPUT, 4, lanes - 1 - i, 'R', teleporterID=i + 1))
+        records.append(machineRecord(ROLLER, 5, lanes - 1 - i, 'R'))
+        records.append(machineRecord(SELLER, 6, lanes - 1 - i, 'R'))
+    return records
+
+
+def buildCrafterLine(crafters):
+    # Copper -> Drawer -> Copper Wire -> Circuit Crafter <- Gold, Circuits go straight to a Seller
+    records = []
+    for i in range(crafters):
+        row = i * 2
+        records.append(machineRecord(STARTER, 0, row, 'R', 'Copper'))
+        records.append(machineRecord(DRAWER, 1, row, 'R', 'Copper Wire'))
+        records.append(machineRecord(ROLLER, 2, row, 'R'))
+        records.append(machineRecord(CRAFTER, 3, row, 'R', 'Circuit'))
+        records.append(machineRecord(STARTER, 3, row + 1, 'D', 'Gold'))
+        records.append(machineRecord(SELLER, 4, row, 'R'))
+    return records
+
+
+BENCHMARK_SCENARIOS = {'Roller Snake': (buildRollerSnake, [100, 400, 1600]),
+                       'Splitter Tree': (buildSplitterTree, [3, 5, 7]),
+                       'Arm Chain': (buildArmChain, [10, 40, 160]),
+                       'Teleporter Mesh': (buildTeleporterMesh, [8, 32, 128]),
+                       'Crafter Line': (buildCrafterLine, [4, 16, 64])}
+
+
+# -------- Timing -------- #
+
+def getPhaseTimes(timeLog):
+    # Each timestamp closes the phase named by it, the time since the prior timestamp is charged to that phase
+    phaseTimes = {phase: 0 for phase in BENCHMARK_PHASES}
+    for (lastName, lastRun, lastTime), (stampName, runNumber, timestamp) in zip(timeLog, timeLog[1:]):
+        phaseTimes[stampName] = phaseTimes.get(stampName, 0) + (timestamp - lastTime) * 1000  # ms
+    return phaseTimes
+
+
+def runScenario(main, builder, size, ticks, warmupTicks):
+    records = builder(size)
+    placeMachines(main, records)
+    main.updateBalance(HEADLESS_BALANCE)
+    runTicks(main, warmupTicks)
+
+    main.phaseHistograms = clsPhaseHistograms(ticks)  # Window covers every measured tick
+    main.tracer.start()
+    startTime = time.perf_counter()
+    runTicks(main, ticks)
+    elapsed = time.perf_counter() - startTime
+    main.tracer.stop()  # stopTimeLog would print the table
+
+    phaseTimes = getPhaseTimes(main.tracer.getTimeLog())
+    return {'size': size,
+            'machines': len(main.Machines),
+            'materials': len(main.Materials),
+            'ticks': ticks,
+            'msPerTick': elapsed * 1000 / ticks,
+            'phases': {phase: phaseTime / ticks for phase, phaseTime in phaseTimes.items()},  # ms / tick
+            'percentiles': main.phaseHistograms.getSummary()}  # {phase: {p50, p95, p99, max, ...}} ms
+
+
+def runBenchmarks(sizes, ticks, warmupTicks, scenarios=None):
+    main = createHeadlessApp()
+    results = {}
+    for name, (builder, scenarioSizes) in BENCHMARK_SCENARIOS.items():
+        if scenarios and name not in scenarios:
+            continue
+        for sizeName in sizes:
+            key = '%s %s' % (name, sizeName)
+            results[key] = runScenario(main, builder, scenarioSizes[BENCHMARK_SIZES[sizeName]], ticks, warmupTicks)
+            print('%-26s %5i machines %5i materials %8.3f ms / tick'
+                  % (key, results[key]['machines'], results[key]['materials'], results[key]['msPerTick']))
+    return results
+
+
+def printPercentiles(results):
+    columns = ['p%i' % percentile for percentile in HISTOGRAM_PERCENTILES] + ['max']
+    print('\n%-26s %-26s' % ('Benchmark', 'Phase (ms)') + ''.join(' %10s' % column for column in columns))
+    for key, result in results.items():
+        for phase in [FRAME] + BENCHMARK_PHASES:
+            print('%-26s %-26s' % (key, phase)
+                  + ''.join(' %10.4f' % result['percentiles'][phase][column] for column in columns))
+
+
+# -------- Baseline Comparison -------- #
+
+def compareToBaseline(results, baseline, tolerance=BENCHMARK_TOLERANCE):
+    # Returns [(benchmark, phase, baseline ms, result ms)] for every phase slower than the tolerance
+    regressions = []
+    print('\n%-26s %-26s %10s %10s %8s' % ('Benchmark', 'Phase', 'Baseline', 'Result', 'Change'))
+    for key, result in results.items():
+        if key not in baseline:
+            print('%-26s not in baseline' % key)
+            continue
+        rows = [('Total', baseline[key]['msPerTick'], result['msPerTick'])]
+        rows += [(phase, baseline[key]['phases'].get(phase, 0), result['phases'][phase]) for phase in BENCHMARK_PHASES]
+        for phase, baselineTime, resultTime in rows:
+            change = (resultTime - baselineTime) / baselineTime if baselineTime > 0 else 0
+            flag = ''
+            if change > tolerance and resultTime - baselineTime > BENCHMARK_NOISE_FLOOR \
+                    and phase != 'Post Run Idle':  # Idle is driver overhead, not engine work
+                regressions.append((key, phase, baselineTime, resultTime))
+                flag = ' <- Slower'
+            print('%-26s %-26s %10.4f %10.4f %+7.1f%%%s'
+                  % (key, phase, baselineTime, resultTime, change * 100, flag))
+    return regressions
+
+
+# -------- Main -------- #
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time core loop phases on synthetic factories')
+    parser.add_argument('--sizes', nargs='+', default=list(BENCHMARK_SIZES), choices=list(BENCHMARK_SIZES),
+                        help='Sizes to run (default: all)')
+    parser.add_argument('--scenarios', nargs='+', default=None, choices=list(BENCHMARK_SCENARIOS),
+                        help='Scenarios to run (default: all)')
+    parser.add_argument('--ticks', type=int, default=1000, help='Ticks timed per benchmark')
+    parser.add_argument('--warmup', type=int, default=500, help='Ticks run before timing each benchmark')
+    parser.add_argument('--output', default=BENCHMARK_RESULT_FILE, help='Result JSON file')
+    parser.add_argument('--baseline', default=BENCHMARK_BASELINE_FILE, help='Baseline JSON file to compare with')
+    parser.add_argument('--tolerance', type=float, default=BENCHMARK_TOLERANCE,
+                        help='Relative slowdown flagged as a regression')
+    parser.add_argument('--update-baseline', action='store_true', help='Save the results as the new baseline')
+    arguments = parser.parse_args()
+
+    benchmarkResults = runBenchmarks(arguments.sizes, arguments.ticks, arguments.warmup, arguments.scenarios)
+    printPercentiles(benchmarkResults)
+    with open(arguments.output, 'w') as resultFile:
+        json.dump(benchmarkResults, resultFile, indent=2)
+
+    if arguments.update_baseline:
+        with open(arguments.baseline, 'w') as baselineFile:
+            json.dump(benchmarkResults, baselineFile, indent=2)
+        print('Baseline saved to %s' % arguments.baseline)
+    else:
+        try:
+            with open(arguments.baseline) as baselineFile:
+                benchmarkBaseline = json.load(baselineFile)
+        except OSError:
+            print('No baseline found, run with --update-baseline to save one')
+            sys.exit(0)
+        if compareToBaseline(benchmarkResults, benchmarkBaseline, arguments.tolerance):
+            sys.exit(1)  # Non zero exit so scripts can catch regressions
@@ -0,0 +1,95 @@
+# -------- Constants -------- #
+# Shared by the game and the headless analysis modules (no Qt dependency).
+
+CYCLE_INTERVAL = 25  # Core loop time (ms) 25 = 1 roller/sec, 40 = 25fps, 17 = 60fps
+MAT_LAUNCH_INTERVAL = 40  # Iterations between material launches
+ARM_MOTION_FRAMES = 48  # Robotic arm frames from pick up to drop off
+MATERIAL_BATCH_PAINT = True  # Paint all materials from two layer items instead of one pixmap item each
+STATIC_TILE_CACHE = True  # Paint grid and machines from cached layers repainted by dirty tile
+ZOOM_MIN = 0.25  # View scale limits
+ZOOM_MAX = 4
+ZOOM_STEP = 2  # Scale change of the Zoom In / Out actions
+ZOOM_WHEEL_STEP = 1.15  # Scale change per mouse wheel notch
+LOD_DETAIL_SCALE = 0.75  # Below this scale materials are drawn as tile density and robotic arms stop animating
+LOD_DENSITY_COLORS = [(6, (200, 40, 0)), (3, (255, 140, 0)), (1, (255, 210, 80))]  # (Min materials on tile, RGB)
+ARM_CULL_MARGIN = 50  # Scene px around the view, robotic arm links reach about a tile past the arm
+ARM_KINEMATICS_STRIDE = 8  # Robotic arm table row: link AB center x, y, link BC center x, y, C x, y, thetaAB, thetaBC
+INCOME_ANALYSIS_FREQ = 10
+FRAME_RATE_ANALYSIS_LOG_SIZE = 600
+FRAME_RATE_PLOT_INTERVAL = 500  # Frame rate menu refresh time (ms) while open
+AUTOSAVE_INTERVAL = 60000  # Autosave time (ms), 0 = off
+# Run time state kept by checkpoints, clsMachine and clsMaterial attributes. Materials are rebuilt from the first
+# five fields (clsMaterial arguments), arms also keep the index of the held material.
+MACHINE_STATE_FIELDS = ['contains', 'queueMaterial', 'queueDelay', 'consideredBlueprints', 'splitOutput',
+                        'splitCumulative', 'splitTurn', 'motionInProgress', 'motionFrame', 'returnMotion',
+                        'teleporterActivated']
+MATERIAL_STATE_FIELDS = ['type', 'x', 'y', 'orientation', 'quantity', 'pickedUp', 'groupPos', 'xVisOffset',
+                         'yVisOffset']
+PROFILER_OVERLAY_INTERVAL = 250  # Profiler overlay refresh time (ms)
+PROFILER_OVERLAY_WINDOW = 4  # Refreshes averaged by the profiler overlay, 4 x 250ms = 1 second rolling
+PROFILER_OVERLAY_PHASES = [('Launch', ['Launch Materials']),  # (Row, tick tracer span names)
+                           ('Move', ['Move Materials']),
+                           ('Arms', ['Move Robotic Arms']),
+                           ('Processing', ['Material Processing']),
+                           ('Admin', ['Start Admin Actions', 'End Admin Actions']),
+                           ('Tick', ['Tick']),
+                           ('Paint', ['Paint']),
+                           ('Idle', ['Idle'])]  # Idle includes paint and all other Qt event processing
+MACHINE_RECORD_FIELDS = ['type', 'x', 'y', 'orientation', 'selectedBlueprint', 'starterQuantity', 'filterLeft',
+                         'filterRight', 'teleporterID', 'filterArm', 'splitSetting']  # Order of clsMachine.getRecord
+GRID_SIZE = 25
+MACHINE_SIZE = 24
+MAT_SIZE = 8
+TIME_PROFILE_ALARM_LIMIT = 37
+TIME_PROFILE_ZERO_FLOOR = 0.001
+ORIENTATIONS = ['U', 'L', 'D', 'R']
+ORIENTATION_CODE = {'U': 0, 'L': 1, 'D': 2, 'R': 3}  # Index into ORIENTATIONS
+ANGLE = {'U': 180, 'L': 90, 'D': 0, 'R': 270}
+VISUAL_OFFSET_1_TO_2 = [(0, 0), (2, 0)]  # Visual offsets for groups of size 1 to 2 materials
+VISUAL_OFFSET_3_TO_3 = [(-2, 0), (0, 2), (2, 0)]
+VISUAL_OFFSET_4_TO_4 = [(-2, 2), (2, 2), (-2, -2), (2, -2)]
+VISUAL_OFFSET_5_TO_9 = [(0, 0), (2, 0), (-2, 0),
+                        (0, -2), (2, -2), (-2, -2),
+                        (0, 2), (2, 2), (-2, 2)]
+RESET_QUEUED = True
+RESET_NOT_QUEUED = False
+IN = 'In'
+OUT = 'Out'
+LEFT = 'Left'
+RIGHT = 'Right'
+ARM = 'Arm'
+RESET = 'Reset'
+WALLED = True
+NOT_WALLED = False
+LOCKED = True
+NOT_LOCKED = False
+LOCK = 'Lock'  # drawShape argument flag
+WALL = 'Wall'
+HIGHLIGHT = 'Highlight'
+TILE_FLAGS = {LOCK: 1, WALL: 2, HIGHLIGHT: 4}  # Tile overlay state bits
+Z_MACHINE_BOTTOM = 0  # Z Height Stack Order
+Z_MATERIAL = 1
+Z_MACHINE_TOP = 2
+Z_PICKED_UP = 3
+Z_ROBOT_ARM = 4
+Z_HEATMAP = 5  # Traffic heatmap
+Z_HIGHLIGHT = 6  # Tile overlay, arrows, locks, walls and highlights
+STARTER = 'Starter'
+CRAFTER = 'Crafter'
+SELLER = 'Seller'
+ROLLER = 'Roller'
+DRAWER = 'Drawer'
+CUTTER = 'Cutter'
+FURNACE = 'Furnace'
+PRESS = 'Press'
+SPLITTER_LEFT = 'Splitter Left'
+SPLITTER_RIGHT = 'Splitter Right'
+SPLITTER_TEE = 'Splitter Tee'
+SPLITTER_3WAY = 'Splitter 3-Way'
+FILTER_LEFT = 'Filter Left'
+FILTER_RIGHT = 'Filter Right'
+FILTER_TEE = 'Filter Tee'
+ROBOTIC_ARM = 'Robotic Arm'
+FILTERED_ARM = 'Filtered Arm'
+TELEPORTER_INPUT = 'Teleporter Input'
+TELEPORTER_OUTPUT = 'Teleporter Output'
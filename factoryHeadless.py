@@ -0,0 +1,95 @@
+# -------- Headless Simulation Overview: -------- #
+# Runs the game without a visible window so tools can simulate layouts faster than real time.
+# The core loop is driven directly by runTicks instead of the QTimer, so a tick takes only as long as its work.
+# Qt is still required because materials and machines own their scene items, the offscreen platform plugin is used
+# so no display is needed. Rates are measured in game seconds (ticks * CYCLE_INTERVAL), the same basis as the GUI.
+# Checkpoints (clsMainApp.getCheckpoint) are fork points for what-if runs: warm a layout up once, take a checkpoint,
+# then restore it before each variant so every run starts from the same full pipelines.
+
+# -------- Imports -------- #
+import copy
+import os
+import sys
+import time
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')  # Must be set before the QApplication is created
+from PyQt5 import QtWidgets
+import factory
+from factoryConstants import *
+
+# -------- Constants -------- #
+
+HEADLESS_BALANCE = 10 ** 15  # Balance used when measuring layouts so Starters never run out of money
+
+_APP = None  # Keep the QApplication alive for the life of the process
+
+
+def createHeadlessApp():
+    global _APP
+    _APP = QtWidgets.QApplication.instance()
+    if _APP is None:
+        _APP = QtWidgets.QApplication(sys.argv[:1])
+    main = factory.clsMainApp()
+    main.finishSetup(startTimer=False)
+    return main
+
+
+def loadSaveFile(main, fileName):
+    main.loadConfig(fileName)
+    main.activateValidTeleporters()
+
+
+def placeMachines(main, records, xOffset=0, yOffset=0):
+    # Records are clsMachine.getRecord lists, or floor plan lists with coordinates relative to the offset
+    main.deleteAllMachinesAndMaterials()
+    for record in records:
+        record = list(record)
+        record[1] += xOffset
+        record[2] += yOffset
+        main.Machines.append(factory.clsMachine(main, *record))
+    main.activateValidTeleporters()
+    main.updateThroughputPrediction()
+
+
+def getRecords(main):
+    return [tool.getRecord() for tool in main.Machines]
+
+
+def takeCheckpoint(main):
+    return main.getCheckpoint()
+
+
+def restoreCheckpoint(main, checkpoint):  # The checkpoint is copied so it can be restored any number of times
+    main.loadSaveData(copy.deepcopy(checkpoint))
+    main.activateValidTeleporters()
+
+
+def runTicks(main, ticks):
+    for i in range(ticks):
+        main.coreLoop.run()
+
+
+def measure(main, ticks, warmupTicks=0):
+    # Runs warmupTicks to fill the pipelines then measures rates over ticks
+    main.updateBalance(HEADLESS_BALANCE)
+    runTicks(main, warmupTicks)
+
+    startBalance = main.balance
+    startIncome = main.totalSalesIncome
+    startItems = main.totalSalesItems
+    startTime = time.perf_counter()
+    runTicks(main, ticks)
+    elapsed = time.perf_counter() - startTime
+
+    gameSeconds = ticks * CYCLE_INTERVAL / 1000
+    machineCounts = {}
+    for tool in main.Machines:
+        machineCounts[tool.type] = machineCounts.get(tool.type, 0) + 1
+    return {'ticks': ticks,
+            # Sales value x quantity, the income analysis menu Profit label and the throughput model basis
+            'incomeRate': (main.totalSalesIncome - startIncome) / gameSeconds,
+            'itemRate': (main.totalSalesItems - startItems) / gameSeconds,
+            # Balance change, Sellers credit one material value per stack so stacks earn less here than incomeRate
+            'netRate': (main.balance - startBalance) / gameSeconds,
+            'materials': sum(material.quantity for material in main.Materials),
+            'machines': machineCounts,
+            'msPerTick': elapsed * 1000 / max(1, ticks)}
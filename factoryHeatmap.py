@@ -0,0 +1,69 @@
+# -------- Traffic Heatmap Overview: -------- #
+# Counts materials passing each tile center and materials destroyed on each tile (fell off the rollers, no
+# matching teleporter output) in two flat arrays indexed like main.Tiles, bumped by the core loop.
+# Nothing is kept per material, a pass is one array increment.
+# Counts are cumulative, a copy of both arrays is taken every sample so the counts over the last N samples are
+# the newest copy minus the oldest copy kept. Copies are taken once a second, not per tick.
+# The heatmap overlay (a clsTileLayer in factory.py painted by clsMainApp.paintHeatmapTiles) shows the windowed counts,
+# it is repainted after each sample while visible.
+
+# -------- Imports -------- #
+from array import array
+from collections import deque
+
+# -------- Constants -------- #
+
+HEATMAP_WINDOW = 10  # Samples the heatmap covers, 10 x 1 second
+HEATMAP_SAMPLE_TICKS = 40  # Ticks between samples, 1 second at CYCLE_INTERVAL 25
+
+
+class clsTrafficCounter:
+    def __init__(self, columns, rows, gridSize, window=HEATMAP_WINDOW):
+        self.columns = columns
+        self.rows = rows
+        self.gridSize = gridSize
+        self.size = columns * rows
+        self.passes = array('L', [0]) * self.size  # Tile index: materials passed its center
+        self.destroyed = array('L', [0]) * self.size  # Tile index: materials destroyed on it
+        self.samples = deque(maxlen=window + 1)  # (passes, destroyed) copies, the oldest is the window start
+        self.sample()
+
+    def getIndex(self, x, y):  # Same order as main.Tiles, None off the grid
+        column = x // self.gridSize
+        row = y // self.gridSize
+        if 0 <= column < self.columns and 0 <= row < self.rows:
+            return column * self.rows + row
+        return None
+
+    def countPass(self, x, y):
+        i = self.getIndex(x, y)
+        if i is not None:
+            self.passes[i] += 1
+
+    def countDestroyed(self, x, y):
+        i = self.getIndex(x, y)
+        if i is not None:
+            self.destroyed[i] += 1
+
+    def sample(self):  # Called every HEATMAP_SAMPLE_TICKS
+        self.samples.append((array('L', self.passes), array('L', self.destroyed)))
+
+    def clear(self):
+        self.passes = array('L', [0]) * self.size
+        self.destroyed = array('L', [0]) * self.size
+        self.samples.clear()
+        self.sample()
+
+    def getWindowSamples(self):  # Samples between the window start and the newest one, at least 1
+        return max(1, len(self.samples) - 1)
+
+    def getWindowCounts(self):  # [(tile index, passes, destroyed)] over the window, tiles without any skipped
+        oldPasses, oldDestroyed = self.samples[0]
+        newPasses, newDestroyed = self.samples[-1]
+        counts = []
+        for i in range(self.size):
+            passes = newPasses[i] - oldPasses[i]
+            destroyed = newDestroyed[i] - oldDestroyed[i]
+            if passes or destroyed:
+                counts.append((i, passes, destroyed))
+        return counts
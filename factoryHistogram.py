@@ -0,0 +1,110 @@
+# -------- Frame Time Histograms Overview: -------- #
+# Sliding window percentiles of frame time and of each core loop phase, cheap enough to run on every tick.
+# Values (ms) go into fixed log scaled buckets, 8 per doubling, so a percentile is within 9% of the exact value
+# from 1 us to 30 s. A ring buffer remembers the bucket of each value in the window so the oldest one is removed
+# when a new one arrives, adding a value is O(1) and a percentile walks the bucket counts only.
+# The window maximum is exact, kept in a monotonic queue.
+# Phases are timed by the logTimestamp markers, each marker closes the phase named by it (the same as the time log
+# table and the benchmark), 'Frame' is the time from one core loop run to the next.
+
+# -------- Imports -------- #
+import math
+from array import array
+from collections import deque
+from time import perf_counter_ns
+from factoryTrace import CORE_LOOP_MARKS
+
+# -------- Constants -------- #
+
+HISTOGRAM_WINDOW = 600  # Values kept, 600 ticks ~ 15 seconds
+HISTOGRAM_MIN_MS = 0.001  # Upper bound of the first bucket
+HISTOGRAM_BUCKETS_PER_OCTAVE = 8
+HISTOGRAM_BUCKETS = 200  # Last bucket upper bound ~ 31 s
+HISTOGRAM_PERCENTILES = [50, 95, 99]
+FRAME = 'Frame'
+
+
+def getBucket(ms):
+    if ms <= HISTOGRAM_MIN_MS:
+        return 0
+    return min(HISTOGRAM_BUCKETS - 1, math.ceil(math.log2(ms / HISTOGRAM_MIN_MS) * HISTOGRAM_BUCKETS_PER_OCTAVE))
+
+
+def getBucketValue(bucket):  # Upper bound of the bucket (ms)
+    return HISTOGRAM_MIN_MS * 2 ** (bucket / HISTOGRAM_BUCKETS_PER_OCTAVE)
+
+
+class clsLogHistogram:
+    def __init__(self, window=HISTOGRAM_WINDOW):
+        self.window = window
+        self.counts = [0] * HISTOGRAM_BUCKETS
+        self.buckets = array('H', bytes(2 * window))  # Ring buffer of the bucket of each value in the window
+        self.values = array('d', bytes(8 * window))  # Ring buffer of the values, for the running total
+        self.count = 0  # Values added, the write position is count % window
+        self.total = 0.0  # Sum of the values in the window
+        self.maxima = deque()  # (value number, ms) with decreasing ms, the front is the window maximum
+
+    def add(self, ms):
+        i = self.count % self.window
+        if self.count >= self.window:  # Oldest value leaves the window
+            self.counts[self.buckets[i]] -= 1
+            self.total -= self.values[i]
+        bucket = getBucket(ms)
+        self.buckets[i] = bucket
+        self.values[i] = ms
+        self.counts[bucket] += 1
+        self.total += ms
+
+        while self.maxima and self.maxima[-1][1] <= ms:  # Smaller values can never be the maximum again
+            self.maxima.pop()
+        self.maxima.append((self.count, ms))
+        if self.maxima[0][0] <= self.count - self.window:
+            self.maxima.popleft()
+        self.count += 1
+
+    def getSize(self):
+        return min(self.count, self.window)
+
+    def getMean(self):
+        return self.total / self.getSize() if self.count else 0
+
+    def getMax(self):
+        return self.maxima[0][1] if self.maxima else 0
+
+    def getPercentile(self, percentile):
+        size = self.getSize()
+        if size == 0:
+            return 0
+        rank = max(1, math.ceil(percentile / 100 * size))
+        cumulative = 0
+        for bucket, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(getBucketValue(bucket), self.getMax())
+        return self.getMax()
+
+    def getSummary(self):
+        summary = {'count': self.getSize(), 'mean': self.getMean(), 'max': self.getMax()}
+        for percentile in HISTOGRAM_PERCENTILES:
+            summary['p%i' % percentile] = self.getPercentile(percentile)
+        return summary
+
+
+class clsPhaseHistograms:  # One histogram for frame time and one per core loop phase
+    def __init__(self, window=HISTOGRAM_WINDOW):
+        self.histograms = {name: clsLogHistogram(window) for name in [FRAME] + CORE_LOOP_MARKS}
+        self.lastTime = None
+        self.lastFrameTime = None
+
+    def mark(self, stampName):  # Called by logTimestamp
+        now = perf_counter_ns()
+        if self.lastTime is not None:
+            self.histograms[stampName].add((now - self.lastTime) / 1e6)
+        if stampName == 'Post Run Idle':
+            if self.lastFrameTime is not None:
+                self.histograms[FRAME].add((now - self.lastFrameTime) / 1e6)
+            self.lastFrameTime = now
+        self.lastTime = now
+
+    def getSummary(self):  # {name: {count, mean, max, p50, p95, p99}} in ms
+        return {name: histogram.getSummary() for name, histogram in self.histograms.items()}
@@ -1,4 +1,39 @@
-from PyQt5 import QtCore, QtWidgets, QtGui
+# -------- Game Libraries Overview: -------- #
+# Game data for machines, materials, research and achievements plus the images drawn for them.
+# Images are clsLazyPixmap references that each library entry resolves to a QPixmap the first time the image key is
+# read, so the numeric data (cost, value, components, opTime) is usable without Qt and unused images are never loaded.
+
+
+class clsLazyPixmap:  # Image path, optionally scaled, loaded on first access through clsLibEntry
+    def __init__(self, path, size=None):
+        self.path = path
+        self.size = size  # (width, height) to scale to
+
+    def load(self):
+        from factoryAtlas import loadPixmap  # Qt is only needed once an image is used
+        pixmap = loadPixmap(self.path)
+        return pixmap.scaled(*self.size) if self.size is not None else pixmap
+
+
+class clsLibEntry(dict):  # Library entry dict that swaps clsLazyPixmap values for their pixmap when read
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if isinstance(value, clsLazyPixmap):
+            value = value.load()
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+
+def getLazyLib(lib):
+    return {key: clsLibEntry(entry) for key, entry in lib.items()}
+
+
+def getImagePaths(*libs):  # Paths of the images not loaded yet, for preloading
+    return set(value.path for lib in libs for entry in lib.values() for value in entry.values()
+               if isinstance(value, clsLazyPixmap))
 
 
 class machineLib:
@@ -11,9 +46,9 @@ class machineLib:
                 'opTime': 3,
                 'description': 'Launches new basic resources. Each basic resource must be purchased. \
                                Maximum of 10 Starters can be placed per assembly line without additional research.',
-                'imageTop': QtGui.QPixmap('images/Starter.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Starter Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Starter.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Starter Composite.gif', (40, 40)),
                 'blueprintType': 'Basic',
                 },
             'Seller': {
@@ -22,9 +57,9 @@ class machineLib:
                 'opCost': 0,
                 'opTime': 0,
                 'description': 'Sells resources.',
-                'imageTop': QtGui.QPixmap('images/Seller.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Seller Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Seller.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Seller Composite.gif', (40, 40)),
             },
             'Crafter': {
                 'unlock': 80000,
@@ -32,9 +67,9 @@ class machineLib:
                 'opCost': 5,
                 'opTime': 3,
                 'description': 'Creates new resources using blueprints.',
-                'imageTop': QtGui.QPixmap('images/Crafter.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Crafter Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Crafter.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Crafter Composite.gif', (40, 40)),
                 'blueprintType': 'Tier2',
                 },
             'Roller': {
@@ -43,9 +78,9 @@ class machineLib:
                 'opCost': 0,
                 'opTime': 0,
                 'description': 'Moves resources around the factory.',
-                'imageTop': QtGui.QPixmap('images/Blank.gif'),
-                'imageBottom': QtGui.QPixmap('images/Roller.gif'),
-                'imageComposite': QtGui.QPixmap('images/Roller Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Blank.gif'),
+                'imageBottom': clsLazyPixmap('images/Roller.gif'),
+                'imageComposite': clsLazyPixmap('images/Roller Composite.gif', (40, 40)),
                 },
             'Drawer': {
                 'unlock': 40000,
@@ -53,9 +88,9 @@ class machineLib:
                 'opCost': 5,
                 'opTime': 3,
                 'description': 'Creates wire by consuming basic resources.',
-                'imageTop': QtGui.QPixmap('images/Drawer.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Drawer Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Drawer.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Drawer Composite.gif', (40, 40)),
                 'blueprintType': 'Wire',
                 },
             'Cutter': {
@@ -64,9 +99,9 @@ class machineLib:
                 'opCost': 5,
                 'opTime': 3,
                 'description': 'Creates gears by consuming basic resources.',
-                'imageTop': QtGui.QPixmap('images/Cutter.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Cutter Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Cutter.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Cutter Composite.gif', (40, 40)),
                 'blueprintType': 'Gear',
                 },
             'Furnace': {
@@ -75,9 +110,9 @@ class machineLib:
                 'opCost': 5,
                 'opTime': 3,
                 'description': 'Creates liquid by consuming basic resources.',
-                'imageTop': QtGui.QPixmap('images/Furnace.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Furnace Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Furnace.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Furnace Composite.gif', (40, 40)),
                 'blueprintType': 'Liquid',
                 },
             'Press': {
@@ -86,9 +121,9 @@ class machineLib:
                 'opCost': 5,
                 'opTime': 3,
                 'description': 'Creates plate by consuming basic resources.',
-                'imageTop': QtGui.QPixmap('images/Press.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Press Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Press.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Press Composite.gif', (40, 40)),
                 'blueprintType': 'Plate',
                 },
             'Splitter Left': {                                    
@@ -97,9 +132,9 @@ class machineLib:
                 'opCost': 5,
                 'opTime': 1,
                 'description': 'Splits incoming material in different directions',
-                'imageTop': QtGui.QPixmap('images/Splitter Left.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Splitter Left Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Splitter Left.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Splitter Left Composite.gif', (40, 40)),
                 },
             'Splitter Right': {                                    
                 'unlock': 600000,
@@ -107,9 +142,9 @@ class machineLib:
                 'opCost': 5,
                 'opTime': 1,
                 'description': 'Splits incoming material in different directions',
-                'imageTop': QtGui.QPixmap('images/Splitter Right.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Splitter Right Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Splitter Right.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Splitter Right Composite.gif', (40, 40)),
                 },
             'Splitter Tee': {                                    
                 'unlock': 600000,
@@ -117,9 +152,9 @@ class machineLib:
                 'opCost': 5,
                 'opTime': 1,
                 'description': 'Splits incoming material in different directions',
-                'imageTop': QtGui.QPixmap('images/Splitter Tee.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Splitter Tee Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Splitter Tee.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Splitter Tee Composite.gif', (40, 40)),
                 },
             'Splitter 3-Way': {                                    
                 'unlock': 1000000,
@@ -127,9 +162,9 @@ class machineLib:
                 'opCost': 5,
                 'opTime': 1,
                 'description': 'Splits incoming material in different directions',
-                'imageTop': QtGui.QPixmap('images/Splitter 3-Way.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Splitter 3-Way Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Splitter 3-Way.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Splitter 3-Way Composite.gif', (40, 40)),
                 },
             'Filter Left': {
                 'unlock': 300000,
@@ -137,9 +172,9 @@ class machineLib:
                 'opCost': 2,
                 'opTime': 1,
                 'description': 'Splits material based on filter selection.',
-                'imageTop': QtGui.QPixmap('images/Filter Left.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Filter Left Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Filter Left.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Filter Left Composite.gif', (40, 40)),
                 },
             'Filter Right': {
                 'unlock': 500000,
@@ -147,9 +182,9 @@ class machineLib:
                 'opCost': 2,
                 'opTime': 1,
                 'description': 'Splits material based on filter selection.',
-                'imageTop': QtGui.QPixmap('images/Filter Right.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Filter Right Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Filter Right.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Filter Right Composite.gif', (40, 40)),
                 },
             'Filter Tee': {
                 'unlock': 500000,
@@ -157,9 +192,9 @@ class machineLib:
                 'opCost': 2,
                 'opTime': 1,
                 'description': 'Splits material based on filter selection.',
-                'imageTop': QtGui.QPixmap('images/Filter Tee.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Filter Tee Composite.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Filter Tee.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Filter Tee Composite.gif', (40, 40)),
                 },
             'Robotic Arm': {
                 'unlock': 400000,
@@ -167,11 +202,11 @@ class machineLib:
                 'opCost': 2,
                 'opTime': 1,
                 'description': 'Picks up material and moves it drop off zone.',
-                'imageTop': QtGui.QPixmap('images/Blank.gif'),
-                'imageBottom': QtGui.QPixmap('images/Robotic Arm Base.gif'),
-                'imageComposite': QtGui.QPixmap('images/Robotic Arm Composite.gif').scaled(40, 40),
-                'imageLink1': QtGui.QPixmap('images/Robotic Arm Link 1.gif'),
-                'imageLink2': QtGui.QPixmap('images/Robotic Arm Link 2.gif'),
+                'imageTop': clsLazyPixmap('images/Blank.gif'),
+                'imageBottom': clsLazyPixmap('images/Robotic Arm Base.gif'),
+                'imageComposite': clsLazyPixmap('images/Robotic Arm Composite.gif', (40, 40)),
+                'imageLink1': clsLazyPixmap('images/Robotic Arm Link 1.gif'),
+                'imageLink2': clsLazyPixmap('images/Robotic Arm Link 2.gif'),
                 },
             'Filtered Arm': {
                 'unlock': 500000,
@@ -179,11 +214,11 @@ class machineLib:
                 'opCost': 2,
                 'opTime': 1,
                 'description': 'Picks up selected material type and moves it drop off zone.',
-                'imageTop': QtGui.QPixmap('images/Blank.gif'),
-                'imageBottom': QtGui.QPixmap('images/Filtered Arm Base.gif'),
-                'imageComposite': QtGui.QPixmap('images/Filtered Arm Composite.gif').scaled(40, 40),
-                'imageLink1': QtGui.QPixmap('images/Robotic Arm Link 1.gif'),
-                'imageLink2': QtGui.QPixmap('images/Robotic Arm Link 2.gif'),
+                'imageTop': clsLazyPixmap('images/Blank.gif'),
+                'imageBottom': clsLazyPixmap('images/Filtered Arm Base.gif'),
+                'imageComposite': clsLazyPixmap('images/Filtered Arm Composite.gif', (40, 40)),
+                'imageLink1': clsLazyPixmap('images/Robotic Arm Link 1.gif'),
+                'imageLink2': clsLazyPixmap('images/Robotic Arm Link 2.gif'),
                 },
             'Teleporter Input': {
                 'unlock': 250000000,
@@ -191,9 +226,9 @@ class machineLib:
                 'opCost': 100,
                 'opTime': 1,
                 'description': 'Teleports materials to the Teleporter Output with matching ID.',
-                'imageTop': QtGui.QPixmap('images/Teleporter Input.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Teleporter Input.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Teleporter Input.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Teleporter Input.gif', (40, 40)),
                 },
             'Teleporter Output': {
                 'unlock': 250000000,
@@ -201,11 +236,12 @@ class machineLib:
                 'opCost': 100,
                 'opTime': 1,
                 'description': 'Receives teleported materials from the Teleporter Input with matching ID.',
-                'imageTop': QtGui.QPixmap('images/Teleporter Output.gif'),
-                'imageBottom': QtGui.QPixmap('images/MachineBottom.gif'),
-                'imageComposite': QtGui.QPixmap('images/Teleporter Output.gif').scaled(40, 40),
+                'imageTop': clsLazyPixmap('images/Teleporter Output.gif'),
+                'imageBottom': clsLazyPixmap('images/MachineBottom.gif'),
+                'imageComposite': clsLazyPixmap('images/Teleporter Output.gif', (40, 40)),
                 },
             }
+        self.lib = getLazyLib(self.lib)
 
 
 class materialLib:
@@ -216,9 +252,9 @@ class materialLib:
                 'value': 80,
                 'cost': 5,
                 'class': 'Basic',
-                'image': QtGui.QPixmap('images/Copper.gif'),
-                'image_qty_2': QtGui.QPixmap('images/Copper_2.gif'),
-                'image_qty_3': QtGui.QPixmap('images/Copper_3.gif'),
+                'image': clsLazyPixmap('images/Copper.gif'),
+                'image_qty_2': clsLazyPixmap('images/Copper_2.gif'),
+                'image_qty_3': clsLazyPixmap('images/Copper_3.gif'),
                 'maker': 'Starter',
                 'unlock': 0,
                 'components': {},
@@ -227,9 +263,9 @@ class materialLib:
                 'value': 80,
                 'cost': 5,
                 'class': 'Basic',
-                'image': QtGui.QPixmap('images/Gold.gif'),
-                'image_qty_2': QtGui.QPixmap('images/Gold_2.gif'),
-                'image_qty_3': QtGui.QPixmap('images/Gold_3.gif'),
+                'image': clsLazyPixmap('images/Gold.gif'),
+                'image_qty_2': clsLazyPixmap('images/Gold_2.gif'),
+                'image_qty_3': clsLazyPixmap('images/Gold_3.gif'),
                 'maker': 'Starter',
                 'unlock': 0,
                 'components': {},
@@ -239,9 +275,9 @@ class materialLib:
                 'cost': 5,
                 'class': 'Basic',
                 'color': 'seashell4',
-                'image': QtGui.QPixmap('images/Iron.gif'),
-                'image_qty_2': QtGui.QPixmap('images/Iron_2.gif'),
-                'image_qty_3': QtGui.QPixmap('images/Iron_3.gif'),
+                'image': clsLazyPixmap('images/Iron.gif'),
+                'image_qty_2': clsLazyPixmap('images/Iron_2.gif'),
+                'image_qty_3': clsLazyPixmap('images/Iron_3.gif'),
                 'maker': 'Starter',
                 'unlock': 0,
                 'components': {},
@@ -250,9 +286,9 @@ class materialLib:
                 'value': 80,
                 'cost': 5,
                 'class': 'Basic',
-                'image': QtGui.QPixmap('images/Aluminum.gif'),
-                'image_qty_2': QtGui.QPixmap('images/Aluminum_2.gif'),
-                'image_qty_3': QtGui.QPixmap('images/Aluminum_3.gif'),
+                'image': clsLazyPixmap('images/Aluminum.gif'),
+                'image_qty_2': clsLazyPixmap('images/Aluminum_2.gif'),
+                'image_qty_3': clsLazyPixmap('images/Aluminum_3.gif'),
                 'maker': 'Starter',
                 'unlock': 0,
                 'components': {},
@@ -261,9 +297,9 @@ class materialLib:
                 'value': 80,
                 'cost': 5,
                 'class': 'Basic',
-                'image': QtGui.QPixmap('images/Crystal.gif'),
-                'image_qty_2': QtGui.QPixmap('images/Crystal_2.gif'),
-                'image_qty_3': QtGui.QPixmap('images/Crystal_3.gif'),
+                'image': clsLazyPixmap('images/Crystal.gif'),
+                'image_qty_2': clsLazyPixmap('images/Crystal_2.gif'),
+                'image_qty_3': clsLazyPixmap('images/Crystal_3.gif'),
                 'maker': 'Starter',
                 'unlock': 0,
                 'components': {},
@@ -272,7 +308,7 @@ class materialLib:
             'Copper Wire': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Copper Wire.gif'),
+                'image': clsLazyPixmap('images/Copper Wire.gif'),
                 'class': 'Wire',
                 'maker': 'Drawer',
                 'unlock': 0,
@@ -283,7 +319,7 @@ class materialLib:
             'Gold Wire': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Gold Wire.gif'),
+                'image': clsLazyPixmap('images/Gold Wire.gif'),
                 'class': 'Wire',
                 'maker': 'Drawer',
                 'unlock': 0,
@@ -294,7 +330,7 @@ class materialLib:
             'Iron Wire': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Iron Wire.gif'),
+                'image': clsLazyPixmap('images/Iron Wire.gif'),
                 'class': 'Wire',
                 'maker': 'Drawer',
                 'unlock': 0,
@@ -305,7 +341,7 @@ class materialLib:
             'Aluminum Wire': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Aluminum Wire.gif'),
+                'image': clsLazyPixmap('images/Aluminum Wire.gif'),
                 'class': 'Wire',
                 'maker': 'Drawer',
                 'unlock': 0,
@@ -316,7 +352,7 @@ class materialLib:
             'Crystal Wire': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Crystal Wire.gif'),
+                'image': clsLazyPixmap('images/Crystal Wire.gif'),
                 'class': 'Wire',
                 'maker': 'Drawer',
                 'unlock': 0,
@@ -328,7 +364,7 @@ class materialLib:
             'Copper Gear': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Copper Gear.gif'),
+                'image': clsLazyPixmap('images/Copper Gear.gif'),
                 'class': 'Gear',
                 'maker': 'Cutter',
                 'unlock': 0,
@@ -339,7 +375,7 @@ class materialLib:
             'Gold Gear': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Gold Gear.gif'),
+                'image': clsLazyPixmap('images/Gold Gear.gif'),
                 'class': 'Gear',
                 'maker': 'Cutter',
                 'unlock': 0,
@@ -350,7 +386,7 @@ class materialLib:
             'Iron Gear': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Iron Gear.gif'),
+                'image': clsLazyPixmap('images/Iron Gear.gif'),
                 'class': 'Gear',
                 'maker': 'Cutter',
                 'unlock': 0,
@@ -361,7 +397,7 @@ class materialLib:
             'Aluminum Gear': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Aluminum Gear.gif'),
+                'image': clsLazyPixmap('images/Aluminum Gear.gif'),
                 'class': 'Gear',
                 'maker': 'Cutter',
                 'unlock': 0,
@@ -372,7 +408,7 @@ class materialLib:
             'Crystal Gear': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Crystal Gear.gif'),
+                'image': clsLazyPixmap('images/Crystal Gear.gif'),
                 'class': 'Gear',
                 'maker': 'Cutter',
                 'unlock': 0,
@@ -384,7 +420,7 @@ class materialLib:
             'Molten Copper': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Molten Copper.gif'),
+                'image': clsLazyPixmap('images/Molten Copper.gif'),
                 'class': 'Liquid',
                 'maker': 'Furnace',
                 'unlock': 0,
@@ -395,7 +431,7 @@ class materialLib:
             'Molten Gold': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Molten Gold.gif'),
+                'image': clsLazyPixmap('images/Molten Gold.gif'),
                 'class': 'Liquid',
                 'maker': 'Furnace',
                 'unlock': 0,
@@ -406,7 +442,7 @@ class materialLib:
             'Molten Iron': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Molten Iron.gif'),
+                'image': clsLazyPixmap('images/Molten Iron.gif'),
                 'class': 'Liquid',
                 'maker': 'Furnace',
                 'unlock': 0,
@@ -417,7 +453,7 @@ class materialLib:
             'Molten Aluminum': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Molten Aluminum.gif'),
+                'image': clsLazyPixmap('images/Molten Aluminum.gif'),
                 'class': 'Liquid',
                 'maker': 'Furnace',
                 'unlock': 0,
@@ -428,7 +464,7 @@ class materialLib:
             'Molten Crystal': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Molten Crystal.gif'),
+                'image': clsLazyPixmap('images/Molten Crystal.gif'),
                 'class': 'Liquid',
                 'maker': 'Furnace',
                 'unlock': 0,
@@ -440,7 +476,7 @@ class materialLib:
             'Copper Plate': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Copper Plate.gif'),
+                'image': clsLazyPixmap('images/Copper Plate.gif'),
                 'class': 'Plate',
                 'maker': 'Press',
                 'unlock': 0,
@@ -451,7 +487,7 @@ class materialLib:
             'Gold Plate': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Gold Plate.gif'),
+                'image': clsLazyPixmap('images/Gold Plate.gif'),
                 'class': 'Plate',
                 'maker': 'Press',
                 'unlock': 0,
@@ -462,7 +498,7 @@ class materialLib:
             'Iron Plate': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Iron Plate.gif'),
+                'image': clsLazyPixmap('images/Iron Plate.gif'),
                 'class': 'Plate',
                 'maker': 'Press',
                 'unlock': 0,
@@ -473,7 +509,7 @@ class materialLib:
             'Aluminum Plate': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Aluminum Plate.gif'),
+                'image': clsLazyPixmap('images/Aluminum Plate.gif'),
                 'class': 'Plate',
                 'maker': 'Press',
                 'unlock': 0,
@@ -484,7 +520,7 @@ class materialLib:
             'Crystal Plate': {
                 'value': 100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Crystal Plate.gif'),
+                'image': clsLazyPixmap('images/Crystal Plate.gif'),
                 'class': 'Plate',
                 'maker': 'Press',
                 'unlock': 0,
@@ -493,10 +529,10 @@ class materialLib:
                     },
                 },
             # Tier2
-            'Circuit ': {                                # Unlocked by default for free
+            'Circuit': {                                 # Unlocked by default for free
                 'value': 350,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Circuit.gif'),
+                'image': clsLazyPixmap('images/Circuit.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 0,
@@ -508,7 +544,7 @@ class materialLib:
             'Engine': {
                 'value': 400,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Engine.gif'),
+                'image': clsLazyPixmap('images/Engine.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 360000,
@@ -520,19 +556,19 @@ class materialLib:
             'Heating Coil': {
                 'value': 350,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Heating Coil.gif'),
+                'image': clsLazyPixmap('images/Heating Coil.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 360000,
                 'components': {
-                    'Circuit ': 1,
+                    'Circuit': 1,
                     'Aluminum': 2
                     },
                 },
             'Cooling Coil': {
                 'value': 350,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Cooling Coil.gif'),
+                'image': clsLazyPixmap('images/Cooling Coil.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 360000,
@@ -545,7 +581,7 @@ class materialLib:
             'Light Bulb': {
                 'value': 350,
                 'cost': 5,
-                'image': QtGui.QPixmap('images/Light Bulb.gif'),
+                'image': clsLazyPixmap('images/Light Bulb.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 360000,
@@ -558,7 +594,7 @@ class materialLib:
             'Clock': {
                 'value': 500,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Clock.gif'),
+                'image': clsLazyPixmap('images/Clock.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 540000,
@@ -571,7 +607,7 @@ class materialLib:
             'Antenna': {
                 'value': 500,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Antenna.gif'),
+                'image': clsLazyPixmap('images/Antenna.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 540000,
@@ -583,7 +619,7 @@ class materialLib:
             'Grill': {
                 'value': 600,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Grill.gif'),
+                'image': clsLazyPixmap('images/Grill.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 600000,
@@ -595,7 +631,7 @@ class materialLib:
             'Toaster': {
                 'value': 900,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Toaster.gif'),
+                'image': clsLazyPixmap('images/Toaster.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 900000,
@@ -608,24 +644,24 @@ class materialLib:
             'Air Conditioner': {
                 'value': 900,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Air Conditioner.gif'),
+                'image': clsLazyPixmap('images/Air Conditioner.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 900000,
                 'components': {
-                    'Circuit ': 1,
+                    'Circuit': 1,
                     'Aluminum': 2
                     },
                 },
             'Battery': {
                 'value': 1000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Battery.gif'),
+                'image': clsLazyPixmap('images/Battery.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 1050000,
                 'components': {
-                    'Circuit ': 1,
+                    'Circuit': 1,
                     'Aluminum': 1,
                     'Molten Aluminum': 1
                     },
@@ -633,7 +669,7 @@ class materialLib:
             'Washing Machine': {
                 'value': 1100,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Washing Machine.gif'),
+                'image': clsLazyPixmap('images/Washing Machine.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 1100000,
@@ -646,12 +682,12 @@ class materialLib:
             'Solar Panel': {
                 'value': 1200,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Solar Panel.gif'),
+                'image': clsLazyPixmap('images/Solar Panel.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 1170000,
                 'components': {
-                    'Circuit ': 1,
+                    'Circuit': 1,
                     'Gold': 2,
                     'Crystal': 1
                     },
@@ -659,12 +695,12 @@ class materialLib:
             'Headphones': {
                 'value': 1300,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Headphones.gif'),
+                'image': clsLazyPixmap('images/Headphones.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 1300000,
                 'components': {
-                    'Circuit ': 1,
+                    'Circuit': 1,
                     'Gold Wire': 1,
                     'Crystal Wire': 1
                     },
@@ -672,19 +708,19 @@ class materialLib:
             'Processor': {
                 'value': 1300,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Processor.gif'),
+                'image': clsLazyPixmap('images/Processor.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 1320000,
                 'components': {
-                    'Circuit ': 2,
+                    'Circuit': 2,
                     'Aluminum': 2
                     },
                 },
             'Drill': {
                 'value': 1500,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Drill.gif'),
+                'image': clsLazyPixmap('images/Drill.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 1500000,
@@ -697,12 +733,12 @@ class materialLib:
             'Power Supply': {
                 'value': 2000,
                 'cost': 5,
-                'image': QtGui.QPixmap('images/Power Supply.gif'),
+                'image': clsLazyPixmap('images/Power Supply.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 1920000,
                 'components': {
-                    'Circuit ': 1,
+                    'Circuit': 1,
                     'Copper Wire': 3,
                     'Iron Wire': 3
                     },
@@ -710,12 +746,12 @@ class materialLib:
             'Speaker': {
                 'value': 3300,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Speaker.gif'),
+                'image': clsLazyPixmap('images/Speaker.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 3300000,
                 'components': {
-                    'Circuit ': 2,
+                    'Circuit': 2,
                     'Gold Wire': 4,
                     'Crystal Wire': 4
                     },
@@ -723,12 +759,12 @@ class materialLib:
             'Radio': {
                 'value': 5600,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Radio.gif'),
+                'image': clsLazyPixmap('images/Radio.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 5670000,
                 'components': {
-                    'Circuit ': 1,
+                    'Circuit': 1,
                     'Antenna': 1,
                     'Battery': 1
                     },
@@ -736,12 +772,12 @@ class materialLib:
             'Jack Hammer': {
                 'value': 7000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Jack Hammer.gif'),
+                'image': clsLazyPixmap('images/Jack Hammer.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 6920000,
                 'components': {
-                    'Circuit ': 4,
+                    'Circuit': 4,
                     'Crystal': 4,
                     'Iron Plate': 4
                     },
@@ -749,20 +785,20 @@ class materialLib:
             'TV': {
                 'value': 4000,
                 'cost': 5,
-                'image': QtGui.QPixmap('images/TV.gif'),
+                'image': clsLazyPixmap('images/TV.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 7100000,
                 'components': {
                     'Power Supply': 1,
-                    'Circuit ': 1,
+                    'Circuit': 1,
                     'Aluminum': 4
                     },
                 },
             'Smartphone': {
                 'value': 7300,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Smartphone.gif'),
+                'image': clsLazyPixmap('images/Smartphone.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 7300000,
@@ -775,7 +811,7 @@ class materialLib:
             'Refrigerator': {
                 'value': 7400,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Refrigerator.gif'),
+                'image': clsLazyPixmap('images/Refrigerator.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 7400000,
@@ -788,7 +824,7 @@ class materialLib:
             'Tablet': {
                 'value': 7600,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Tablet.gif'),
+                'image': clsLazyPixmap('images/Tablet.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 7600000,
@@ -801,7 +837,7 @@ class materialLib:
             'Microwave': {
                 'value': 8000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Microwave.gif'),
+                'image': clsLazyPixmap('images/Microwave.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 8070000,
@@ -814,7 +850,7 @@ class materialLib:
             'Railroad Tracks': {
                 'value': 8400,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Railroad Tracks.gif'),
+                'image': clsLazyPixmap('images/Railroad Tracks.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 8400000,
@@ -826,7 +862,7 @@ class materialLib:
             'Smart Watch': {
                 'value': 10200,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Smart Watch.gif'),
+                'image': clsLazyPixmap('images/Smart Watch.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 10000000,
@@ -839,7 +875,7 @@ class materialLib:
             'Server Rack': {
                 'value': 10600,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Server Rack.gif'),
+                'image': clsLazyPixmap('images/Server Rack.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 11000000,
@@ -851,7 +887,7 @@ class materialLib:
             'Computer': {
                 'value': 11000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Computer.gif'),
+                'image': clsLazyPixmap('images/Computer.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 11000000,
@@ -864,7 +900,7 @@ class materialLib:
             'Generator': {
                 'value': 12000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Generator.gif'),
+                'image': clsLazyPixmap('images/Generator.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 12000000,
@@ -877,7 +913,7 @@ class materialLib:
             'Water Heater': {
                 'value': 13000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Water Heater.gif'),
+                'image': clsLazyPixmap('images/Water Heater.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 13000000,
@@ -890,7 +926,7 @@ class materialLib:
             'Drone': {
                 'value': 17200,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Drone.gif'),
+                'image': clsLazyPixmap('images/Drone.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 17000000,
@@ -903,12 +939,12 @@ class materialLib:
             'Circuit Board Assembly': {
                 'value': 27000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Circuit Board Assembly.gif'),
+                'image': clsLazyPixmap('images/Circuit Board Assembly.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 27000000,
                 'components': {
-                    'Circuit ': 20,
+                    'Circuit': 20,
                     'Copper Plate': 6,
                     'Iron Plate': 6
                     },
@@ -916,7 +952,7 @@ class materialLib:
             'Oven': {
                 'value': 27300,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Oven.gif'),
+                'image': clsLazyPixmap('images/Oven.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 27000000,
@@ -929,45 +965,45 @@ class materialLib:
             'Laser': {
                 'value': 32000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Laser.gif'),
+                'image': clsLazyPixmap('images/Laser.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 32000000,
                 'components': {
                     'Battery': 6,
                     'Crystal Plate': 10,
-                    'Circuit ': 6
+                    'Circuit': 6
                     },
                 },
             'Advanced Engine': {
                 'value': 70000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Advanced Engine.gif'),
+                'image': clsLazyPixmap('images/Advanced Engine.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 70000000,
                 'components': {
                     'Engine': 50,
-                    'Circuit ': 50
+                    'Circuit': 50
                     },
                 },
             'Electric Generator': {
                 'value': 470000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Electric Generator.gif'),
+                'image': clsLazyPixmap('images/Electric Generator.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 470000000,
                 'components': {
                     'Generator': 15,
-                    'Circuit ': 50,
+                    'Circuit': 50,
                     'Battery': 40
                     },
                 },
             'Super Computer': {
                 'value': 550000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Super Computer.gif'),
+                'image': clsLazyPixmap('images/Super Computer.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 550000000,
@@ -979,7 +1015,7 @@ class materialLib:
             'Electric Engine': {
                 'value': 900000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/Electric Engine.gif'),
+                'image': clsLazyPixmap('images/Electric Engine.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 900000000,
@@ -991,19 +1027,19 @@ class materialLib:
             'AI Processor': {
                 'value': 2500000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/AI Processor.gif'),
+                'image': clsLazyPixmap('images/AI Processor.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 2500000000,
                 'components': {
                     'Super Computer': 4,
-                    'Circuit ': 40
+                    'Circuit': 40
                     },
                 },
             'AI Robot Body': {
                 'value': 2800000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/AI Robot Body.gif'),
+                'image': clsLazyPixmap('images/AI Robot Body.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 2800000000,
@@ -1016,7 +1052,7 @@ class materialLib:
             'AI Robot Head': {
                 'value': 5000000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/AI Robot Head.gif'),
+                'image': clsLazyPixmap('images/AI Robot Head.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 5000000000,
@@ -1028,7 +1064,7 @@ class materialLib:
             'AI Robot': {
                 'value': 15000000,
                 'cost': 0,
-                'image': QtGui.QPixmap('images/AI Robot.gif'),
+                'image': clsLazyPixmap('images/AI Robot.gif'),
                 'class': 'Tier2',
                 'maker': 'Crafter',
                 'unlock': 15000000000,
@@ -1038,6 +1074,7 @@ class materialLib:
                     },
                 },
             }
+        self.lib = getLazyLib(self.lib)
 
 
 class achievementLib:
@@ -1188,9 +1225,10 @@ class imageLib:
     def __init__(self):
         self.lib = {
             'Key Lock': {
-                'image': QtGui.QPixmap('images/Key Lock.gif').scaled(40, 40),
+                'image': clsLazyPixmap('images/Key Lock.gif', (40, 40)),
             },
             'Wall': {
-                'image': QtGui.QPixmap('images/Wall.gif'),
+                'image': clsLazyPixmap('images/Wall.gif'),
             }
         }
+        self.lib = getLazyLib(self.lib)
@@ -0,0 +1,298 @@
+# -------- Throughput Model Overview: -------- #
+# Predicts the steady state flow rates of a factory layout without running the core loop.
+# Materials are treated as continuous flows (items / second) and routed tile to tile through the machine graph using
+# the same rules as clsCoreLoop.run:
+#     Rollers set the direction of travel
+#     Splitters divide the flow by their splitSetting ratios
+#     Filters turn the flow left or right by material type, other materials keep their direction
+#     Teleporter Inputs jump to the first Teleporter Output with a matching ID or destroy the material
+#     Robotic Arms take up to one material per arm cycle off their pick up roller and drop it on the far tile
+#     Materials reaching an empty tile, a Starter or an arm base fall on the floor and are lost
+# Starters, Crafters, Drawers, Cutters, Furnaces and Presses launch one blueprint every op time (counted in material
+# launch intervals) as long as they hold its components. Producer rates feed the inventories of downstream producers,
+# so routing is repeated until the producer rates settle.
+# Rates are per second of game time at the nominal CYCLE_INTERVAL, the same basis as mainApp.measuredMoneyRate.
+# Stacks are counted per item, so per piece op costs are overestimated when Starters launch stacks.
+
+# -------- Imports -------- #
+from collections import deque
+from factoryConstants import *
+
+# -------- Constants -------- #
+
+TICKS_PER_SECOND = 1000 / CYCLE_INTERVAL
+ARM_CYCLE_TICKS = ARM_MOTION_FRAMES * 2 - 1  # Forward frames 1 to 48 then return frames 47 to 1
+MODEL_MAX_ITERATIONS = 20  # Producer rate passes, deeper than the longest recipe chain
+MODEL_MAX_STATE_VISITS = 50  # Visits to one tile & direction before flow is considered trapped in a closed loop
+MODEL_MIN_RATE = 1e-9  # Flows below this rate are dropped
+MODEL_TOLERANCE = 1e-6  # Relative producer rate change considered converged
+MOVEMENT = {'U': (0, GRID_SIZE), 'L': (-GRID_SIZE, 0), 'D': (0, -GRID_SIZE), 'R': (GRID_SIZE, 0)}
+PRODUCERS = [STARTER, CRAFTER, DRAWER, CUTTER, FURNACE, PRESS]
+CONSUMERS = [CRAFTER, DRAWER, CUTTER, FURNACE, PRESS]
+SPLITTERS = [SPLITTER_LEFT, SPLITTER_RIGHT, SPLITTER_TEE, SPLITTER_3WAY]
+FILTERS = [FILTER_LEFT, FILTER_RIGHT, FILTER_TEE]
+ARMS = [ROBOTIC_ARM, FILTERED_ARM]
+DEFAULT_SPLIT_SETTING = {SPLITTER_3WAY: [1, 1, 1], SPLITTER_TEE: [1, 0, 1],
+                         SPLITTER_LEFT: [1, 1, 0], SPLITTER_RIGHT: [0, 1, 1]}
+LOST_FLOOR = 'Floor'
+LOST_TELEPORTER = 'Teleporter'
+LOST_TRAPPED = 'Trapped'
+
+
+class clsThroughputModel:
+    def __init__(self, recipeGraph):
+        self.recipeGraph = recipeGraph  # Compiled clsRecipeGraph, shares machineLib.lib & materialLib.lib
+        self.machineLib = recipeGraph.machineLib
+
+        # Working state for a single analysis
+        self.tileMap = {}
+        self.armsByPickUpZone = {}
+        self.armCapacity = {}
+        self.teleporterOutputs = {}
+        self.inflow = {}
+        self.pending = {}
+        self.queue = deque()
+        self.visits = {}
+        self.result = None
+
+    # -------- Public Methods -------- #
+
+    # machines: clsMachine objects or any objects with the same layout attributes
+    def analyze(self, machines, opCostModifier=1, opTimeModifierStarterCrafter=0, opTimeModifierTier2Machines=0):
+        self.buildGraph(machines)
+
+        producers = [tool for tool in machines if tool.type in PRODUCERS]
+        capacity = {}  # Launch events per second at full speed
+        for tool in producers:
+            capacity[tool] = self.recipeGraph.getLaunchRate(
+                tool.type, opTimeModifierStarterCrafter, opTimeModifierTier2Machines)
+
+        # Starters launch at full speed, all other producers start idle and are driven by their inflows
+        events = {}
+        for tool in producers:
+            events[tool] = {}
+            if tool.type == STARTER and tool.selectedBlueprint is not None:
+                events[tool][tool.selectedBlueprint] = capacity[tool]
+
+        iterations = 0
+        for iterations in range(1, MODEL_MAX_ITERATIONS + 1):
+            self.resetResult()
+            for tool in producers:
+                for blueprint, rate in events[tool].items():
+                    self.routeFromTile(tool.x, tool.y, tool.orientation, blueprint, rate * tool.starterQuantity)
+            self.propagate()
+
+            newEvents = {}
+            for tool in producers:
+                if tool.type == STARTER:
+                    newEvents[tool] = events[tool]
+                else:
+                    newEvents[tool] = self.getConsumerEvents(tool, capacity[tool])
+
+            converged = self.checkConverged(events, newEvents)
+            events = newEvents
+            if converged:
+                break
+
+        self.summarize(producers, events, capacity, opCostModifier, iterations)
+        return self.result
+
+    # -------- Graph Setup -------- #
+
+    def buildGraph(self, machines):
+        self.tileMap = {}
+        self.armsByPickUpZone = {}
+        self.teleporterOutputs = {}
+        for tool in machines:
+            self.tileMap[(tool.x, tool.y)] = tool
+            if tool.type in ARMS:
+                xPickUp, yPickUp, xDropOff, yDropOff = self.getArmZones(tool)
+                self.armsByPickUpZone.setdefault((xPickUp, yPickUp), []).append((tool, xDropOff, yDropOff))
+            if tool.type == TELEPORTER_OUTPUT and tool.teleporterID not in self.teleporterOutputs:
+                self.teleporterOutputs[tool.teleporterID] = tool  # First output in list order receives materials
+
+    @staticmethod
+    def getArmZones(tool):
+        xMove, yMove = MOVEMENT[tool.orientation]  # Arms drop off in the direction they face
+        return tool.x - xMove, tool.y - yMove, tool.x + xMove, tool.y + yMove
+
+    # -------- Flow Routing -------- #
+
+    def resetResult(self):
+        self.inflow = {}
+        self.armCapacity = {}
+        self.result = {'sales': {},  # Material type: items / second reaching Sellers
+                       'lost': {},  # (x, y): {'reason': str, 'rate': items / second}
+                       'tileFlow': {},  # (x, y): items / second arriving at the tile center
+                       'armFlow': {},  # Arm: items / second carried
+                       'unused': {},  # Consumer: {material type: items / second absorbed but never used}
+                       'opCost': 0}  # Op cost / second charged per piece by routing machines, before modifier
+        self.pending = {}  # (x, y, orientation, material type): items / second waiting to be propagated
+        self.queue = deque()
+        self.visits = {}
+
+    def routeFromTile(self, x, y, orientation, materialType, rate):
+        xMove, yMove = MOVEMENT[orientation]
+        self.addArrival(x + xMove, y + yMove, orientation, materialType, rate)
+
+    def addArrival(self, x, y, orientation, materialType, rate):
+        if rate < MODEL_MIN_RATE:
+            return
+        state = (x, y, orientation, materialType)
+        if state not in self.pending:
+            self.pending[state] = 0
+            self.queue.append(state)
+        self.pending[state] += rate
+
+    def propagate(self):
+        while self.queue:
+            state = self.queue.popleft()
+            rate = self.pending.pop(state)
+            x, y, orientation, materialType = state
+
+            self.visits[state] = self.visits.get(state, 0) + 1
+            if self.visits[state] > MODEL_MAX_STATE_VISITS:
+                self.addLoss(x, y, LOST_TRAPPED, rate)  # Flow circulates in a closed loop without an exit
+                continue
+            self.result['tileFlow'][(x, y)] = self.result['tileFlow'].get((x, y), 0) + rate
+
+            tool = self.tileMap.get((x, y))
+            if tool is None or tool.type in [STARTER] + ARMS:
+                self.addLoss(x, y, LOST_FLOOR, rate)
+
+            elif tool.type == ROLLER:
+                rate = self.armPickUp(x, y, materialType, rate)
+                self.routeFromTile(x, y, tool.orientation, materialType, rate)
+
+            elif tool.type in SPLITTERS:
+                self.addOpCost(tool, rate)
+                splitSetting = tool.splitSetting if tool.splitSetting is not None \
+                    else DEFAULT_SPLIT_SETTING[tool.type]
+                total = sum(splitSetting)
+                orientationIndex = ORIENTATIONS.index(tool.orientation)  # [U, L, D, R]
+                for turn, share in zip([3, 0, 1], splitSetting):  # Relative Left, Straight, Right
+                    if share > 0:
+                        self.routeFromTile(x, y, ORIENTATIONS[(orientationIndex + turn) % 4], materialType,
+                                           rate * share / total)
+
+            elif tool.type in FILTERS:
+                self.addOpCost(tool, rate)
+                orientationIndex = ORIENTATIONS.index(tool.orientation)  # [U, L, D, R]
+                if materialType == tool.filterLeft:
+                    orientation = ORIENTATIONS[(orientationIndex + 3) % 4]
+                elif materialType == tool.filterRight:
+                    orientation = ORIENTATIONS[(orientationIndex + 1) % 4]
+                self.routeFromTile(x, y, orientation, materialType, rate)
+
+            elif tool.type == TELEPORTER_INPUT:
+                self.addOpCost(tool, rate)
+                output = self.teleporterOutputs.get(tool.teleporterID)
+                if output is None:
+                    self.addLoss(x, y, LOST_TELEPORTER, rate)
+                else:
+                    self.routeFromTile(output.x, output.y, output.orientation, materialType, rate)
+
+            elif tool.type == TELEPORTER_OUTPUT:
+                self.routeFromTile(x, y, orientation, materialType, rate)  # Materials roll straight across
+
+            elif tool.type in CONSUMERS:
+                self.inflow.setdefault(tool, {})
+                self.inflow[tool][materialType] = self.inflow[tool].get(materialType, 0) + rate
+
+            elif tool.type == SELLER:
+                self.result['sales'][materialType] = self.result['sales'].get(materialType, 0) + rate
+
+    def armPickUp(self, x, y, materialType, rate):
+        for arm, xDropOff, yDropOff in self.armsByPickUpZone.get((x, y), []):
+            if rate < MODEL_MIN_RATE:
+                break
+            if arm.type == FILTERED_ARM and materialType != arm.filterArm:
+                continue
+            remaining = self.armCapacity.get(arm, TICKS_PER_SECOND / ARM_CYCLE_TICKS)
+            taken = min(rate, remaining)
+            self.armCapacity[arm] = remaining - taken
+            self.result['armFlow'][arm] = self.result['armFlow'].get(arm, 0) + taken
+            self.addOpCost(arm, taken)
+            self.addArrival(xDropOff, yDropOff, 'U', materialType, taken)  # Dropped below center facing up
+            rate -= taken
+        return rate
+
+    def addOpCost(self, tool, rate):
+        self.result['opCost'] += self.machineLib[tool.type]['opCost'] * rate
+
+    def addLoss(self, x, y, reason, rate):
+        loss = self.result['lost'].setdefault((x, y), {'reason': reason, 'rate': 0})
+        loss['rate'] += rate
+
+    # -------- Producer Rates -------- #
+
+    def getConsumerEvents(self, tool, capacity):
+        if tool.type == CRAFTER:
+            blueprints = [tool.selectedBlueprint] if tool.selectedBlueprint is not None else []
+        else:
+            blueprints = self.recipeGraph.machineBlueprints[tool.type]
+
+        available = dict(self.inflow.get(tool, {}))
+        remaining = capacity
+        events = {}
+        for blueprint in blueprints:  # Blueprints are checked in order each launch so earlier ones take priority
+            if remaining <= 0:
+                break
+            componentItems = self.recipeGraph.componentItems[blueprint]
+            if not componentItems:
+                continue
+            possible = min(available.get(k, 0) / v for k, v in componentItems)
+            rate = min(possible, remaining)
+            if rate > MODEL_MIN_RATE:
+                events[blueprint] = rate
+                remaining -= rate
+                for k, v in componentItems:
+                    available[k] -= rate * v
+
+        unused = {k: v for k, v in available.items() if v > MODEL_MIN_RATE}
+        if unused:
+            self.result['unused'][tool] = unused
+        return events
+
+    @staticmethod
+    def checkConverged(events, newEvents):
+        for tool in newEvents:
+            for blueprint in set(events[tool]) | set(newEvents[tool]):
+                old = events[tool].get(blueprint, 0)
+                new = newEvents[tool].get(blueprint, 0)
+                if abs(new - old) > MODEL_TOLERANCE * max(abs(old), abs(new), MODEL_MIN_RATE):
+                    return False
+        return True
+
+    # -------- Results -------- #
+
+    def summarize(self, producers, events, capacity, opCostModifier, iterations):
+        result = self.result
+        result['iterations'] = iterations
+        result['events'] = events  # Producer: {blueprint: launches / second}
+        result['itemRate'] = sum(result['sales'].values())
+        result['incomeRate'] = sum(self.recipeGraph.value[k] * v for k, v in result['sales'].items())
+        result['lostRate'] = sum(loss['rate'] for loss in result['lost'].values())
+
+        costRate = 0
+        for tool in producers:
+            for blueprint, rate in events[tool].items():
+                costRate += self.recipeGraph.cost[blueprint] * opCostModifier * rate
+        costRate += result['opCost'] * opCostModifier
+        result['costRate'] = costRate
+        result['netRate'] = result['incomeRate'] - costRate
+
+        # Utilization of machines whose output is limited by their own speed rather than their supply
+        result['utilization'] = {}
+        for tool in producers:
+            if tool.type != STARTER:
+                result['utilization'][tool] = sum(events[tool].values()) / capacity[tool]
+        for arm, rate in result['armFlow'].items():
+            result['utilization'][arm] = rate / (TICKS_PER_SECOND / ARM_CYCLE_TICKS)
+
+        # Limiting machine is the busiest saturated machine, None means the layout is limited by its Starters
+        result['limitingMachine'] = None
+        if result['utilization']:
+            busiest = max(result['utilization'], key=lambda tool: result['utilization'][tool])
+            if result['utilization'][busiest] >= 1 - MODEL_TOLERANCE:
+                result['limitingMachine'] = busiest
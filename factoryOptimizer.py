@@ -0,0 +1,175 @@
+# -------- Layout Optimizer Overview: -------- #
+# Searches splitter ratios, filter selections and Starter / Crafter blueprints of a saved layout or floor plan.
+# Search is coordinate descent: every round tries changing one setting at a time, ranks all candidates with the
+# analytic throughput model, simulates the most promising ones headless across a process pool and keeps the best one
+# if it beats the current configuration. Rounds stop when nothing improves.
+# Candidates are scored by net profit per second (balance change including all costs) after a warm up period.
+# The best configuration is written as JSON and is applied in game from the 'Apply Optimizer Result' menu action,
+# to the matching machines of the live factory or to the stored floor plan.
+#
+# Usage:
+#     python factoryOptimizer.py saveFile
+#     python factoryOptimizer.py saveFile --floor-plan 2 --ticks 6000 --workers 8 --output optimizerResult.json
+
+# -------- Imports -------- #
+import argparse
+import functools
+import itertools
+import json
+import math
+import multiprocessing
+import random
+from factoryHeadless import *  # Sets the offscreen platform before Qt starts
+from factoryModel import clsThroughputModel
+from factoryModel import SPLITTERS, DEFAULT_SPLIT_SETTING
+
+# -------- Constants -------- #
+
+OPTIMIZER_RESULT_FILE = 'optimizerResult.json'
+OPTIMIZER_MAX_SPLIT = 3  # Highest split setting tried for each splitter direction
+OPTIMIZER_MIN_GAIN = 0.001  # Relative improvement needed to accept a change
+FLOOR_PLAN_ORIGIN = (13, 13)  # Floor plans are placed at the bottom left tile of assembly line 1
+
+_WORKER_MAIN = None  # Headless main app of each pool process
+
+
+# -------- Search Space -------- #
+
+def getSearchVariables(records, recipeGraph, unlockedBlueprints):
+    # Returns [(record index, field, [candidate values])]
+    fields = {field: i for i, field in enumerate(MACHINE_RECORD_FIELDS)}
+
+    # Materials worth filtering are the ones the machine types in this layout can make
+    machineTypes = set(record[fields['type']] for record in records)
+    producible = set()
+    for material in recipeGraph.order:  # Components come first
+        maker = recipeGraph.materialLib[material]['maker']
+        if maker in machineTypes and (maker not in [STARTER, CRAFTER] or material in unlockedBlueprints) \
+                and all(k in producible for k, v in recipeGraph.componentItems[material]):
+            producible.add(material)
+    filterCandidates = [None] + sorted(producible)
+
+    variables = []
+    for i, record in enumerate(records):
+        machineType = record[fields['type']]
+        if machineType in SPLITTERS:
+            enabled = [share > 0 for share in (record[fields['splitSetting']] or DEFAULT_SPLIT_SETTING[machineType])]
+            options = [range(1, OPTIMIZER_MAX_SPLIT + 1) if on else [0] for on in enabled]
+            settings = [list(option) for option in itertools.product(*options)
+                        if functools.reduce(math.gcd, option) == 1]  # [2, 2, 2] splits the same as [1, 1, 1]
+            variables.append((i, 'splitSetting', settings))
+        if machineType in [FILTER_LEFT, FILTER_TEE]:
+            variables.append((i, 'filterLeft', filterCandidates))
+        if machineType in [FILTER_RIGHT, FILTER_TEE]:
+            variables.append((i, 'filterRight', filterCandidates))
+        if machineType == FILTERED_ARM:
+            variables.append((i, 'filterArm', filterCandidates))
+        if machineType in [STARTER, CRAFTER]:
+            blueprints = [k for k in recipeGraph.machineBlueprints[machineType] if k in unlockedBlueprints]
+            variables.append((i, 'selectedBlueprint', blueprints))
+    return variables
+
+
+def getCandidates(records, variables):
+    fields = {field: i for i, field in enumerate(MACHINE_RECORD_FIELDS)}
+    candidates = []
+    for i, field, values in variables:
+        for value in values:
+            if value != records[i][fields[field]]:
+                candidate = [list(record) for record in records]
+                candidate[i][fields[field]] = value
+                candidates.append(candidate)
+    return candidates
+
+
+# -------- Scoring -------- #
+
+class clsMachineRecord:  # Stand in for clsMachine with the attributes the throughput model reads
+    def __init__(self, record):
+        for field, value in zip(MACHINE_RECORD_FIELDS, record):
+            setattr(self, field, value)
+        if self.splitSetting is None and self.type in SPLITTERS:
+            self.splitSetting = DEFAULT_SPLIT_SETTING[self.type]
+
+
+def scoreWithModel(model, records, modifiers):
+    return model.analyze([clsMachineRecord(record) for record in records], *modifiers)['netRate']
+
+
+def initWorker(saveFileName):
+    global _WORKER_MAIN
+    _WORKER_MAIN = createHeadlessApp()
+    loadSaveFile(_WORKER_MAIN, saveFileName)
+
+
+def scoreWithSimulation(args):
+    records, ticks, warmupTicks = args
+    placeMachines(_WORKER_MAIN, records)
+    return measure(_WORKER_MAIN, ticks, warmupTicks)
+
+
+# -------- Optimizer -------- #
+
+def optimize(saveFileName, floorPlan=None, ticks=4000, warmupTicks=2000, workers=None, screen=32, rounds=10,
+             seed=0):
+    main = createHeadlessApp()
+    loadSaveFile(main, saveFileName)
+    if floorPlan is not None:  # Optimize the floor plan alone placed in an empty factory
+        plan = main.floorPlans[floorPlan]['machines']
+        placeMachines(main, [plan[k] for k in sorted(plan)], *FLOOR_PLAN_ORIGIN)
+    records = [record + [None] * (len(MACHINE_RECORD_FIELDS) - len(record)) for record in getRecords(main)]
+
+    model = clsThroughputModel(main.recipeGraph)
+    modifiers = (main.opCostModifier, main.opTimeModifierStarterCrafter, main.opTimeModifierTier2Machines)
+    variables = getSearchVariables(records, main.recipeGraph, main.unlockedBlueprints)
+    randomGenerator = random.Random(seed)
+
+    # Spawned, not forked, so every worker builds its own QApplication
+    with multiprocessing.get_context('spawn').Pool(workers, initWorker, (saveFileName,)) as pool:
+        baseline = pool.apply(scoreWithSimulation, ((records, ticks, warmupTicks),))
+        best, bestScore = records, baseline
+        print('Baseline: $%.1f / Second net, $%.1f / Second income' % (baseline['netRate'], baseline['incomeRate']))
+
+        for roundNumber in range(1, rounds + 1):
+            candidates = getCandidates(best, variables)
+            if not candidates:
+                break
+            randomGenerator.shuffle(candidates)  # Ties in the model ranking are broken randomly
+            candidates.sort(key=lambda candidate: scoreWithModel(model, candidate, modifiers), reverse=True)
+            candidates = candidates[:screen]
+
+            scores = pool.map(scoreWithSimulation, [(candidate, ticks, warmupTicks) for candidate in candidates])
+            topScore, topCandidate = max(zip(scores, candidates), key=lambda pair: pair[0]['netRate'])
+            print('Round %i: best of %i candidates $%.1f / Second net'
+                  % (roundNumber, len(candidates), topScore['netRate']))
+            if topScore['netRate'] <= bestScore['netRate'] + abs(bestScore['netRate']) * OPTIMIZER_MIN_GAIN:
+                break
+            best, bestScore = topCandidate, topScore
+
+    return {'baseline': baseline,
+            'best': bestScore,
+            'gain': bestScore['netRate'] - baseline['netRate'],
+            'floorPlan': floorPlan,
+            'machines': [dict(zip(MACHINE_RECORD_FIELDS, record)) for record in best]}
+
+
+# -------- Main -------- #
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Optimize splitter, filter and blueprint settings of a layout')
+    parser.add_argument('saveFile', help='Save file to optimize')
+    parser.add_argument('--floor-plan', type=int, default=None, help='Optimize this floor plan number (0 to 9)')
+    parser.add_argument('--ticks', type=int, default=4000, help='Ticks measured per candidate')
+    parser.add_argument('--warmup', type=int, default=2000, help='Ticks run before measuring each candidate')
+    parser.add_argument('--workers', type=int, default=None, help='Processes in the pool (default: CPU count)')
+    parser.add_argument('--screen', type=int, default=32, help='Candidates simulated per round')
+    parser.add_argument('--rounds', type=int, default=10, help='Maximum search rounds')
+    parser.add_argument('--output', default=OPTIMIZER_RESULT_FILE, help='Result JSON file')
+    arguments = parser.parse_args()
+
+    optimizerResult = optimize(arguments.saveFile, arguments.floor_plan, arguments.ticks, arguments.warmup,
+                               arguments.workers, arguments.screen, arguments.rounds)
+    with open(arguments.output, 'w') as resultFile:
+        json.dump(optimizerResult, resultFile, indent=2)
+    print('Best: $%.1f / Second net, gain $%.1f / Second. Written to %s'
+          % (optimizerResult['best']['netRate'], optimizerResult['gain'], arguments.output))
@@ -0,0 +1,137 @@
+# -------- Recipe Graph Overview: -------- #
+# Compiles the nested component dictionaries of materialLib into a recipe graph once at startup.
+# The core loop reads the flattened component tuples and costs instead of re-reading the library dictionaries,
+# and menus and planners read the per product figures:
+#     Topological order (components always come before the products that use them)
+#     Recipe depth (Basic materials are depth 0)
+#     Crafting events needed per unit, counted for every material in the recipe tree
+#     Raw bill of materials (Basic materials per unit)
+#     Total op cost per unit (blueprint costs charged by every Starter / Crafter / Tier 1 launch in the tree)
+#     Net margin of the sale value over the total op cost
+#     Machines of each type needed to feed one Crafter at a target rate
+# Building the graph validates the data. Component keys and makers that don't exist in the libraries, and names with
+# leading or trailing spaces, raise a KeyError that lists every problem found.
+
+# -------- Imports -------- #
+import math
+from factoryConstants import *
+
+
+class clsRecipeGraph:
+    def __init__(self, machineLib, materialLib):
+        self.machineLib = machineLib  # machineLib.lib dictionary
+        self.materialLib = materialLib  # materialLib.lib dictionary
+
+        self.validate()
+
+        self.componentItems = {}  # Material: ((component, quantity), ...) for the core loop launch check
+        self.cost = {}  # Material: blueprint cost per launch before opCostModifier
+        self.value = {}  # Material: sale value
+        for material, data in self.materialLib.items():
+            self.componentItems[material] = tuple(data['components'].items())
+            self.cost[material] = data['cost']
+            self.value[material] = data['value']
+
+        self.machineBlueprints = {}  # Machine type: blueprints of its blueprintType in library order
+        for machineType, data in self.machineLib.items():
+            if 'blueprintType' in data:
+                self.machineBlueprints[machineType] = [
+                    material for material in self.materialLib
+                    if self.materialLib[material]['class'] == data['blueprintType']]
+
+        self.order = self.getTopologicalOrder()
+        self.depth = {}  # Material: longest chain of crafting steps down to Basic materials
+        self.crafts = {}  # Material: {material: launches needed per unit}, includes the material itself
+        self.rawMaterials = {}  # Material: {Basic material: units needed per unit}
+        self.opCost = {}  # Material: total blueprint cost per unit before opCostModifier
+        self.margin = {}  # Material: value minus total op cost at opCostModifier of 1
+        for material in self.order:
+            components = self.materialLib[material]['components']
+            self.depth[material] = 1 + max([self.depth[k] for k in components], default=-1)
+            crafts = {material: 1}
+            for k, v in components.items():
+                for subMaterial, launches in self.crafts[k].items():
+                    crafts[subMaterial] = crafts.get(subMaterial, 0) + v * launches
+            self.crafts[material] = crafts
+            self.rawMaterials[material] = {k: v for k, v in crafts.items() if self.materialLib[k]['components'] == {}}
+            self.opCost[material] = sum(self.cost[k] * v for k, v in crafts.items())
+            self.margin[material] = self.value[material] - self.opCost[material]
+
+    # -------- Validation -------- #
+
+    def validate(self):
+        problems = []
+        for name in list(self.materialLib) + list(self.machineLib):
+            if name != name.strip():
+                problems.append('Name %r has leading or trailing spaces' % name)
+        for material, data in self.materialLib.items():
+            for component in data['components']:
+                if component not in self.materialLib:
+                    problems.append('%r lists unknown component %r' % (material, component))
+            if data['maker'] not in self.machineLib:
+                problems.append('%r lists unknown maker %r' % (material, data['maker']))
+        if problems:
+            raise KeyError('Invalid recipe data: ' + '; '.join(problems))
+
+    def getTopologicalOrder(self):
+        order = []
+        state = {}  # Material: 1 = visiting, 2 = done
+
+        def visit(material, path):
+            if state.get(material) == 2:
+                return
+            if state.get(material) == 1:
+                raise KeyError('Invalid recipe data: circular recipe %s' % ' -> '.join(path + [material]))
+            state[material] = 1
+            for component in self.materialLib[material]['components']:
+                visit(component, path + [material])
+            state[material] = 2
+            order.append(material)
+
+        for material in self.materialLib:
+            visit(material, [])
+        return order
+
+    # Names from older saves may carry the spaces the validation now rejects, e.g. 'Circuit '
+    def getCanonicalName(self, name):
+        if name is None or name in self.materialLib:
+            return name
+        if name.strip() in self.materialLib:
+            return name.strip()
+        return name
+
+    # -------- Planning -------- #
+
+    def getLaunchRate(self, machineType, opTimeModifierStarterCrafter=0, opTimeModifierTier2Machines=0):
+        # Launches per second of a producing machine at full speed, matches the queueDelay countdown in the core loop
+        if machineType in [STARTER, CRAFTER]:
+            launchIntervals = max(1, self.machineLib[machineType]['opTime'] - opTimeModifierStarterCrafter)
+        else:
+            launchIntervals = max(1, self.machineLib[machineType]['opTime'] - opTimeModifierTier2Machines)
+        return 1000 / (CYCLE_INTERVAL * MAT_LAUNCH_INTERVAL * launchIntervals)
+
+    def getMachinesNeeded(self, product, targetRate=None, starterQuantity=1, opTimeModifierStarterCrafter=0,
+                          opTimeModifierTier2Machines=0):
+        # Machines of each type needed to feed the machine making product at targetRate (units / second).
+        # Defaults to the full speed of one Crafter. Intermediate Crafters are included, the fed machine is not.
+        # Counts are fractional, round up with getMachinesNeededRounded.
+        maker = self.materialLib[product]['maker']
+        if targetRate is None:
+            targetRate = self.getLaunchRate(maker, opTimeModifierStarterCrafter, opTimeModifierTier2Machines)
+
+        machinesNeeded = {}
+        for material, launches in self.crafts[product].items():
+            if material == product:
+                continue
+            machineType = self.materialLib[material]['maker']
+            rate = self.getLaunchRate(machineType, opTimeModifierStarterCrafter, opTimeModifierTier2Machines)
+            if machineType == STARTER:
+                rate = rate * starterQuantity  # Starters may launch stacks of raw materials
+            machinesNeeded[machineType] = machinesNeeded.get(machineType, 0) + targetRate * launches / rate
+        return machinesNeeded
+
+    def getMachinesNeededRounded(self, product, *args, **kwargs):
+        return {k: math.ceil(v - 1e-9) for k, v in self.getMachinesNeeded(product, *args, **kwargs).items()}
+
+    def getMarginAtModifier(self, material, opCostModifier):
+        return self.value[material] - self.opCost[material] * opCostModifier
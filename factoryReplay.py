@@ -0,0 +1,128 @@
+# -------- Input Recording and Replay Overview: -------- #
+# Records every player action that changes the game together with the tick it happened on, so a session can be
+# replayed and produce the same simulation. Used to capture a slow session once and profile it repeatedly.
+# Player actions go through clsMainApp.performAction, which names a main app method and its plain arguments
+# (machines are found by tile). Qt events, menus and wall clock time never enter the log.
+# Recording starts by reloading the current game from a snapshot (materials in flight and machine inventories are
+# cleared), so the live session and every replay start from exactly the same state.
+# The core loop is deterministic apart from player actions. Actions happen between ticks, an action logged at
+# iteration N is applied by the replayer just before tick N + 1 runs.
+# The log also keeps the tick recording stopped on, a replay runs up to it so idle time after the last action is
+# replayed too. Logs written before it was kept end at their last action.
+#
+# Usage (headless):
+#     python factoryReplay.py inputLog
+#     python factoryReplay.py inputLog --extra-ticks 2000 --profile  # Keep running past the recorded end
+
+# -------- Imports -------- #
+import copy
+from collections import deque
+
+# -------- Constants -------- #
+
+INPUT_LOG_FILE = 'inputLog'
+INPUT_LOG_VERSION = 1
+REPLAY_STEP_TICKS = 40  # Ticks run by each replay step, one material launch interval
+
+
+class clsInputRecorder:
+    def __init__(self):
+        self.recording = False
+        self.startIteration = 0
+        self.startState = None  # Save game data the recording starts from
+        self.actions = []  # [(iteration, action, args)]
+
+    def start(self, startIteration, startState):
+        self.recording = True
+        self.startIteration = startIteration
+        self.startState = copy.deepcopy(startState)
+        self.actions = []
+
+    def record(self, iteration, action, args):
+        if self.recording:
+            self.actions.append((iteration, action, copy.deepcopy(args)))  # Args may be live lists, e.g. floor plans
+
+    def stop(self, endIteration, fileName=INPUT_LOG_FILE):
+        import pickle
+        self.recording = False
+        with open(fileName, 'wb') as logFile:
+            pickle.dump({'version': INPUT_LOG_VERSION,
+                         'startIteration': self.startIteration,
+                         'endIteration': endIteration,
+                         'startState': self.startState,
+                         'actions': self.actions}, logFile)
+        return len(self.actions)
+
+
+class clsInputReplayer:
+    def __init__(self, main, fileName=INPUT_LOG_FILE):
+        import pickle
+        self.main = main
+        with open(fileName, 'rb') as logFile:
+            self.log = pickle.load(logFile)
+        if self.log['version'] != INPUT_LOG_VERSION:
+            raise ValueError('Input log version %s is not supported' % self.log['version'])
+        self.actions = deque()
+        self.endIteration = self.log.get('endIteration')  # Tick recording stopped on
+        if self.endIteration is None:  # Older logs end at their last action
+            self.endIteration = self.log['actions'][-1][0] if self.log['actions'] else self.log['startIteration']
+
+    def start(self):
+        # Restores the recorded starting state, the state is copied so a log can be replayed any number of times
+        self.main.loadSaveData(copy.deepcopy(self.log['startState']))
+        self.main.iteration = self.log['startIteration']
+        self.actions = deque(self.log['actions'])
+
+    def applyDueActions(self):  # Called by the core loop before each tick
+        while self.actions and self.actions[0][0] <= self.main.iteration:
+            iteration, action, args = self.actions.popleft()
+            getattr(self.main, action)(*copy.deepcopy(args))
+
+    def step(self, ticks=REPLAY_STEP_TICKS):
+        for i in range(ticks):
+            self.main.coreLoop.run()
+
+    def runToEnd(self, extraTicks=0):  # Runs to the recorded end, returns the ticks run
+        ticks = max(0, self.endIteration - self.main.iteration) + extraTicks
+        self.step(ticks)
+        self.applyDueActions()  # Actions taken after the last recorded tick
+        return ticks
+
+    def isFinished(self):
+        return not self.actions
+
+
+# -------- Main -------- #
+
+if __name__ == '__main__':
+    import argparse
+    import cProfile
+    import pstats
+    import time
+    from factoryHeadless import *  # Sets the offscreen platform before Qt starts
+
+    parser = argparse.ArgumentParser(description='Replay a recorded input log headless')
+    parser.add_argument('inputLog', nargs='?', default=INPUT_LOG_FILE, help='Input log to replay')
+    parser.add_argument('--extra-ticks', type=int, default=0, help='Ticks run after the recorded end')
+    parser.add_argument('--profile', action='store_true', help='Run under cProfile and print the top functions')
+    arguments = parser.parse_args()
+
+    main = createHeadlessApp()
+    main.inputReplayer = clsInputReplayer(main, arguments.inputLog)
+    main.inputReplayer.start()
+
+    profiler = cProfile.Profile() if arguments.profile else None
+    startTime = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    ticks = main.inputReplayer.runToEnd(arguments.extra_ticks)
+    if profiler:
+        profiler.disable()
+    elapsed = time.perf_counter() - startTime
+
+    print('Replayed %i actions over %i ticks in %.2f s (%.3f ms / tick)'
+          % (len(main.inputReplayer.log['actions']), ticks, elapsed, elapsed * 1000 / max(1, ticks)))
+    print('Final balance $%s, %i machines, %i materials'
+          % ('{:,}'.format(main.balance), len(main.Machines), len(main.Materials)))
+    if profiler:
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
@@ -0,0 +1,226 @@
+# -------- Save File Overview: -------- #
+# Versioned binary save format, written and read without pickle.
+# File layout:
+#     Header - Magic, version, record counts, section lengths and a CRC32 of everything after the header
+#     Names - JSON list of the machine, material and blueprint names the records refer to by index
+#     Machines - One fixed width MACHINE_RECORD per machine, clsMachine.getRecord fields
+#     Tiles - One fixed width TILE_RECORD per unlocked tile
+#     Floor plan machines - One FLOOR_PLAN_RECORD per machine of a saved floor plan, plan number + machine record
+#     State - JSON of the balance, unlocks, research modifiers and floor plan descriptions and sizes, checkpoints
+#             also keep the run time state of machines and materials here (simulation)
+# Sections are read one at a time and checked against the header before the save data is handed over, a truncated
+# or corrupted file raises ValueError and the current game is kept.
+# Saves are written to a temporary file next to the target and renamed over it, a crash mid save leaves the old
+# save intact.
+# Saves from before this format (pickled dicts) are still loaded, they are recognized by the pickle protocol byte.
+# They hold only dicts, lists, tuples, strings, numbers, booleans and None, so they are unpickled without looking up
+# any class or function (clsLegacySaveUnpickler), a pickle naming one raises ValueError instead of running code.
+# They are written in the new format on the next save.
+# The save data is the same dict as clsMainApp.getSaveData so input recordings and tools are not affected.
+#
+# clsAutosaver takes a snapshot of the save data on the GUI thread between ticks and writes it on a worker thread,
+# rotating through AUTOSAVE_SLOTS files. An autosave is skipped if the previous one is still being written.
+
+# -------- Imports -------- #
+import json
+import os
+import pickle
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from factoryConstants import ORIENTATIONS, ORIENTATION_CODE
+
+# -------- Constants -------- #
+
+SAVE_FILE = 'saveFile'
+CHECKPOINT_FILE = 'checkpoint'  # Save file with the run time state, see clsMainApp.getCheckpoint
+SAVE_MAGIC = b'FSAV'
+SAVE_VERSION = 1
+SAVE_HEADER = struct.Struct('<4sHIIIIII')  # Magic, version, machines, tiles, plan machines, names len, state len, CRC
+# Type, x, y, orientation, blueprint, starter quantity, filter left, filter right, teleporter ID, filter arm,
+# split setting flag, split setting left, straight, right
+MACHINE_RECORD = struct.Struct('<HhhBHHHHiHB3H')
+TILE_RECORD = struct.Struct('<hh')  # x, y
+FLOOR_PLAN_RECORD = struct.Struct('<B' + MACHINE_RECORD.format[1:])  # Plan number + machine record
+MACHINE_RECORD_DEFAULTS = [None, 0, 0, 'U', None, 1, None, None, None, None, None]  # clsMachine argument defaults
+NO_NAME = 0xFFFF  # Name index of None
+NO_QUANTITY = 0xFFFF  # Starter quantity of None
+NO_TELEPORTER = -1  # Teleporter ID of None
+PICKLE_PROTOCOL_BYTE = 0x80  # First byte of a pickle written with protocol 2 or later
+AUTOSAVE_FILE = 'autosave%i'  # Slot number
+AUTOSAVE_SLOTS = 3
+
+
+class clsNameTable:  # Names stored once, records refer to them by index
+    def __init__(self, names=None):
+        self.names = list(names or [])
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+    def getID(self, name):
+        if name is None:
+            return NO_NAME
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+    def getName(self, i):
+        return None if i == NO_NAME else self.names[i]
+
+
+# -------- Write -------- #
+
+def packMachine(record, names):
+    record = list(record) + MACHINE_RECORD_DEFAULTS[len(record):]  # Floor plans of old saves may be shorter
+    machine, x, y, orientation, blueprint, quantity, filterLeft, filterRight, teleporterID, filterArm, split = record
+    return (names.getID(machine), x, y, ORIENTATION_CODE[orientation], names.getID(blueprint),
+            NO_QUANTITY if quantity is None else quantity, names.getID(filterLeft), names.getID(filterRight),
+            NO_TELEPORTER if teleporterID is None else teleporterID, names.getID(filterArm),
+            split is not None, *(split or [0, 0, 0]))
+
+
+def writeSaveFile(fileName, db):
+    names = clsNameTable()
+    machines = b''.join(MACHINE_RECORD.pack(*packMachine(record, names)) for record in db['machines'].values())
+    tiles = b''.join(TILE_RECORD.pack(x, y) for x, y in db['unlockedTiles'])
+    planMachines = []
+    plans = {}
+    for planNumber, plan in db['floorPlans'].items():
+        plans[planNumber] = {'description': plan['description'], 'size': list(plan['size'])}
+        for record in plan['machines'].values():
+            planMachines.append(FLOOR_PLAN_RECORD.pack(planNumber, *packMachine(record, names)))
+    state = {key: value for key, value in db.items() if key not in ['machines', 'unlockedTiles', 'floorPlans']}
+    state['floorPlans'] = plans
+
+    body = [json.dumps(names.names).encode(), machines, tiles, b''.join(planMachines), json.dumps(state).encode()]
+    checksum = 0
+    for section in body:
+        checksum = zlib.crc32(section, checksum)
+    header = SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION, len(db['machines']), len(db['unlockedTiles']),
+                              len(planMachines), len(body[0]), len(body[4]), checksum)
+
+    tempFileName = '%s.tmp' % fileName
+    with open(tempFileName, 'wb') as saveFile:
+        saveFile.write(header)
+        for section in body:
+            saveFile.write(section)
+        saveFile.flush()
+        os.fsync(saveFile.fileno())
+    os.replace(tempFileName, fileName)  # Atomic, readers see the old or the new save, never a partial one
+    return SAVE_HEADER.size + sum(len(section) for section in body)
+
+
+# -------- Read -------- #
+
+class clsLegacySaveUnpickler(pickle.Unpickler):  # Plain data only, pickles of old saves never need find_class
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError('Save file refers to %s.%s, old saves hold plain data only' % (module, name))
+
+
+def unpackMachine(fields, names):
+    machine, x, y, orientation, blueprint, quantity, filterLeft, filterRight, teleporterID, filterArm, hasSplit, \
+        splitLeft, splitStraight, splitRight = fields
+    return [names.getName(machine), x, y, ORIENTATIONS[orientation], names.getName(blueprint),
+            None if quantity == NO_QUANTITY else quantity, names.getName(filterLeft), names.getName(filterRight),
+            None if teleporterID == NO_TELEPORTER else teleporterID, names.getName(filterArm),
+            [splitLeft, splitStraight, splitRight] if hasSplit else None]
+
+
+class clsSaveReader:  # Reads the sections in file order, each one is added to the running checksum
+    def __init__(self, saveFile):
+        self.saveFile = saveFile
+        self.checksum = 0
+
+    def read(self, size):
+        data = self.saveFile.read(size)
+        if len(data) != size:
+            raise ValueError('Save file is truncated')
+        self.checksum = zlib.crc32(data, self.checksum)
+        return data
+
+
+def readSaveFile(fileName):  # Save data dict as returned by clsMainApp.getSaveData
+    with open(fileName, 'rb') as saveFile:
+        start = saveFile.read(SAVE_HEADER.size)
+        if start[:1] == bytes([PICKLE_PROTOCOL_BYTE]):  # Save from before the binary format
+            saveFile.seek(0)
+            try:
+                db = clsLegacySaveUnpickler(saveFile).load()
+            except Exception as error:  # Refused classes, truncated or corrupted pickles raise many error types
+                raise ValueError('%s is not a valid save file: %s' % (fileName, error))
+            if not isinstance(db, dict):
+                raise ValueError('%s is not a save file' % fileName)
+            return db
+        if len(start) != SAVE_HEADER.size or start[:4] != SAVE_MAGIC:
+            raise ValueError('%s is not a save file' % fileName)
+        magic, version, machineCount, tileCount, planMachineCount, namesLength, stateLength, checksum = \
+            SAVE_HEADER.unpack(start)
+        if version != SAVE_VERSION:
+            raise ValueError('Save file version %i is not supported' % version)
+
+        reader = clsSaveReader(saveFile)
+        names = clsNameTable(json.loads(reader.read(namesLength).decode()))
+        machineRecords = MACHINE_RECORD.iter_unpack(reader.read(machineCount * MACHINE_RECORD.size))
+        machines = {i: unpackMachine(fields, names) for i, fields in enumerate(machineRecords)}
+        tiles = [tuple(fields) for fields in TILE_RECORD.iter_unpack(reader.read(tileCount * TILE_RECORD.size))]
+        planMachines = reader.read(planMachineCount * FLOOR_PLAN_RECORD.size)
+        state = json.loads(reader.read(stateLength).decode())
+        if reader.checksum != checksum:
+            raise ValueError('Save file checksum does not match, the file is corrupted')
+
+    db = state
+    db['machines'] = machines
+    db['unlockedTiles'] = tiles
+    plans = {}
+    for planNumber, plan in state['floorPlans'].items():  # JSON keys are strings
+        plans[int(planNumber)] = {'description': plan['description'], 'size': tuple(plan['size']), 'machines': {}}
+    for fields in FLOOR_PLAN_RECORD.iter_unpack(planMachines):
+        planMachinesByIndex = plans[fields[0]]['machines']
+        planMachinesByIndex[len(planMachinesByIndex)] = unpackMachine(fields[1:], names)
+    db['floorPlans'] = plans
+    return db
+
+
+# -------- Autosave -------- #
+
+class clsAutosaver:
+    def __init__(self, slots=AUTOSAVE_SLOTS):
+        self.slots = slots
+        self.nextSlot = 0
+        self.pool = ThreadPoolExecutor(1)  # One writer, autosaves never overlap
+        self.pending = None  # Future of the autosave being written
+        self.count = 0  # Autosaves written
+        self.skipped = 0  # Autosaves skipped because the previous one was still being written
+        self.snapshotMs = 0  # Last snapshot time, GUI thread
+        self.writeMs = 0  # Last write time, worker thread
+        self.lastFileName = None
+        self.error = None  # Last write error, the next autosave tries again
+
+    def isWriting(self):
+        return self.pending is not None and not self.pending.done()
+
+    def save(self, getSnapshot):  # getSnapshot() returns save data sharing nothing with the live game
+        if self.isWriting():
+            self.skipped += 1
+            return False
+        start = perf_counter()
+        snapshot = getSnapshot()
+        self.snapshotMs = (perf_counter() - start) * 1000
+        fileName = AUTOSAVE_FILE % self.nextSlot
+        self.nextSlot = (self.nextSlot + 1) % self.slots
+        self.pending = self.pool.submit(self.write, fileName, snapshot)
+        return True
+
+    def write(self, fileName, snapshot):  # Worker thread
+        start = perf_counter()
+        try:
+            writeSaveFile(fileName, snapshot)
+        except Exception as error:  # Any failure, the future's exception is never read
+            self.error = error
+            return
+        self.writeMs = (perf_counter() - start) * 1000
+        self.lastFileName = fileName
+        self.count += 1
+        self.error = None
@@ -0,0 +1,143 @@
+# -------- Tick Tracer Overview: -------- #
+# Records the core loop phase markers of logTimestamp and the scene paint markers with perf_counter_ns into a
+# preallocated ring buffer, so a whole session can be traced without the log growing or allocating per tick.
+# When the buffer is full the oldest marks are overwritten.
+# Marks are turned into nested spans on export:
+#     Tick - Start of the core loop run to 'Post End Admin Actions'
+#         Start Admin Actions, Launch Materials, Move Materials, Move Robotic Arms, Material Processing, ...
+#     Idle - End of a core loop run to the start of the next one (Qt event processing)
+#         Paint - Scene repaint by the view
+# The export is Chrome trace event JSON, open it in chrome://tracing or ui.perfetto.dev.
+# Disabled tracing costs one attribute check per marker.
+
+# -------- Imports -------- #
+import json
+from array import array
+from time import perf_counter, perf_counter_ns
+
+# -------- Constants -------- #
+
+TRACE_BUFFER_SIZE = 1 << 18  # Marks kept, about 37,000 ticks
+TRACE_FILE = 'factoryTrace.json'
+CORE_LOOP_MARKS = ['Post Run Idle', 'Post Start Admin Actions', 'Post Launch Materials', 'Post Move Materials',
+                   'Post Move Robotic Arms', 'Post Material Processing', 'Post End Admin Actions']
+PAINT_BEGIN = 'Paint Begin'
+PAINT_END = 'Paint End'
+
+
+class clsTickTracer:
+    def __init__(self, capacity=TRACE_BUFFER_SIZE):
+        self.enabled = False
+        self.capacity = capacity
+        self.times = array('q', bytes(8 * capacity))  # ns
+        self.runs = array('q', bytes(8 * capacity))  # Core loop iteration of each mark
+        self.nameIDs = array('H', bytes(2 * capacity))
+        self.names = []  # Name ID: mark name
+        self.nameIndex = {}  # Mark name: name ID
+        self.count = 0  # Marks written since start, the write position is count % capacity
+
+    def start(self):
+        self.count = 0
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def mark(self, name, run):
+        i = self.count % self.capacity
+        self.times[i] = perf_counter_ns()
+        self.runs[i] = run
+        nameID = self.nameIndex.get(name)
+        if nameID is None:
+            nameID = self.nameIndex[name] = len(self.names)
+            self.names.append(name)
+        self.nameIDs[i] = nameID
+        self.count += 1
+
+    def getMarks(self, fromCount=0):  # [(name, run, ns)] oldest first, fromCount skips marks already read
+        marks = []
+        for k in range(max(fromCount, self.count - self.capacity), self.count):
+            i = k % self.capacity
+            marks.append((self.names[self.nameIDs[i]], self.runs[i], self.times[i]))
+        return marks
+
+    def getTimeLog(self):  # Core loop marks as (stampName, runNumber, seconds), the old timeLog format
+        return [(name, run, time / 1e9) for name, run, time in self.getMarks() if name in CORE_LOOP_MARKS]
+
+    # -------- Spans & Export -------- #
+
+    def getSpans(self, fromCount=0):  # [(name, run, start ns, end ns)]
+        spans = []
+        lastCoreTime = None
+        tickStart = None
+        paintStart = None
+        # Incremental reads start from the last core loop mark before fromCount, its phase (Idle when read between
+        # runs) is closed by the first mark read. Paint marks may come after it, so search back past them
+        for k in range(fromCount - 1, max(0, self.count - self.capacity) - 1, -1):
+            name = self.names[self.nameIDs[k % self.capacity]]
+            if name in CORE_LOOP_MARKS:
+                lastCoreTime = self.times[k % self.capacity]
+                if name == 'Post Run Idle':
+                    tickStart = lastCoreTime
+                break
+        for name, run, time in self.getMarks(fromCount):
+            if name == PAINT_BEGIN:
+                paintStart = time
+            elif name == PAINT_END:
+                if paintStart is not None:
+                    spans.append(('Paint', run, paintStart, time))
+                paintStart = None
+            elif name in CORE_LOOP_MARKS:
+                if lastCoreTime is not None:  # Each marker closes the phase before it
+                    spans.append(('Idle' if name == 'Post Run Idle' else name[5:], run, lastCoreTime, time))
+                if name == 'Post Run Idle':
+                    tickStart = time
+                elif name == 'Post End Admin Actions' and tickStart is not None:
+                    spans.append(('Tick', run, tickStart, time))
+                    tickStart = None
+                lastCoreTime = time
+        return spans
+
+    def exportChromeTrace(self, fileName=TRACE_FILE):
+        spans = self.getSpans()
+        origin = min((start for name, run, start, end in spans), default=0)
+        events = [{'name': name,
+                   'cat': 'paint' if name == 'Paint' else 'core loop',
+                   'ph': 'X',  # Complete event, nesting comes from time containment
+                   'ts': (start - origin) / 1000,  # us
+                   'dur': (end - start) / 1000,
+                   'pid': 1,
+                   'tid': 1,
+                   'args': {'tick': run}}
+                  for name, run, start, end in spans]
+        with open(fileName, 'w') as traceFile:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, traceFile)
+        return len(events)
+
+
+class clsStartupTimer:  # Milestones from launch to the first frame, each is charged the time since the one before
+    def __init__(self, launchTime):
+        self.launchTime = launchTime  # perf_counter at the top of factory.py
+        self.marks = []  # [(name, perf_counter)]
+        self.finished = False
+
+    def mark(self, name):
+        self.marks.append((name, perf_counter()))
+
+    def finish(self, name):
+        self.mark(name)
+        self.finished = True
+
+    def getElapsed(self):  # Seconds from launch to the last milestone, time to interactive once finished
+        return self.marks[-1][1] - self.launchTime if self.marks else 0
+
+    def getReport(self):
+        lines = ['%-28s %10s %10s' % ('Startup', 'ms', 'Total ms')]
+        lastTime = self.launchTime
+        for name, markTime in self.marks:
+            lines.append('%-28s %10.1f %10.1f' % (name, (markTime - lastTime) * 1000,
+                                                  (markTime - self.launchTime) * 1000))
+            lastTime = markTime
+        if self.finished:
+            lines.append('%-28s %21.1f' % ('Time to interactive', self.getElapsed() * 1000))
+        return '\n'.join(lines)